@@ -23,8 +23,11 @@ def main():
                 game.handle_event(event)
         
         game.update(dt)
-        game.draw()
-        pygame.display.flip()
+        dirty_rects = game.draw()
+        if dirty_rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty_rects)
     
     pygame.quit()
     sys.exit()
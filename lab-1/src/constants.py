@@ -39,6 +39,7 @@ GAME_PLAYING = "playing"
 GAME_PAUSED = "paused"
 GAME_WON = "won"
 GAME_LOST = "lost"
+GAME_TIMEOUT = "timeout"  # Вичерпано час безголової симуляції
 
 # Напрямки
 UP = (0, -1)
@@ -47,6 +48,10 @@ LEFT = (-1, 0)
 RIGHT = (1, 0)
 DIRECTIONS = [UP, DOWN, LEFT, RIGHT]
 
+# Безголова симуляція
+SIMULATION_DT = 1 / FPS  # Фіксований крок часу (секунди)
+SIMULATION_TIME_LIMIT = 300.0  # Максимальна тривалість гри в ігрових секундах
+
 # Вибрана карта
 MAP = "classic_adapted_2.txt"
 # MAP = "map1.txt"
@@ -54,4 +59,14 @@ MAP = "classic_adapted_2.txt"
 # ШІ константи
 AI_DECISION_DELAY = 0.05  # Затримка між рішеннями ШІ в секундах
 DEFAULT_VIEW_DISTANCE = 5  # Стандартна дальність видимості
-MAX_VIEW_DISTANCE = float('inf')  # Необмежена видимість
\ No newline at end of file
+MAX_VIEW_DISTANCE = float('inf')  # Необмежена видимість
+PATH_SEARCH_DEPTH = None  # Обмеження довжини шляху для правил (None - без обмеження)
+DECIDE_AT_JUNCTIONS = True  # Привиди звертаються до ШІ лише на перехрестях і в тупиках
+
+# Журнал рішень привидів (src/tracing.py)
+TRACE_OFF = 0
+TRACE_DECISIONS = 1  # Голоси правил і вибраний напрямок
+TRACE_EVENTS = 2  # Також виявлення пакмена, мережа привидів, патрулювання
+DECISION_TRACE_CAPACITY = 5000  # Записів у кільцевому буфері
+DECISION_TRACE_FILE = "decision_trace.csv"
+TRACE_OVERLAY_LINES = 12  # Рядків журналу у відладковій накладці
@@ -0,0 +1,266 @@
+# controllers.py - Керування пакменом: клавіатура, прості контролери та автопілот
+import random
+
+from src.constants import *
+
+
+class PacmanController:
+    """
+    Інтерфейс керування пакменом
+
+    Рушій викликає get_direction(engine) на кожному тіку; повернутий
+    напрямок стає next_direction пакмена (None - без змін).
+    """
+
+    def reset(self, engine):
+        """Викликається на початку кожної гри"""
+        pass
+
+    def get_direction(self, engine):
+        """Повертає напрямок для пакмена або None"""
+        return None
+
+
+class KeyboardController(PacmanController):
+    """Напрямок від гравця (Game передає натиснуті клавіші)"""
+
+    def __init__(self):
+        self.pending_direction = None
+
+    def reset(self, engine):
+        self.pending_direction = None
+
+    def press(self, direction):
+        """Запам'ятовує напрямок до наступного тіку"""
+        self.pending_direction = direction
+
+    def get_direction(self, engine):
+        direction, self.pending_direction = self.pending_direction, None
+        return direction
+
+
+class RandomController(PacmanController):
+    """Випадковий напрямок на кожному перехресті"""
+
+    def get_direction(self, engine):
+        pacman = engine.pacman
+        if (pacman.grid_x, pacman.grid_y) != (pacman.target_x, pacman.target_y):
+            return None
+
+        valid_dirs = [d for d in DIRECTIONS if pacman.can_move(d, engine.walls)]
+        if not valid_dirs:
+            return None
+
+        # Продовжуємо рух, якщо не на перехресті
+        if pacman.direction in valid_dirs and len(valid_dirs) <= 2:
+            return pacman.direction
+        return random.choice(valid_dirs)
+
+
+class GreedyDotController(PacmanController):
+    """
+    Жадібний збір точок з утечею від близьких привидів
+
+    Іде до найближчої за лабіринтом точки (таблиця навігації карти), а
+    якщо привид ближче за danger_distance - обирає сусідню клітинку, що
+    максимізує відстань до найближчого привида.
+    """
+
+    def __init__(self, danger_distance=3):
+        self.danger_distance = danger_distance
+
+    def get_direction(self, engine):
+        pacman = engine.pacman
+        pacman_pos = (pacman.grid_x, pacman.grid_y)
+        if pacman_pos != (pacman.target_x, pacman.target_y):
+            return None
+
+        navigation = engine.navigation
+        ghost_positions = [(g.grid_x, g.grid_y) for g in engine.ghosts]
+
+        def ghost_distance(pos):
+            distances = [navigation.distance(pos, g) for g in ghost_positions]
+            distances = [d for d in distances if d is not None]
+            return min(distances) if distances else float('inf')
+
+        # Утеча від привида
+        if ghost_distance(pacman_pos) <= self.danger_distance:
+            best_direction, best_distance = None, -1
+            for direction in DIRECTIONS:
+                if not pacman.can_move(direction, engine.walls):
+                    continue
+                next_pos = ((pacman_pos[0] + direction[0]) % engine.map_width,
+                            (pacman_pos[1] + direction[1]) % engine.map_height)
+                distance = ghost_distance(next_pos)
+                if distance > best_distance:
+                    best_direction, best_distance = direction, distance
+            return best_direction
+
+        # Найближча точка
+        nearest_dot, nearest_distance = None, None
+        for dot in engine.dots:
+            distance = navigation.distance(pacman_pos, dot)
+            if distance is not None and (nearest_distance is None or distance < nearest_distance):
+                nearest_dot, nearest_distance = dot, distance
+
+        if nearest_dot is None:
+            return None
+        return navigation.next_step(pacman_pos, nearest_dot)
+
+
+class AutopilotController(PacmanController):
+    """
+    Автопілот: збір точок з пошуком шляху втечі від привидів
+
+    Рішення приймається лише коли пакмен стоїть у клітинці. Для кожного
+    можливого ходу пошук з обмеженою глибиною по коридорах (граф
+    перехресть карти) перевіряє, чи існує продовження на horizon кроків,
+    на якому пакмен не зустрінеться з привидом. Привиди поблизу
+    (danger_radius) моделюються песимістично: клітинка небезпечна, якщо
+    хоч один з них може дійти до неї (за таблицею навігації) не пізніше
+    за пакмена з запасом safety_margin. Стани пошуку (клітинка, звідки
+    прийшли, крок) кешуються в таблиці транспозицій, тому пошук лінійний
+    за розміром карти. Серед безпечних ходів обирається той, що веде до
+    найближчої за лабіринтом точки; без привидів поблизу пошук не
+    виконується взагалі.
+    """
+
+    def __init__(self, horizon=12, safety_margin=1.0, danger_radius=8):
+        self.horizon = horizon
+        self.safety_margin = safety_margin
+        self.danger_radius = danger_radius
+        self.ghost_speed_ratio = GHOST_SPEED / PACMAN_SPEED
+        self.transpositions = {}
+        self._corridors = {}
+        self._graph = None
+        # Стан пошуку поточного рішення (заповнюється в get_direction)
+        self._navigation = None
+        self.ghost_positions = set()
+        self._danger = {}
+
+    def reset(self, engine):
+        self.transpositions = {}
+        self.ghost_positions = set()
+        self._danger = {}
+        self._navigation = engine.navigation
+        if self._graph is not engine.junction_graph:
+            # Нова карта - коридори обчислюються заново
+            self._graph = engine.junction_graph
+            self._corridors = {}
+
+    def get_direction(self, engine):
+        pacman = engine.pacman
+        pacman_pos = (pacman.grid_x, pacman.grid_y)
+        if pacman_pos != (pacman.target_x, pacman.target_y):
+            return None
+
+        if self._graph is not engine.junction_graph:
+            self.reset(engine)
+
+        # Найближча точка за лабіринтом (рядок таблиці навігації)
+        navigation = engine.navigation
+        row = navigation.index[pacman_pos] * len(navigation.cells)
+        nearest_dot = min(engine.dots, key=lambda dot: navigation.distances[row + navigation.index[dot]],
+                          default=None)
+
+        # Враховуються лише привиди в радіусі danger_radius від пакмена
+        self._navigation = navigation
+        self.ghost_positions = set()
+        for ghost in engine.ghosts:
+            for ghost_pos in ((ghost.grid_x, ghost.grid_y), (ghost.target_x, ghost.target_y)):
+                distance = navigation.distance(ghost_pos, pacman_pos)
+                if distance is not None and distance <= self.danger_radius:
+                    self.ghost_positions.add(ghost_pos)
+        self.transpositions.clear()
+        self._danger.clear()
+
+        best_direction, best_score = None, None
+        for neighbor in self._graph.cell_neighbors[pacman_pos]:
+            direction = self._graph.direction(pacman_pos, neighbor)
+            survived = self._survival(neighbor, pacman_pos, 1)
+            dot_distance = navigation.distance(neighbor, nearest_dot) if nearest_dot else 0
+            score = (survived, -(dot_distance if dot_distance is not None else len(navigation.cells)),
+                     direction == pacman.direction)
+            if best_score is None or score > best_score:
+                best_direction, best_score = direction, score
+        return best_direction
+
+    def _corridor(self, pos, first):
+        """Клітинки від pos через сусіда first до наступного перехрестя (кешується на карту)"""
+        key = (pos, first)
+        corridor = self._corridors.get(key)
+        if corridor is None:
+            graph = self._graph
+            corridor = [first]
+            previous, current = pos, first
+            while not graph.is_junction(current) and current != pos and len(corridor) <= len(graph.cell_neighbors):
+                previous, current = current, next(n for n in graph.cell_neighbors[current] if n != previous)
+                corridor.append(current)
+            corridor = tuple(corridor)
+            self._corridors[key] = corridor
+        return corridor
+
+    def _is_dangerous(self, pos, steps):
+        """Чи може привид опинитися в клітинці до прибуття пакмена"""
+        ghost_distance = self._danger.get(pos)
+        if ghost_distance is None:
+            navigation = self._navigation
+            distances = [navigation.distance(g, pos) for g in self.ghost_positions]
+            distances = [d for d in distances if d is not None]
+            ghost_distance = min(distances) if distances else float('inf')
+            self._danger[pos] = ghost_distance
+        return ghost_distance <= steps * self.ghost_speed_ratio + self.safety_margin
+
+    def _survival(self, pos, came_from, steps):
+        """
+        Скільки кроків (до horizon) пакмен може безпечно рухатися далі
+
+        Returns:
+            найбільший безпечний крок; horizon - шлях втечі існує
+        """
+        if not self.ghost_positions:
+            return self.horizon
+        if self._is_dangerous(pos, steps):
+            return steps - 1
+        if steps >= self.horizon:
+            return self.horizon
+
+        key = (pos, came_from, steps)
+        survived = self.transpositions.get(key)
+        if survived is not None:
+            return survived
+
+        survived = steps
+        for first in self._graph.cell_neighbors[pos]:
+            if first == came_from:
+                continue  # Розворот не допомагає втекти
+
+            # Прохід коридором до перехрестя
+            t = steps
+            previous = pos
+            for cell in self._corridor(pos, first):
+                t += 1
+                if t >= self.horizon or self._is_dangerous(cell, t):
+                    break
+                previous = cell
+            survived = max(survived, self._survival(cell, previous, t))
+            if survived >= self.horizon:
+                break
+
+        self.transpositions[key] = survived
+        return survived
+
+
+# Контролери за назвою (для запуску в окремих процесах)
+CONTROLLERS = {
+    'random': RandomController,
+    'greedy': GreedyDotController,
+    'autopilot': AutopilotController,
+}
+
+
+def create_controller(name):
+    """Створює контролер за назвою"""
+    if name not in CONTROLLERS:
+        raise ValueError(f"Невідомий контролер {name}! Доступні: {', '.join(CONTROLLERS)}")
+    return CONTROLLERS[name]()
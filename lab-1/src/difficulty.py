@@ -1,4 +1,6 @@
 # difficulty.py - Оновлена система складності з покращеними правилами
+import copy
+
 from src.ghost_ai import *
 from src.enhanced_ghost_ai import *
 
@@ -212,11 +214,9 @@ class DifficultyManager:
                 # Створюємо копії правил для кожного привида
                 for rule_class_or_instance in current_level.rule_sets[i]:
                     if isinstance(rule_class_or_instance, GhostRule):
-                        # Якщо це вже екземпляр правила, створюємо копію
-                        rule_type = type(rule_class_or_instance)
-                        new_rule = rule_type.__new__(rule_type)
-                        new_rule.__dict__.update(rule_class_or_instance.__dict__)
-                        rules.append(new_rule)
+                        # Якщо це вже екземпляр правила, створюємо глибоку копію
+                        # (історія та пам'ять правила не переходять між іграми)
+                        rules.append(copy.deepcopy(rule_class_or_instance))
                     else:
                         # Якщо це клас правила, створюємо новий екземпляр
                         rules.append(rule_class_or_instance)
@@ -0,0 +1,228 @@
+# engine.py - Безголовий рушій гри з фіксованим кроком часу
+import random
+import time
+
+from src.constants import *
+from src.map_loader import MapLoader
+from src.pacman import Pacman
+from src.ghost import Ghost
+from src.difficulty import DifficultyManager
+from src.enhanced_ghost_ai import GhostNetwork
+from src.navigation import NavigationTable
+
+GHOST_COLORS = [RED, BLUE, PINK, ORANGE]
+
+
+class GameResult:
+    """Результат однієї гри"""
+
+    def __init__(self, outcome, map_name, level, seed, ticks, sim_time, dots_eaten, total_dots,
+                 ai_time, wall_time):
+        self.outcome = outcome  # GAME_WON, GAME_LOST або GAME_TIMEOUT
+        self.map_name = map_name
+        self.level = level  # Назва рівня складності
+        self.seed = seed
+        self.ticks = ticks
+        self.sim_time = sim_time  # Тривалість гри в ігрових секундах
+        self.dots_eaten = dots_eaten
+        self.total_dots = total_dots
+        self.ai_time = ai_time  # Реальний час оновлення привидів (секунди)
+        self.wall_time = wall_time  # Реальний час симуляції (секунди)
+
+    @property
+    def won(self):
+        return self.outcome == GAME_WON
+
+    @property
+    def ai_time_per_tick(self):
+        return self.ai_time / self.ticks if self.ticks else 0.0
+
+    def as_dict(self):
+        """Повертає результат у вигляді словника"""
+        result = dict(self.__dict__)
+        result['ai_time_per_tick'] = self.ai_time_per_tick
+        return result
+
+    def __repr__(self):
+        return (f"GameResult({self.outcome}, map={self.map_name}, level={self.level}, "
+                f"time={self.sim_time:.1f}s, dots={self.dots_eaten}/{self.total_dots})")
+
+
+class GameEngine:
+    """
+    Стан і логіка гри без pygame
+
+    Рушій володіє стінами, точками, пакменом і привидами з їх ШІ та
+    просуває гру на фіксований крок часу dt так швидко, як дозволяє
+    процесор. Ігровий час (self.time) є симульованим, тому правила з
+    пам'яттю та мережа привидів поводяться однаково незалежно від
+    швидкості симуляції. Game (pygame) - лише шар відображення над рушієм.
+    """
+
+    def __init__(self, map_name=MAP, difficulty_manager=None, controller=None, seed=None,
+                 dt=SIMULATION_DT, time_limit=SIMULATION_TIME_LIMIT, verbose=False, map_loader=None,
+                 decision_trace=None):
+        """
+        Args:
+            map_name: файл карти в resources/maps
+            difficulty_manager: менеджер складності (None - новий, рівень 1)
+            controller: об'єкт з методом get_direction(engine) для керування пакменом
+            seed: зерно генератора випадкових чисел (None - не змінювати)
+            dt: крок часу симуляції в секундах
+            time_limit: обмеження ігрового часу для run() (секунди)
+            verbose: друкувати налаштування ШІ привидів
+            map_loader: завантажувач карт (None - новий)
+            decision_trace: журнал рішень привидів DecisionTrace (None - без журналу)
+        """
+        self.map_name = map_name
+        self.difficulty_manager = difficulty_manager or DifficultyManager()
+        self.controller = controller
+        self.seed = seed
+        self.dt = dt
+        self.time_limit = time_limit
+        self.verbose = verbose
+        self.map_loader = map_loader or MapLoader()
+        self.decision_trace = decision_trace
+
+        self.map_width = 0
+        self.map_height = 0
+        self.ghost_ais = []
+
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        """Починає гру спочатку на поточній карті та рівні складності"""
+        if seed is not None:
+            self.seed = seed
+            random.seed(seed)
+
+        self.time = 0.0
+        self.ticks = 0
+        self.ai_time = 0.0
+        self.ghost_network = GhostNetwork(self.decision_trace)  # Мережа привидів окрема для кожної гри
+        if self.decision_trace is not None:
+            self.decision_trace.clear()
+            self.decision_trace.tick = 0
+        self.load_map(self.map_name)
+        self.state = GAME_PLAYING
+
+        if self.controller is not None and hasattr(self.controller, 'reset'):
+            self.controller.reset(self)
+
+    def load_map(self, map_name):
+        """Завантажує карту з файлу"""
+        map_data = self.map_loader.load_map(map_name)
+        self.map_name = map_name
+        self.walls = map_data['walls']
+        self.map_width = max(x for x, y in self.walls) + 1
+        self.map_height = max(y for x, y in self.walls) + 1
+        # Відстані та перші кроки між усіма клітинками (стіни не змінюються)
+        self.navigation = NavigationTable.for_map(self.walls, self.map_width, self.map_height)
+        # Граф перехресть: привиди приймають рішення лише на перехрестях
+        self.junction_graph = map_data['junction_graph']
+        self.dots = map_data['dots'].copy()  # копіюємо для подальшого видалення
+        self.total_dots = len(self.dots)
+
+        # Створюємо пакмена
+        pacman_pos = map_data['pacman_start']
+        self.pacman = Pacman(pacman_pos[0], pacman_pos[1], self)
+
+        # Створюємо привидів
+        self.ghosts = []
+        for i, ghost_pos in enumerate(map_data['ghost_starts']):
+            color = GHOST_COLORS[i % len(GHOST_COLORS)]
+            self.ghosts.append(Ghost(ghost_pos[0], ghost_pos[1], color, self))
+
+        # Створюємо ШІ для привидів відповідно до поточного рівня складності
+        self.setup_ghost_ai()
+
+    def setup_ghost_ai(self):
+        """Налаштовує ШІ для привидів відповідно до поточного рівня складності"""
+        self.ghost_ais = self.difficulty_manager.create_ghost_ais(self.ghosts, self)
+
+        # Встановлюємо ШІ для кожного привида
+        for i, ghost in enumerate(self.ghosts):
+            if i < len(self.ghost_ais):
+                ghost.set_ai(self.ghost_ais[i])
+                if self.verbose:
+                    print(f"Ghost {i+1} AI rules: {[rule.__class__.__name__ for rule in self.ghost_ais[i].rules]}")
+
+    def update(self, dt=None):
+        """
+        Один крок симуляції
+
+        Args:
+            dt: крок часу (None - self.dt)
+
+        Returns:
+            стан гри після кроку
+        """
+        if self.state != GAME_PLAYING:
+            return self.state
+
+        dt = self.dt if dt is None else dt
+        self.time += dt
+        self.ticks += 1
+        if self.decision_trace is not None:
+            self.decision_trace.tick = self.ticks
+
+        if self.controller is not None:
+            direction = self.controller.get_direction(self)
+            if direction is not None:
+                self.pacman.set_direction(direction)
+
+        self.pacman.update(dt, self.walls)
+
+        # Перевіряємо збір точок на основі поточної позиції пекмена
+        pacman_grid_pos = (int(self.pacman.grid_x), int(self.pacman.grid_y))
+        if pacman_grid_pos in self.dots:
+            self.dots.remove(pacman_grid_pos)
+
+        if len(self.dots) == 0:
+            self.state = GAME_WON
+            return self.state
+
+        # Оновлюємо привидів
+        started = time.perf_counter()
+        try:
+            for ghost in self.ghosts:
+                ghost.update(dt, self.walls, self.pacman, self.ghosts)
+                if ghost.check_collision(self.pacman):
+                    self.state = GAME_LOST
+                    break
+        finally:
+            self.ai_time += time.perf_counter() - started
+
+        return self.state
+
+    def run(self, time_limit=None):
+        """
+        Грає до перемоги, поразки або вичерпання ігрового часу
+
+        Args:
+            time_limit: обмеження ігрового часу (None - self.time_limit)
+
+        Returns:
+            GameResult
+        """
+        time_limit = self.time_limit if time_limit is None else time_limit
+        started = time.perf_counter()
+        while self.state == GAME_PLAYING and self.time < time_limit:
+            self.update()
+        return self.result(time.perf_counter() - started)
+
+    def result(self, wall_time=0.0):
+        """Повертає результат поточної гри"""
+        outcome = self.state if self.state in (GAME_WON, GAME_LOST) else GAME_TIMEOUT
+        return GameResult(
+            outcome=outcome,
+            map_name=self.map_name,
+            level=self.difficulty_manager.get_current_level().name,
+            seed=self.seed,
+            ticks=self.ticks,
+            sim_time=self.time,
+            dots_eaten=self.total_dots - len(self.dots),
+            total_dots=self.total_dots,
+            ai_time=self.ai_time,
+            wall_time=wall_time
+        )
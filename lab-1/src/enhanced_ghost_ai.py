@@ -2,20 +2,18 @@
 import random
 import math
 from collections import deque
-import time
 
 from src.constants import *
 from src.ghost_ai import GhostRule
-
-import logging
-logger = logging.getLogger('GhostAI')
+from src.tracing import get_decision_trace
 
 
 # Глобальна система комунікації привидів
 class GhostNetwork:
-    def __init__(self):
+    def __init__(self, trace=None):
         self.shared_memory = {}
         self.communication_range = 4
+        self.trace = trace  # Журнал рішень гри (None - без запису)
 
     def share_pacman_sighting(self, ghost_pos, pacman_pos, timestamp, confidence=1.0):
         """Привид ділиться інформацією про пакмена"""
@@ -24,9 +22,9 @@ class GhostNetwork:
         self.shared_memory['confidence'] = confidence
         self.shared_memory['reporter_pos'] = ghost_pos
 
-        # Логування мережевої взаємодії
-        logger.info(f"Network update - Ghost at {ghost_pos} shared Pacman at {pacman_pos} "
-                    f"with confidence {confidence:.2f}")
+        # Запис мережевої взаємодії (привид позначається позицією інформатора)
+        if self.trace is not None:
+            self.trace.record(ghost_pos, "network_share", pacman_pos, confidence, TRACE_EVENTS)
 
     def get_shared_pacman_info(self, ghost_pos, current_time):
         """Отримує інформацію про пакмена від інших привидів"""
@@ -50,10 +48,15 @@ class GhostNetwork:
         return self.shared_memory['pacman_pos'], max(0, confidence)
 
 
-# Глобальна мережа
+# Глобальна мережа (для ігор без власної мережі)
 ghost_network = GhostNetwork()
 
 
+def get_ghost_network(game):
+    """Мережа привидів поточної гри"""
+    return getattr(game, 'ghost_network', ghost_network)
+
+
 class EnhancedVisionRule(GhostRule):
     """Покращене правило зору з різними типами детекції"""
 
@@ -69,6 +72,7 @@ class EnhancedVisionRule(GhostRule):
         """Комплексна детекція пакмена"""
         ghost_pos = (ghost_ai.ghost.grid_x, ghost_ai.ghost.grid_y)
         pacman_pos = (pacman.grid_x, pacman.grid_y)
+        network = get_ghost_network(ghost_ai.game)
         distance = math.sqrt((ghost_pos[0] - pacman_pos[0]) ** 2 + (ghost_pos[1] - pacman_pos[1]) ** 2)
 
         detected = False
@@ -89,7 +93,7 @@ class EnhancedVisionRule(GhostRule):
 
         # 3. Інформація від інших привидів
         if not detected:
-            shared_pos, shared_confidence = ghost_network.get_shared_pacman_info(ghost_pos, current_time)
+            shared_pos, shared_confidence = network.get_shared_pacman_info(ghost_pos, current_time)
             if shared_pos and shared_confidence > 0.2:
                 pacman_pos = shared_pos
                 detection_confidence = shared_confidence * 0.85  # Менша впевненість для чужої інформації
@@ -111,18 +115,18 @@ class EnhancedVisionRule(GhostRule):
             self.last_seen_time = current_time
 
             # Ділимося інформацією з іншими привидами
-            ghost_network.share_pacman_sighting(ghost_pos, pacman_pos, current_time, detection_confidence)
+            network.share_pacman_sighting(ghost_pos, pacman_pos, current_time, detection_confidence)
 
         if detected:
-            color_name = ghost_ai.ghost.get_color_name()
-            logger.info(f"{color_name} ghost detected Pacman via {detection_method} "
-                        f"at {pacman_pos} with confidence {detection_confidence:.2f}")
+            trace = get_decision_trace(ghost_ai.game)
+            if trace is not None:
+                trace.record(ghost_ai.ghost.color, "detect_" + detection_method, pacman_pos,
+                             detection_confidence, TRACE_EVENTS)
 
             if detection_method in ["sight", "sound"]:
-                ghost_network.share_pacman_sighting(
+                network.share_pacman_sighting(
                     ghost_pos, pacman_pos, current_time, detection_confidence
                 )
-                logger.info(f"{color_name} ghost shared Pacman location with network")
 
         return detected, pacman_pos, detection_confidence, detection_method
 
@@ -159,7 +163,7 @@ class EnhancedVisionRule(GhostRule):
         return True
 
     def evaluate(self, ghost_ai, walls, pacman, other_ghosts):
-        current_time = time.time()
+        current_time = ghost_ai.game.time  # Ігровий час (симульований у безголовому режимі)
         detected, target_pos, confidence, method = self.detect_pacman(ghost_ai, pacman, walls, current_time)
 
         if not detected or confidence < 0.1:
@@ -168,10 +172,8 @@ class EnhancedVisionRule(GhostRule):
         ghost_pos = (ghost_ai.ghost.grid_x, ghost_ai.ghost.grid_y)
         avoid_positions = {(g.grid_x, g.grid_y) for g in other_ghosts if g != ghost_ai.ghost}
 
-        # Використовуємо BFS для пошуку шляху
-        direction = bfs_next_step(ghost_pos, target_pos, walls,
-                                  ghost_ai.game.map_width, ghost_ai.game.map_height,
-                                  avoid_positions)
+        # Шлях за таблицею навігації (пошук лише при блокуваннях)
+        direction = self.next_step(ghost_ai, target_pos, walls, avoid_positions)
 
         if direction:
             # Сила залежить від впевненості в детекції
@@ -221,14 +223,13 @@ class SmartPatrolRule(GhostRule):
 
         avoid_positions = {(g.grid_x, g.grid_y) for g in other_ghosts if g != ghost_ai.ghost}
 
-        direction = bfs_next_step(ghost_pos, target_pos, walls,
-                                  ghost_ai.game.map_width, ghost_ai.game.map_height,
-                                  avoid_positions)
+        direction = self.next_step(ghost_ai, target_pos, walls, avoid_positions)
 
         if self.current_target == 0 and self.patrol_completion_count > 0:
-            color_name = ghost_ai.ghost.get_color_name()
-            logger.info(f"{color_name} ghost completed {self.patrol_completion_count} "
-                        f"patrol cycles - priority adjusted to {self.adaptive_priority:.1f}")
+            trace = get_decision_trace(ghost_ai.game)
+            if trace is not None:
+                trace.record(ghost_ai.ghost.color, "patrol_cycle", self.patrol_completion_count,
+                             self.adaptive_priority, TRACE_EVENTS)
 
         return (direction, self.adaptive_priority) if direction else (None, 0.0)
 
@@ -244,12 +245,14 @@ class IntelligentWanderRule(GhostRule):
 
     def evaluate(self, ghost_ai, walls, pacman, other_ghosts):
         ghost_pos = (ghost_ai.ghost.grid_x, ghost_ai.ghost.grid_y)
-        current_time = time.time()
+        current_time = ghost_ai.game.time  # Ігровий час (симульований у безголовому режимі)
 
-        if random.random() < 0.1:  # Логуємо 10% випадків блукання
-            color_name = ghost_ai.ghost.get_color_name()
-            logger.info(f"{color_name} ghost is wandering - "
-                        f"recent positions: {len(set(self.position_history))}/8 unique")
+        # Різноманітність останніх позицій (вибірку записів задає журнал)
+        trace = get_decision_trace(ghost_ai.game)
+        if trace is not None and trace.enabled(TRACE_EVENTS):
+            unique_positions = len(set(self.position_history))
+            trace.record(ghost_ai.ghost.color, "wander_unique", unique_positions,
+                         unique_positions / self.position_history.maxlen, TRACE_EVENTS)
 
         # Додаємо поточну позицію до історії
         self.position_history.append(ghost_pos)
@@ -317,37 +320,3 @@ class IntelligentWanderRule(GhostRule):
         self.direction_history.append(chosen_direction)
         return chosen_direction, self.priority
 
-
-# BFS функція (без змін)
-def bfs_next_step(start_pos, target_pos, walls, map_width, map_height, avoid_positions=None):
-    """BFS пошук наступного кроку до цілі"""
-    if start_pos == target_pos:
-        return None
-
-    avoid_positions = avoid_positions or set()
-    queue = deque([(start_pos, [])])
-    visited = {start_pos}
-
-    while queue:
-        (x, y), path = queue.popleft()
-
-        for direction in DIRECTIONS:
-            next_x = (x + direction[0]) % map_width
-            next_y = (y + direction[1]) % map_height
-            next_pos = (next_x, next_y)
-
-            if next_pos in visited or next_pos in walls or next_pos in avoid_positions:
-                continue
-
-            new_path = path + [direction]
-
-            if next_pos == target_pos:
-                return new_path[0] if new_path else None
-
-            queue.append((next_pos, new_path))
-            visited.add(next_pos)
-
-            if len(new_path) > 15:
-                break
-
-    return None
\ No newline at end of file
@@ -1,83 +1,120 @@
 # game.py (оновлений з новою системою ШІ)
 import pygame
-import os
 from src.constants import *
-from src.map_loader import MapLoader
-from src.pacman import Pacman
-from src.ghost import Ghost
+from src.engine import GameEngine
+from src.controllers import KeyboardController, AutopilotController
+from src.tracing import DecisionTrace
 from src.ui import UI
-from src.difficulty import DifficultyManager
 
 
 class Game:
+    """Відображення та керування з клавіатури поверх GameEngine"""
+
     def __init__(self, screen):
         self.screen = screen
         self.font = pygame.font.Font(None, 36)
         self.big_font = pygame.font.Font(None, 72)
         self.small_font = pygame.font.Font(None, 24)
 
-        self.map_width = 0
-        self.map_height = 0
+        # Пакменом керує контролер: клавіатура або автопілот (Tab)
+        self.keyboard = KeyboardController()
+        self.autopilot = AutopilotController()
 
-        # Ініціалізуємо менеджер складності
-        self.difficulty_manager = DifficultyManager()
-        self.ghost_ais = []
+        # Журнал рішень привидів: T - накладка з останніми записами, L - збереження у файл
+        self.decision_trace = DecisionTrace(level=TRACE_EVENTS)
+        self.show_trace = False
 
-        # Завантажуємо карту
-        self.map_loader = MapLoader()
-        self.load_map(MAP)  # базова карта
+        # Рушій завантажує базову карту та налаштовує ШІ привидів
+        self.engine = GameEngine(MAP, controller=self.keyboard, verbose=True, decision_trace=self.decision_trace)
 
-        self.state = GAME_PLAYING
         self.ui = UI(screen, self.font, self.big_font)
 
+        # Кеш відмальовування: фон зі стінами, шар точок і прямокутники попереднього кадру
+        self._background = None
+        self._background_walls = None
+        self._dots_layer = None
+        self._dots_layer_source = None
+        self._drawn_dots = set()
+        self._drawn_state = None
+        self._sprite_rects = []
+        self._hud_rects = []
+        self._hud_drawn_key = None
+
+    # Стан гри належить рушію
+    @property
+    def state(self):
+        return self.engine.state
+
+    @state.setter
+    def state(self, value):
+        self.engine.state = value
+
+    @property
+    def difficulty_manager(self):
+        return self.engine.difficulty_manager
+
+    @property
+    def walls(self):
+        return self.engine.walls
+
+    @property
+    def dots(self):
+        return self.engine.dots
+
+    @property
+    def total_dots(self):
+        return self.engine.total_dots
+
+    @property
+    def pacman(self):
+        return self.engine.pacman
+
+    @property
+    def ghosts(self):
+        return self.engine.ghosts
+
+    @property
+    def ghost_ais(self):
+        return self.engine.ghost_ais
+
+    @property
+    def map_width(self):
+        return self.engine.map_width
+
+    @property
+    def map_height(self):
+        return self.engine.map_height
+
     def load_map(self, map_name):
         """Завантажує карту з файлу"""
-        map_data = self.map_loader.load_map(map_name)
-        self.walls = map_data['walls']
-        self.map_width = max(x for x, y in self.walls) + 1
-        self.map_height = max(y for x, y in self.walls) + 1
-        self.dots = map_data['dots'].copy()  # копіюємо для подальшого видалення
-        self.total_dots = len(self.dots)
-
-        # Створюємо пакмена
-        pacman_pos = map_data['pacman_start']
-        self.pacman = Pacman(pacman_pos[0], pacman_pos[1], self)
-
-        # Створюємо привидів
-        self.ghosts = []
-        colors = [RED, BLUE, PINK, ORANGE]
-        for i, ghost_pos in enumerate(map_data['ghost_starts']):
-            color = colors[i % len(colors)]
-            ghost = Ghost(ghost_pos[0], ghost_pos[1], color, self)
-            self.ghosts.append(ghost)
-
-        # Створюємо ШІ для привидів відповідно до поточного рівня складності
-        self.setup_ghost_ai()
+        self.engine.load_map(map_name)
 
     def setup_ghost_ai(self):
         """Налаштовує ШІ для привидів відповідно до поточного рівня складності"""
-        self.ghost_ais = self.difficulty_manager.create_ghost_ais(self.ghosts, self)
-
-        # Встановлюємо ШІ для кожного привида
-        for i, ghost in enumerate(self.ghosts):
-            if i < len(self.ghost_ais):
-                ghost.set_ai(self.ghost_ais[i])
-                print(f"Ghost {i+1} AI rules: {[rule.__class__.__name__ for rule in self.ghost_ais[i].rules]}")
+        self.engine.setup_ghost_ai()
 
     def handle_event(self, event):
         """Обробляє події"""
         if event.type == pygame.KEYDOWN:
-            if self.state == GAME_PLAYING:
+            # Журнал рішень доступний у будь-якому стані гри
+            if event.key == pygame.K_t:
+                self.show_trace = not self.show_trace
+            elif event.key == pygame.K_l:
+                self.dump_trace()
+
+            elif self.state == GAME_PLAYING:
                 if event.key == pygame.K_ESCAPE:
                     self.state = GAME_PAUSED
+                elif event.key == pygame.K_TAB:
+                    self.toggle_autopilot()
                 elif event.key in [pygame.K_UP, pygame.K_w]:
-                    self.pacman.set_direction(UP)
+                    self.keyboard.press(UP)
                 elif event.key in [pygame.K_DOWN, pygame.K_s]:
-                    self.pacman.set_direction(DOWN)
+                    self.keyboard.press(DOWN)
                 elif event.key in [pygame.K_LEFT, pygame.K_a]:
-                    self.pacman.set_direction(LEFT)
+                    self.keyboard.press(LEFT)
                 elif event.key in [pygame.K_RIGHT, pygame.K_d]:
-                    self.pacman.set_direction(RIGHT)
+                    self.keyboard.press(RIGHT)
                 # Керування рівнем складності під час гри
                 elif event.key == pygame.K_PLUS or event.key == pygame.K_EQUALS:
                     if self.difficulty_manager.next_level():
@@ -125,68 +162,152 @@ class Game:
                         self.setup_ghost_ai()
                         print(f"Difficulty decreased to: {self.difficulty_manager.get_current_level().name}")
 
+    def toggle_autopilot(self):
+        """Перемикає керування пакменом між клавіатурою та автопілотом"""
+        controller = self.keyboard if self.engine.controller is self.autopilot else self.autopilot
+        controller.reset(self.engine)
+        self.engine.controller = controller
+        print(f"Pacman controller: {type(controller).__name__}")
+
+    def dump_trace(self, filename=DECISION_TRACE_FILE):
+        """Зберігає журнал рішень привидів у CSV"""
+        count = self.decision_trace.dump(filename)
+        print(f"Decision trace: {count} records saved to {filename}")
+
     def restart_game(self):
         """Перезапускає гру"""
         print(f"Restarting game on difficulty: {self.difficulty_manager.get_current_level().name}")
-        self.load_map(MAP)
-        self.state = GAME_PLAYING
+        self.engine.reset()
 
     def update(self, dt):
-        if self.state != GAME_PLAYING:
-            return
+        """Просуває гру на dt секунд (реальний час кадру)"""
+        self.engine.update(dt)
 
-        # Зберігаємо dt для використання в ШІ
-        self.dt = dt
+    def _build_background(self):
+        """Малює стіни карти один раз у окрему поверхню"""
+        self._background = pygame.Surface(self.screen.get_size()).convert()
+        self._background.fill(BLACK)
+        for wall_pos in self.walls:
+            x, y = wall_pos[0] * CELL_SIZE, wall_pos[1] * CELL_SIZE
+            pygame.draw.rect(self._background, BLUE, (x, y, CELL_SIZE, CELL_SIZE))
+        self._background_walls = self.walls
+        self._dots_layer_source = None
 
-        self.pacman.update(dt, self.walls)
+    def _build_dots_layer(self):
+        """Фон зі стінами та всіма поточними точками"""
+        self._dots_layer = self._background.copy()
+        for dot_pos in self.dots:
+            x, y = dot_pos[0] * CELL_SIZE + CELL_SIZE // 2, dot_pos[1] * CELL_SIZE + CELL_SIZE // 2
+            pygame.draw.circle(self._dots_layer, WHITE, (x, y), 3)
+        self._dots_layer_source = self.dots
+        self._drawn_dots = set(self.dots)
+
+    def _erase_eaten_dots(self):
+        """
+        Прибирає з шару точок з'їдені точки
 
-        # Перевіряємо збір точок на основі поточної позиції пекмена
-        pacman_grid_pos = (int(self.pacman.grid_x), int(self.pacman.grid_y))
-        if pacman_grid_pos in self.dots:
-            self.dots.remove(pacman_grid_pos)
+        Returns:
+            прямокутники клітинок, що змінилися
+        """
+        eaten = self._drawn_dots.difference(self.dots)
+        rects = []
+        for dot_pos in eaten:
+            rect = pygame.Rect(dot_pos[0] * CELL_SIZE, dot_pos[1] * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+            self._dots_layer.blit(self._background, rect, rect)
+            rects.append(rect)
+        self._drawn_dots.difference_update(eaten)
+        return rects
 
-        if len(self.dots) == 0:
-            self.state = GAME_WON
-            return
+    def _sprite_rect(self, sprite):
+        """Прямокутник, що гарантовано вміщує спрайт (голова привида виходить за клітинку)"""
+        return pygame.Rect(int(sprite.x) - CELL_SIZE, int(sprite.y) - CELL_SIZE, CELL_SIZE * 2, CELL_SIZE * 2)
 
-        # Оновлюємо привидів
+    def _sprite_rects_now(self):
+        """Прямокутники пакмена та привидів у поточних позиціях"""
+        return [self._sprite_rect(self.pacman)] + [self._sprite_rect(ghost) for ghost in self.ghosts]
+
+    def _draw_sprites(self):
+        """Малює пакмена та привидів і повертає їх прямокутники"""
+        self.pacman.draw(self.screen)
         for ghost in self.ghosts:
-            ghost.update(dt, self.walls, self.pacman, self.ghosts)
-            if ghost.check_collision(self.pacman):
-                self.state = GAME_LOST
-                return
+            ghost.draw(self.screen)
+        return self._sprite_rects_now()
+
+    def _hud_key(self):
+        """Стан, від якого залежить текст інтерфейсу"""
+        return (len(self.dots), self.total_dots, self.difficulty_manager.current_level)
+
+    def _draw_hud(self):
+        """Малює рахунок та інформацію про складність і повертає їх прямокутники"""
+        rects = [self.ui.draw_score(len(self.dots), self.total_dots)]
+        rects.extend(self.ui.draw_difficulty_info(self.difficulty_manager))
+        self._hud_rects = rects
+        self._hud_drawn_key = self._hud_key()
+        return rects
 
     def draw(self):
-        """Відмальовує гру"""
-        self.screen.fill(BLACK)
+        """
+        Відмальовує гру
 
-        # Малюємо стіни
-        for wall_pos in self.walls:
-            x, y = wall_pos[0] * CELL_SIZE, wall_pos[1] * CELL_SIZE
-            pygame.draw.rect(self.screen, BLUE, (x, y, CELL_SIZE, CELL_SIZE))
+        Стіни малюються один раз на карту у фонову поверхню, точки - у
+        шар поверх неї, з якого стираються лише з'їдені точки. Під час гри
+        перемальовуються тільки прямокутники рухомих спрайтів і тексту,
+        що змінився; накладки паузи, перемоги та поразки малюють увесь
+        екран.
 
-        # Малюємо точки
-        for dot_pos in self.dots:
-            x, y = dot_pos[0] * CELL_SIZE + CELL_SIZE // 2, dot_pos[1] * CELL_SIZE + CELL_SIZE // 2
-            pygame.draw.circle(self.screen, WHITE, (x, y), 3)
+        Returns:
+            список змінених прямокутників для pygame.display.update або
+            None, якщо змінився весь екран
+        """
+        # Накладка журналу змінюється щокадру, тому з нею екран малюється повністю
+        drawn_state = (self.state, self.show_trace)
+        full_redraw = drawn_state != (GAME_PLAYING, False) or self._drawn_state != drawn_state
+        if self._background is None or self._background_walls is not self.walls:
+            self._build_background()
+            full_redraw = True
+        if self._dots_layer_source is not self.dots:
+            # Нова гра або карта - точки малюються заново
+            self._build_dots_layer()
+            full_redraw = True
+        self._drawn_state = drawn_state
 
-        # Малюємо пакмена
-        self.pacman.draw(self.screen)
+        if full_redraw:
+            self._erase_eaten_dots()
+            self.screen.blit(self._dots_layer, (0, 0))
+            self._sprite_rects = self._draw_sprites()
+            self._draw_hud()
 
-        # Малюємо привидів
-        for ghost in self.ghosts:
-            ghost.draw(self.screen)
+            if self.state == GAME_PAUSED:
+                self.ui.draw_pause_screen(self.difficulty_manager)
+            elif self.state == GAME_WON:
+                self.ui.draw_win_screen()
+            elif self.state == GAME_LOST:
+                self.ui.draw_lose_screen()
+
+            if self.show_trace:
+                trace = self.decision_trace
+                self.ui.draw_trace([trace.format_fields(record) for record in trace.latest(TRACE_OVERLAY_LINES)])
+            return None
+
+        # Стираємо спрайти попереднього кадру та з'їдені точки
+        dirty = self._erase_eaten_dots() + self._sprite_rects
+        sprite_rects = self._sprite_rects_now()
+
+        # Текст перемальовується, якщо змінився або його зачіпають спрайти
+        redraw_hud = (self._hud_key() != self._hud_drawn_key or
+                      any(rect.collidelist(self._hud_rects) >= 0 for rect in dirty + sprite_rects))
+        if redraw_hud:
+            dirty.extend(self._hud_rects)
+
+        for rect in dirty:
+            self.screen.blit(self._dots_layer, rect, rect)
 
-        # Малюємо UI
-        self.ui.draw_score(len(self.dots), self.total_dots)
-        self.ui.draw_difficulty_info(self.difficulty_manager)
+        self._sprite_rects = self._draw_sprites()
+        dirty.extend(self._sprite_rects)
+        if redraw_hud:
+            dirty.extend(self._draw_hud())
 
-        if self.state == GAME_PAUSED:
-            self.ui.draw_pause_screen(self.difficulty_manager)
-        elif self.state == GAME_WON:
-            self.ui.draw_win_screen()
-        elif self.state == GAME_LOST:
-            self.ui.draw_lose_screen()
+        return dirty
 
     def get_ghost_debug_info(self):
         """Повертає інформацію про поточні дії привидів для дебагу"""
@@ -1,5 +1,9 @@
 # ghost.py (оновлений для сумісності з новою системою ШІ)
-import pygame
+try:
+    import pygame
+    from src.sprites import ghost_frame
+except ImportError:  # Безголовий режим (src/engine.py) працює без pygame
+    pygame = None
 import random
 import math
 from src.constants import *
@@ -39,9 +43,10 @@ class Ghost:
     def set_ai(self, ai):
         """Встановлює ШІ для цього привида"""
         self.ai = ai
-        print(f"Setting AI for ghost at ({self.grid_x}, {self.grid_y}): {type(ai).__name__}")
-        if hasattr(ai, 'rules'):
-            print(f"  Rules: {[rule.__class__.__name__ for rule in ai.rules]}")
+        if getattr(self.game, 'verbose', True):
+            print(f"Setting AI for ghost at ({self.grid_x}, {self.grid_y}): {type(ai).__name__}")
+            if hasattr(ai, 'rules'):
+                print(f"  Rules: {[rule.__class__.__name__ for rule in ai.rules]}")
 
     def get_valid_directions(self, walls, ghosts):
         """Повертає список валідних напрямків руху без перевірки на інших привидів (для зворотної сумісності)"""
@@ -59,9 +64,6 @@ class Ghost:
         return valid_directions
 
     def update(self, dt, walls, pacman, ghosts):
-        # Зберігаємо dt в game для використання в ШІ
-        self.game.dt = dt
-
         # Оновлення анімації
         self.animation_timer += dt
         self.decision_timer += dt
@@ -69,9 +71,14 @@ class Ghost:
         # Якщо ми досягли цільової клітинки
         if self.grid_x == self.target_x and self.grid_y == self.target_y:
             new_direction = self.direction
+            corridor_direction = self.get_corridor_direction(pacman)
+
+            if corridor_direction is not None:
+                # Усередині коридору вибору немає - продовжуємо рух без ШІ
+                new_direction = corridor_direction
 
             # Використовуємо ШІ для прийняття рішення про напрямок
-            if self.ai and self.decision_timer >= self.decision_delay:
+            elif self.ai and self.decision_timer >= self.decision_delay:
                 try:
                     # Передаємо поточний напрямок в ШІ для кращого контексту
                     if hasattr(self.ai, 'current_direction'):
@@ -81,7 +88,8 @@ class Ghost:
                     self.decision_timer = 0
 
                     # Debug інформація (рідко)
-                    if hasattr(self.ai, 'rules') and random.random() < 0.005:  # 0.5% шанс
+                    if (getattr(self.game, 'verbose', True) and hasattr(self.ai, 'rules')
+                            and random.random() < 0.005):  # 0.5% шанс
                         active_rules = []
                         for rule in self.ai.rules:
                             if rule.enabled:
@@ -179,6 +187,19 @@ class Ghost:
                 self.x = (self.grid_x + (self.target_x - self.grid_x) * self.move_progress) * CELL_SIZE + CELL_SIZE // 2
                 self.y = (self.grid_y + (self.target_y - self.grid_y) * self.move_progress) * CELL_SIZE + CELL_SIZE // 2
 
+    def get_corridor_direction(self, pacman):
+        """Напрямок руху коридором без рішення ШІ (None - потрібне рішення)"""
+        junction_graph = getattr(self.game, 'junction_graph', None)
+        if not DECIDE_AT_JUNCTIONS or junction_graph is None:
+            return None
+
+        # Пакмен у тому ж коридорі - можливо, потрібно розвернутися
+        ghost_pos = (self.grid_x, self.grid_y)
+        if junction_graph.same_corridor(ghost_pos, (pacman.grid_x, pacman.grid_y)):
+            return None
+
+        return junction_graph.corridor_direction(ghost_pos, self.direction)
+
     def get_valid_directions_with_smart_fallback(self, walls, ghosts):
         """Повертає валідні напрямки з розумним вибором для уникнення застрягання"""
         valid_directions = []
@@ -219,39 +240,6 @@ class Ghost:
         return self.grid_x == pacman.grid_x and self.grid_y == pacman.grid_y
 
     def draw(self, screen):
-        center = (int(self.x), int(self.y))
-        half_size = self.size // 2
-
-        # Тіло привида
-        body_rect = pygame.Rect(center[0] - half_size, center[1] - half_size,
-                                self.size, self.size)
-        pygame.draw.rect(screen, self.color, body_rect)
-
-        # Голова
-        pygame.draw.circle(screen, self.color,
-                           (center[0], center[1] - half_size + half_size // 2),
-                           half_size)
-
-        # Хвилясті краї знизу
-        bottom_y = center[1] + half_size
-        wave_width = self.size // 4
-
-        for i in range(4):
-            x1 = center[0] - half_size + i * wave_width
-            x2 = x1 + wave_width
-            x_mid = (x1 + x2) // 2
-            wave_offset = int(3 * math.sin(self.animation_timer * 5 + i))
-            points = [(x1, bottom_y), (x_mid, bottom_y - wave_width // 2 + wave_offset),
-                      (x2, bottom_y)]
-            pygame.draw.polygon(screen, self.color, points)
-
-        # Очі
-        eye_size = 3
-        eye_y = center[1] - half_size // 2
-        left_eye = (center[0] - half_size // 2, eye_y)
-        right_eye = (center[0] + half_size // 2, eye_y)
-
-        pygame.draw.circle(screen, WHITE, left_eye, eye_size)
-        pygame.draw.circle(screen, WHITE, right_eye, eye_size)
-        pygame.draw.circle(screen, BLACK, left_eye, eye_size // 2)
-        pygame.draw.circle(screen, BLACK, right_eye, eye_size // 2)
\ No newline at end of file
+        # Готовий кадр з кешу спрайтів - один blit на кадр
+        surface, offset = ghost_frame(self.color, self.animation_timer)
+        screen.blit(surface, (int(self.x) + offset[0], int(self.y) + offset[1]))
\ No newline at end of file
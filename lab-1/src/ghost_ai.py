@@ -1,59 +1,53 @@
 # ghost_ai.py - Покращена система ШІ з правилами
 import random
 import math
-from collections import deque
 
 from src.constants import *
+from src.pathfinding import PathFinder
+from src.tracing import get_decision_trace
 
-import logging
 
-# Налаштування логування
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(message)s',
-    datefmt='%H:%M:%S'
-)
-logger = logging.getLogger('GhostAI')
+def get_pathfinder(game, walls):
+    """Пошук по клітинках для ігор без графа перехресть (один спільний об'єкт на карту)"""
+    return PathFinder.for_map(walls, game.map_width, game.map_height)
 
 
-def bfs_next_step(start_pos, target_pos, walls, map_width, map_height, avoid_positions=None):
+def find_next_step(game, start_pos, target_pos, walls, avoid_positions=None, max_depth=None):
     """
-    BFS пошук наступного кроку до цілі
-    Повертає напрямок для наступного кроку або None якщо шлях не знайдено
+    Наступний крок до цілі для правил привидів
+
+    Спочатку використовується таблиця навігації карти (game.navigation):
+    без блокувань або коли інші привиди не стоять на найкоротшому шляху
+    відповідь береться з таблиці за O(1). Інакше - пошук з урахуванням
+    заблокованих позицій по графу перехресть (game.junction_graph).
+    BFS по клітинках (PathFinder) лишається лише для ігор без графа.
     """
     if start_pos == target_pos:
         return None
 
-    avoid_positions = avoid_positions or set()
-    queue = deque([(start_pos, [])])  # (позиція, шлях_до_неї)
-    visited = {start_pos}
-
-    while queue:
-        (x, y), path = queue.popleft()
-
-        # Перевіряємо всі можливі напрямки
-        for direction in DIRECTIONS:
-            next_x = (x + direction[0]) % map_width
-            next_y = (y + direction[1]) % map_height
-            next_pos = (next_x, next_y)
+    navigation = getattr(game, 'navigation', None)
+    if navigation is not None and navigation.covers(start_pos, target_pos):
+        if max_depth is not None:
+            distance = navigation.distance(start_pos, target_pos)
+            if distance is None or distance > max_depth:
+                return None
 
-            if next_pos in visited or next_pos in walls or next_pos in avoid_positions:
-                continue
+        if not avoid_positions:
+            return navigation.next_step(start_pos, target_pos)
 
-            new_path = path + [direction]
+        found, direction = navigation.next_step_avoiding(start_pos, target_pos, avoid_positions)
+        if found:
+            return direction
 
-            if next_pos == target_pos:
-                # Знайшли шлях - повертаємо перший крок
-                return new_path[0] if new_path else None
-
-            queue.append((next_pos, new_path))
-            visited.add(next_pos)
-
-            # Обмежуємо глибину пошуку для продуктивності
-            if len(new_path) > 15:
-                break
+    # Пошук з блокуваннями по графу перехресть
+    junction_graph = getattr(game, 'junction_graph', None)
+    if junction_graph is not None and start_pos in junction_graph.cell_neighbors:
+        distance, direction = junction_graph.search(start_pos, target_pos, avoid_positions)
+        if distance is None or (max_depth is not None and distance > max_depth):
+            return None
+        return direction
 
-    return None
+    return get_pathfinder(game, walls).next_step(start_pos, target_pos, avoid_positions, max_depth)
 
 
 class GhostRule:
@@ -62,11 +56,43 @@ class GhostRule:
     def __init__(self, priority=1.0, enabled=True):
         self.priority = priority  # Пріоритет правила (вищий = важливіший)
         self.enabled = enabled  # Чи активне правило
+        self.max_depth = PATH_SEARCH_DEPTH  # Обмеження довжини шляху (None - без обмеження)
 
     def evaluate(self, ghost_ai, walls, pacman, other_ghosts):
         """Оцінює правило і повертає (direction, strength)"""
         return None, 0.0
 
+    def next_step(self, ghost_ai, target_pos, walls, avoid_positions=None):
+        """Напрямок першого кроку привида до цілі або None"""
+        ghost_pos = (ghost_ai.ghost.grid_x, ghost_ai.ghost.grid_y)
+        return find_next_step(ghost_ai.game, ghost_pos, target_pos, walls, avoid_positions, self.max_depth)
+
+    def path_distance(self, ghost_ai, target_pos, walls, avoid_positions=None):
+        """Довжина шляху привида до цілі або None"""
+        ghost_pos = (ghost_ai.ghost.grid_x, ghost_ai.ghost.grid_y)
+        navigation = getattr(ghost_ai.game, 'navigation', None)
+        if not avoid_positions and navigation is not None and navigation.covers(ghost_pos, target_pos):
+            distance = navigation.distance(ghost_pos, target_pos)
+            if distance is not None and self.max_depth is not None and distance > self.max_depth:
+                return None
+            return distance
+
+        junction_graph = getattr(ghost_ai.game, 'junction_graph', None)
+        if junction_graph is not None and ghost_pos in junction_graph.cell_neighbors:
+            distance = junction_graph.distance(ghost_pos, target_pos, avoid_positions)
+            if distance is not None and self.max_depth is not None and distance > self.max_depth:
+                return None
+            return distance
+
+        pathfinder = get_pathfinder(ghost_ai.game, walls)
+        return pathfinder.distance(ghost_pos, target_pos, avoid_positions, self.max_depth)
+
+    def find_path(self, ghost_ai, target_pos, walls, avoid_positions=None):
+        """Клітинки шляху привида до цілі без стартової (порожній список якщо шляху немає)"""
+        ghost_pos = (ghost_ai.ghost.grid_x, ghost_ai.ghost.grid_y)
+        pathfinder = get_pathfinder(ghost_ai.game, walls)
+        return pathfinder.path(ghost_pos, target_pos, avoid_positions, self.max_depth)
+
     def get_name(self):
         """Повертає назву правила"""
         return self.__class__.__name__
@@ -97,9 +123,7 @@ class SeekPacmanRule(GhostRule):
                 avoid_positions.add((ghost.grid_x, ghost.grid_y))
                 avoid_positions.add((ghost.target_x, ghost.target_y))
 
-        direction = bfs_next_step(ghost_pos, pacman_pos, walls,
-                                  ghost_ai.game.map_width, ghost_ai.game.map_height,
-                                  avoid_positions)
+        direction = self.next_step(ghost_ai, pacman_pos, walls, avoid_positions)
 
         if direction:
             strength = min(1.0, self.view_distance / (distance + 0.1))
@@ -130,9 +154,7 @@ class PredictPacmanRule(GhostRule):
         ghost_pos = (ghost_ai.ghost.grid_x, ghost_ai.ghost.grid_y)
         avoid_positions = {(g.grid_x, g.grid_y) for g in other_ghosts if g != ghost_ai.ghost}
 
-        direction = bfs_next_step(ghost_pos, pred_pos, walls,
-                                  ghost_ai.game.map_width, ghost_ai.game.map_height,
-                                  avoid_positions)
+        direction = self.next_step(ghost_ai, pred_pos, walls, avoid_positions)
 
         if direction:
             distance = math.sqrt((ghost_pos[0] - pred_pos[0]) ** 2 +
@@ -174,9 +196,7 @@ class FlankPacmanRule(GhostRule):
                         target_pos[1] % ghost_ai.game.map_height)
 
             if norm_pos not in walls:
-                direction = bfs_next_step(ghost_pos, norm_pos, walls,
-                                          ghost_ai.game.map_width, ghost_ai.game.map_height,
-                                          avoid_positions)
+                direction = self.next_step(ghost_ai, norm_pos, walls, avoid_positions)
                 if direction:
                     distance = math.sqrt((ghost_pos[0] - norm_pos[0]) ** 2 +
                                          (ghost_pos[1] - norm_pos[1]) ** 2)
@@ -224,10 +244,6 @@ class AvoidOtherGhostsRule(GhostRule):
 
                 valid_dirs.append((direction, total_distance))
 
-        if close_ghosts and valid_dirs:
-            color_name = ghost_ai.ghost.get_color_name()
-            logger.info(f"{color_name} ghost avoiding {len(close_ghosts)} nearby ghosts")
-
         if valid_dirs:
             # Обираємо напрямок, що максимізує відстань
             best_direction = max(valid_dirs, key=lambda x: x[1])[0]
@@ -261,9 +277,7 @@ class PatrolRule(GhostRule):
 
         avoid_positions = {(g.grid_x, g.grid_y) for g in other_ghosts if g != ghost_ai.ghost}
 
-        direction = bfs_next_step(ghost_pos, target_pos, walls,
-                                  ghost_ai.game.map_width, ghost_ai.game.map_height,
-                                  avoid_positions)
+        direction = self.next_step(ghost_ai, target_pos, walls, avoid_positions)
 
         return (direction, self.priority) if direction else (None, 0.0)
 
@@ -307,9 +321,7 @@ class BlockEscapeRoute(GhostRule):
         ghost_pos = (ghost_ai.ghost.grid_x, ghost_ai.ghost.grid_y)
         avoid_positions = {(g.grid_x, g.grid_y) for g in other_ghosts if g != ghost_ai.ghost}
 
-        direction = bfs_next_step(ghost_pos, target_exit, walls,
-                                  ghost_ai.game.map_width, ghost_ai.game.map_height,
-                                  avoid_positions)
+        direction = self.next_step(ghost_ai, target_exit, walls, avoid_positions)
 
         if direction:
             distance = math.sqrt((ghost_pos[0] - target_exit[0]) ** 2 +
@@ -376,29 +388,33 @@ class RuleBasedGhostAI:
         self.game = game
         self.rules = rules or []
 
-    def log_decision(self, direction, strengths):
-        """Логує рішення привида"""
-        color_name = self.ghost.get_color_name()
-        active_rules = []
+    def log_decision(self, direction, votes):
+        """
+        Записує рішення привида в журнал гри (без форматування)
 
-        for rule_name, strength in strengths.items():
-            if strength > 0.1:  # Логуємо тільки значимі правила
-                active_rules.append(f"{rule_name}({strength:.1f})")
+        Args:
+            direction: обраний напрямок
+            votes: список (назва правила, напрямок, сила) правил, що голосували
+        """
+        trace = get_decision_trace(self.game)
+        if trace is None:
+            return
 
-        if active_rules:
-            logger.info(f"{color_name} ghost at ({self.ghost.grid_x}, {self.ghost.grid_y}) "
-                        f"chose direction {direction} - Active rules: {', '.join(active_rules)}")
+        color = self.ghost.color
+        for rule_name, rule_direction, strength in votes:
+            if strength > 0.1:  # Записуємо тільки значимі правила
+                trace.record(color, rule_name, rule_direction, strength)
+        trace.record(color, "chosen", direction, sum(strength for _, d, strength in votes if d == direction))
 
     def get_next_direction(self, walls, pacman, other_ghosts):
         direction_votes = {}
-        rule_strengths = {}
+        rule_votes = []
 
         for rule in self.rules:
             if rule.enabled:
                 direction, strength = rule.evaluate(self, walls, pacman, other_ghosts)
                 if direction and strength > 0:
-                    rule_name = rule.__class__.__name__
-                    rule_strengths[rule_name] = strength
+                    rule_votes.append((rule.__class__.__name__, direction, strength))
 
                     if direction not in direction_votes:
                         direction_votes[direction] = 0
@@ -406,13 +422,13 @@ class RuleBasedGhostAI:
 
         if direction_votes:
             chosen_direction = max(direction_votes.items(), key=lambda x: x[1])[0]
-            self.log_decision(chosen_direction, rule_strengths)
+            self.log_decision(chosen_direction, rule_votes)
             return chosen_direction
 
         # Fallback до випадкового руху
         valid_dirs = self.get_valid_directions_no_collision(walls, other_ghosts)
         chosen_direction = random.choice(valid_dirs) if valid_dirs else (0, 0)
-        self.log_decision(chosen_direction, {"WanderRule": 0.5})
+        self.log_decision(chosen_direction, [("WanderRule", chosen_direction, 0.5)])
         return chosen_direction
 
     def get_valid_directions_no_collision(self, walls, other_ghosts):
@@ -0,0 +1,247 @@
+# junction_graph.py - Стиснений граф перехресть і коридорів карти
+import heapq
+from functools import lru_cache
+
+from src.constants import *
+
+
+class JunctionGraph:
+    """
+    Граф карти, де вершини - перехрестя та тупики, а ребра - коридори
+
+    Клітинка з двома прохідними сусідами лежить усередині коридору, тому
+    пошук розглядає лише вершини (їх у лабіринті в рази менше, ніж
+    клітинок), а коридор проходить одним ребром вагою в його довжину.
+    Для кожної клітинки коридору відомо ребро та зміщення від його
+    початку. Тунелі (перехід через край карти) враховуються.
+    """
+
+    def __init__(self, walls, map_width, map_height):
+        self.map_width = map_width
+        self.map_height = map_height
+
+        cells = [(x, y) for y in range(map_height) for x in range(map_width) if (x, y) not in walls]
+        walkable = set(cells)
+        self.cell_neighbors = {}
+        for x, y in cells:
+            self.cell_neighbors[(x, y)] = [
+                ((x + dx) % map_width, (y + dy) % map_height) for dx, dy in DIRECTIONS
+                if ((x + dx) % map_width, (y + dy) % map_height) in walkable
+            ]
+
+        # Вершини: перехрестя (3+ сусідів), тупики (1) та ізольовані клітинки
+        self.nodes = [pos for pos in cells if len(self.cell_neighbors[pos]) != 2]
+        self.node_index = {pos: i for i, pos in enumerate(self.nodes)}
+
+        # Ребра: (початок, кінець, клітинки коридору від початку до кінця)
+        self.edge_from = []
+        self.edge_to = []
+        self.edge_cells = []
+        self.cell_edge = {}  # Клітинка коридору -> (ребро, зміщення від початку з 1)
+        self.adjacency = [[] for _ in self.nodes]  # Вершина -> [(ребро, сусідня вершина, довжина, напрямок)]
+
+        covered = set()
+        for node in list(self.nodes):
+            self._trace_corridors(node, covered)
+
+        # Кільця без перехресть - одна з клітинок стає вершиною
+        for pos in cells:
+            if pos not in self.node_index and pos not in self.cell_edge:
+                self.node_index[pos] = len(self.nodes)
+                self.nodes.append(pos)
+                self.adjacency.append([])
+                self._trace_corridors(pos, covered)
+
+    @classmethod
+    def for_map(cls, walls, map_width, map_height):
+        """Повертає граф для карти (однакові карти використовують спільний граф)"""
+        return _cached_graph(frozenset(walls), map_width, map_height)
+
+    def _trace_corridors(self, node, covered):
+        """Пройти всі коридори, що виходять з вершини"""
+        for first in self.cell_neighbors[node]:
+            if (node, first) in covered:
+                continue
+
+            corridor = []
+            previous, current = node, first
+            while current not in self.node_index:
+                corridor.append(current)
+                previous, current = current, next(pos for pos in self.cell_neighbors[current] if pos != previous)
+            covered.add((node, first))
+            covered.add((current, previous))
+            self._add_edge(node, current, corridor)
+
+    def _add_edge(self, start, end, corridor):
+        edge = len(self.edge_cells)
+        self.edge_from.append(start)
+        self.edge_to.append(end)
+        self.edge_cells.append(corridor)
+        for offset, pos in enumerate(corridor, 1):
+            self.cell_edge[pos] = (edge, offset)
+
+        # Петлі не скорочують жодного шляху
+        if start == end:
+            return
+
+        length = len(corridor) + 1
+        first_out = corridor[0] if corridor else end
+        last_out = corridor[-1] if corridor else start
+        self.adjacency[self.node_index[start]].append((edge, self.node_index[end], length,
+                                                       self.direction(start, first_out)))
+        self.adjacency[self.node_index[end]].append((edge, self.node_index[start], length,
+                                                     self.direction(end, last_out)))
+
+    def direction(self, from_pos, to_pos):
+        """Напрямок між сусідніми клітинками (з урахуванням тунелів)"""
+        for direction in DIRECTIONS:
+            if ((from_pos[0] + direction[0]) % self.map_width,
+                    (from_pos[1] + direction[1]) % self.map_height) == to_pos:
+                return direction
+        return None
+
+    def is_junction(self, pos):
+        """Чи є клітинка вершиною графа (перехрестя або тупик)"""
+        return pos in self.node_index
+
+    def same_corridor(self, pos_a, pos_b):
+        """Чи лежать обидві клітинки всередині одного коридору"""
+        edge_a = self.cell_edge.get(pos_a)
+        edge_b = self.cell_edge.get(pos_b)
+        return edge_a is not None and edge_b is not None and edge_a[0] == edge_b[0]
+
+    def corridor_direction(self, pos, direction):
+        """
+        Напрямок продовження руху коридором без розвороту
+
+        Returns:
+            напрямок або None, якщо клітинка є вершиною (потрібне рішення)
+        """
+        if pos not in self.cell_edge or direction == (0, 0):
+            return None
+
+        came_from = ((pos[0] - direction[0]) % self.map_width, (pos[1] - direction[1]) % self.map_height)
+        for neighbor in self.cell_neighbors[pos]:
+            if neighbor != came_from:
+                return self.direction(pos, neighbor)
+        return None
+
+    def _segment(self, edge, start_offset, end_offset):
+        """Клітинки ребра між зміщеннями (включно з кінцями; 0 і довжина - вершини)"""
+        corridor = self.edge_cells[edge]
+        points = [self.edge_from[edge]] + corridor + [self.edge_to[edge]]
+        step = 1 if end_offset >= start_offset else -1
+        return points[start_offset:end_offset + step if end_offset + step >= 0 else None:step]
+
+    def _exits(self, pos, blocked):
+        """
+        Шляхи з клітинки до найближчих вершин
+
+        Returns:
+            список (вершина, відстань, перший напрямок, клітинки шляху)
+        """
+        if pos in self.node_index:
+            return [(self.node_index[pos], 0, None, [])]
+
+        edge, offset = self.cell_edge[pos]
+        length = len(self.edge_cells[edge]) + 1
+        exits = []
+        for end_offset, node in ((0, self.edge_from[edge]), (length, self.edge_to[edge])):
+            segment = self._segment(edge, offset, end_offset)[1:]
+            if not segment or blocked.intersection(segment):
+                continue
+            exits.append((self.node_index[node], len(segment), self.direction(pos, segment[0]), segment))
+        return exits
+
+    def search(self, start_pos, target_pos, blocked=None):
+        """
+        Найкоротший шлях по графу (Дейкстра по вершинах)
+
+        Args:
+            start_pos: стартова клітинка (x, y)
+            target_pos: цільова клітинка (x, y)
+            blocked: клітинки, через які не можна проходити
+
+        Returns:
+            (відстань, перший напрямок) або (None, None) якщо шляху немає
+        """
+        if start_pos not in self.cell_neighbors or target_pos not in self.cell_neighbors:
+            return None, None
+        if start_pos == target_pos:
+            return 0, None
+
+        blocked = set(blocked or ())
+        blocked.discard(start_pos)
+        if target_pos in blocked:
+            return None, None
+
+        best_distance, best_direction = None, None
+
+        # Ціль у тому ж коридорі - прямий шлях без вершин
+        if self.same_corridor(start_pos, target_pos):
+            edge, offset = self.cell_edge[start_pos]
+            segment = self._segment(edge, offset, self.cell_edge[target_pos][1])[1:]
+            if not blocked.intersection(segment):
+                best_distance, best_direction = len(segment), self.direction(start_pos, segment[0])
+
+        # Вершини, через які можна увійти до цілі: вершина -> відстань від неї до цілі
+        target_entries = {}
+        for node, distance, _, segment in self._exits(target_pos, blocked):
+            if node not in target_entries or distance < target_entries[node][0]:
+                target_entries[node] = (distance, segment)
+        if not target_entries:
+            return best_distance, best_direction
+
+        blocked_edges = {self.cell_edge[pos][0] for pos in blocked if pos in self.cell_edge}
+        blocked_nodes = {self.node_index[pos] for pos in blocked if pos in self.node_index}
+
+        distances = {}
+        heap = []
+        for node, distance, direction, _ in self._exits(start_pos, blocked):
+            if node in blocked_nodes:
+                continue
+            if node not in distances or distance < distances[node][0]:
+                distances[node] = (distance, direction)
+                heapq.heappush(heap, (distance, node))
+
+        while heap:
+            distance, node = heapq.heappop(heap)
+            if distance > distances[node][0]:
+                continue
+            if best_distance is not None and distance >= best_distance:
+                break
+
+            first_direction = distances[node][1]
+            if node in target_entries:
+                entry_distance, segment = target_entries[node]
+                total = distance + entry_distance
+                if best_distance is None or total < best_distance:
+                    best_distance = total
+                    best_direction = first_direction
+                    if best_direction is None:
+                        # Старт у вершині - перший крок веде в коридор цілі
+                        first = segment[-2] if len(segment) >= 2 else target_pos
+                        best_direction = self.direction(start_pos, first)
+
+            for edge, neighbor, length, direction in self.adjacency[node]:
+                if edge in blocked_edges or neighbor in blocked_nodes:
+                    continue
+                new_distance = distance + length
+                if neighbor not in distances or new_distance < distances[neighbor][0]:
+                    distances[neighbor] = (new_distance, first_direction or direction)
+                    heapq.heappush(heap, (new_distance, neighbor))
+
+        return best_distance, best_direction
+
+    def next_step(self, start_pos, target_pos, blocked=None):
+        """Напрямок першого кроку до цілі або None"""
+        return self.search(start_pos, target_pos, blocked)[1]
+
+    def distance(self, start_pos, target_pos, blocked=None):
+        """Довжина найкоротшого шляху або None"""
+        return self.search(start_pos, target_pos, blocked)[0]
+
+
+@lru_cache(maxsize=8)
+def _cached_graph(walls, map_width, map_height):
+    return JunctionGraph(walls, map_width, map_height)
@@ -1,6 +1,7 @@
 #map_loader.py
 import os
 from src.constants import *
+from src.junction_graph import JunctionGraph
 
 
 class MapLoader:
@@ -76,11 +77,17 @@ class MapLoader:
         if len(ghost_starts) == 0:
             raise ValueError(f"В карті {filename} не знайдено стартових позицій привидів (G)!")
 
+        # Стиснений граф перехресть і коридорів для навігації привидів
+        map_width = max(x for x, y in walls) + 1
+        map_height = max(y for x, y in walls) + 1
+        junction_graph = JunctionGraph.for_map(walls, map_width, map_height)
+
         return {
             'walls': walls,
             'dots': dots,
             'pacman_start': pacman_start,
-            'ghost_starts': ghost_starts
+            'ghost_starts': ghost_starts,
+            'junction_graph': junction_graph
         }
 
     def get_available_maps(self):
@@ -0,0 +1,151 @@
+# navigation.py - Попередньо обчислена таблиця відстаней і наступних кроків для карти
+from array import array
+from collections import deque
+from functools import lru_cache
+
+from src.constants import *
+
+# Позначки відсутності шляху
+UNREACHABLE = 0xFFFF
+NO_STEP = 0xFF
+
+
+class NavigationTable:
+    """
+    Найкоротші відстані та перші кроки між усіма прохідними клітинками
+
+    Стіни не змінюються під час гри, тому таблиця будується один раз на
+    карту (BFS з кожної клітинки з урахуванням тунелів) і далі відповідає
+    на запити за O(1). Прохідні клітинки пронумеровані, відстані
+    зберігаються в array('H'), а напрямки першого кроку - в bytearray
+    (індекс у DIRECTIONS) розміром N*N.
+    """
+
+    def __init__(self, walls, map_width, map_height):
+        self.map_width = map_width
+        self.map_height = map_height
+
+        # Нумерація прохідних клітинок
+        self.cells = [(x, y) for y in range(map_height) for x in range(map_width)
+                      if (x, y) not in walls]
+        self.index = {pos: i for i, pos in enumerate(self.cells)}
+
+        # Сусіди кожної клітинки: (індекс напрямку, індекс сусіда)
+        self.neighbors = []
+        for x, y in self.cells:
+            cell_neighbors = []
+            for d, direction in enumerate(DIRECTIONS):
+                next_pos = ((x + direction[0]) % map_width, (y + direction[1]) % map_height)
+                if next_pos in self.index:
+                    cell_neighbors.append((d, self.index[next_pos]))
+            self.neighbors.append(tuple(cell_neighbors))
+
+        size = len(self.cells)
+        self.distances = array('H', [UNREACHABLE]) * (size * size)
+        self.next_hops = bytearray([NO_STEP]) * (size * size)
+
+        for source in range(size):
+            self._fill_from(source)
+
+    def _fill_from(self, source):
+        """BFS з однієї клітинки; перший крок успадковується від батька"""
+        size = len(self.cells)
+        row = source * size
+        distances = self.distances
+        next_hops = self.next_hops
+        neighbors = self.neighbors
+
+        distances[row + source] = 0
+        queue = deque()
+        for d, cell in neighbors[source]:
+            if distances[row + cell] == UNREACHABLE:
+                distances[row + cell] = 1
+                next_hops[row + cell] = d
+                queue.append(cell)
+
+        while queue:
+            cell = queue.popleft()
+            distance = distances[row + cell] + 1
+            first_step = next_hops[row + cell]
+            for _, neighbor in neighbors[cell]:
+                if distances[row + neighbor] == UNREACHABLE:
+                    distances[row + neighbor] = distance
+                    next_hops[row + neighbor] = first_step
+                    queue.append(neighbor)
+
+    @classmethod
+    def for_map(cls, walls, map_width, map_height):
+        """Повертає таблицю для карти (однакові карти використовують спільну таблицю)"""
+        return _cached_table(frozenset(walls), map_width, map_height)
+
+    def covers(self, *positions):
+        """Чи всі позиції є прохідними клітинками карти"""
+        return all(pos in self.index for pos in positions)
+
+    def distance(self, start_pos, target_pos):
+        """Довжина найкоротшого шляху або None якщо шляху немає"""
+        start = self.index.get(start_pos)
+        target = self.index.get(target_pos)
+        if start is None or target is None:
+            return None
+
+        distance = self.distances[start * len(self.cells) + target]
+        return None if distance == UNREACHABLE else distance
+
+    def next_step(self, start_pos, target_pos):
+        """Напрямок першого кроку найкоротшого шляху або None"""
+        start = self.index.get(start_pos)
+        target = self.index.get(target_pos)
+        if start is None or target is None or start == target:
+            return None
+
+        step = self.next_hops[start * len(self.cells) + target]
+        return None if step == NO_STEP else DIRECTIONS[step]
+
+    def path(self, start_pos, target_pos):
+        """Клітинки найкоротшого шляху без стартової (порожній список якщо шляху немає)"""
+        path = []
+        pos = start_pos
+        while pos != target_pos:
+            direction = self.next_step(pos, target_pos)
+            if direction is None:
+                return []
+            pos = ((pos[0] + direction[0]) % self.map_width, (pos[1] + direction[1]) % self.map_height)
+            path.append(pos)
+        return path
+
+    def next_step_avoiding(self, start_pos, target_pos, avoid_positions):
+        """
+        Перший крок, якщо заблоковані клітинки не заважають найкоротшому шляху
+
+        Клітинка може лежати на якомусь найкоротшому шляху лише коли
+        d(start, c) + d(c, target) == d(start, target). Якщо жодна
+        заблокована клітинка цьому не відповідає, відповідь таблиці
+        залишається правильною; інакше перевіряється сам шлях з таблиці.
+
+        Повертає (знайдено, напрямок): знайдено=False означає, що таблиця
+        не може відповісти і потрібен пошук з урахуванням блокувань.
+        """
+        total = self.distance(start_pos, target_pos)
+        if total is None:
+            return True, None
+
+        on_shortest_path = False
+        for pos in avoid_positions:
+            if pos == start_pos:
+                continue
+            to_pos = self.distance(start_pos, pos)
+            from_pos = self.distance(pos, target_pos)
+            if to_pos is not None and from_pos is not None and to_pos + from_pos == total:
+                on_shortest_path = True
+                break
+
+        if on_shortest_path and not avoid_positions.isdisjoint(self.path(start_pos, target_pos)):
+            return False, None
+
+        return True, self.next_step(start_pos, target_pos)
+
+
+@lru_cache(maxsize=8)
+def _cached_table(walls, map_width, map_height):
+    return NavigationTable(walls, map_width, map_height)
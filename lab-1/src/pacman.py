@@ -1,6 +1,9 @@
 #pacman.py
-import pygame
-import math
+try:
+    import pygame
+    from src.sprites import pacman_frame
+except ImportError:  # Безголовий режим (src/engine.py) працює без pygame
+    pygame = None
 from src.constants import *
 
 
@@ -95,51 +98,7 @@ class Pacman:
                     self.mouth_angle = 0
                     self.mouth_opening = True
 
-    # draw метод залишається незмінним
-
     def draw(self, screen):
-        # [Малювання залишається незмінним]
-        center = (int(self.x), int(self.y))
-
-        if self.direction == (0, 0):
-            pygame.draw.circle(screen, YELLOW, center, self.radius)
-        else:
-            angle_offset = 0
-            if self.direction == RIGHT:
-                angle_offset = 0
-            elif self.direction == UP:
-                angle_offset = 90
-            elif self.direction == LEFT:
-                angle_offset = 180
-            elif self.direction == DOWN:
-                angle_offset = 270
-
-            surf = pygame.Surface((self.radius * 2 + 2, self.radius * 2 + 2), pygame.SRCALPHA)
-            surf_center = (self.radius + 1, self.radius + 1)
-            pygame.draw.circle(surf, YELLOW, surf_center, self.radius)
-
-            if self.mouth_angle > 0:
-                points = [surf_center]
-                angle1 = math.radians(angle_offset + self.mouth_angle)
-                angle2 = math.radians(angle_offset - self.mouth_angle)
-                x1 = surf_center[0] + self.radius * math.cos(angle1)
-                y1 = surf_center[1] - self.radius * math.sin(angle1)
-                x2 = surf_center[0] + self.radius * math.cos(angle2)
-                y2 = surf_center[1] - self.radius * math.sin(angle2)
-                points.extend([(x1, y1), (x2, y2)])
-                pygame.draw.polygon(surf, (0, 0, 0, 0), points)
-
-            screen.blit(surf, (center[0] - self.radius - 1, center[1] - self.radius - 1))
-
-        if self.direction == RIGHT:
-            eye_pos = (center[0] - 3, center[1] - 5)
-        elif self.direction == LEFT:
-            eye_pos = (center[0] + 3, center[1] - 5)
-        elif self.direction == UP:
-            eye_pos = (center[0] + 5, center[1] + 3)
-        elif self.direction == DOWN:
-            eye_pos = (center[0] - 5, center[1] - 3)
-        else:
-            eye_pos = (center[0], center[1] - 5)
-
-        pygame.draw.circle(screen, BLACK, eye_pos, 2)
\ No newline at end of file
+        # Готовий кадр з кешу спрайтів - один blit на кадр
+        surface, offset = pacman_frame(self.direction, self.mouth_angle)
+        screen.blit(surface, (int(self.x) + offset[0], int(self.y) + offset[1]))
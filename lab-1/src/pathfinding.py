@@ -0,0 +1,148 @@
+# pathfinding.py - Пошук шляхів по індексах клітинок з динамічними блокуваннями
+from array import array
+from functools import lru_cache
+
+from src.constants import *
+from src.navigation import NavigationTable
+
+
+class PathFinder:
+    """
+    BFS по пронумерованих клітинках карти
+
+    Граф клітинок береться з NavigationTable. Масиви відвідування,
+    батьків, глибини та черги виділяються один раз; замість очищення між
+    пошуками використовується лічильник пошуків (мітка відвідування
+    дійсна лише якщо дорівнює номеру поточного пошуку). Шлях
+    відновлюється за батьківськими вказівниками, тому черга не зберігає
+    копій шляхів.
+    """
+
+    MAX_STAMP = 0xFFFFFFFF
+
+    def __init__(self, navigation):
+        self.navigation = navigation
+        self.index = navigation.index
+        self.cells = navigation.cells
+        self.neighbors = navigation.neighbors
+
+        size = len(self.cells)
+        self._visited = array('I', [0]) * size
+        self._blocked = array('I', [0]) * size
+        self._parent = array('i', [-1]) * size
+        self._step = bytearray(size)  # Індекс напрямку, яким прийшли в клітинку
+        self._depth = array('H', [0]) * size
+        self._queue = array('i', [0]) * size
+        self._stamp = 0
+
+    @classmethod
+    def for_map(cls, walls, map_width, map_height):
+        """Повертає пошук для карти (однакові карти використовують спільний об'єкт)"""
+        return _cached_finder(frozenset(walls), map_width, map_height)
+
+    def _next_stamp(self):
+        self._stamp += 1
+        if self._stamp == self.MAX_STAMP:
+            # Переповнення лічильника - одноразове очищення
+            for i in range(len(self.cells)):
+                self._visited[i] = 0
+                self._blocked[i] = 0
+            self._stamp = 1
+        return self._stamp
+
+    def search(self, start_pos, target_pos, blocked=None, max_depth=None):
+        """
+        Пошук в ширину від start_pos до target_pos
+
+        Args:
+            start_pos: стартова клітинка (x, y)
+            target_pos: цільова клітинка (x, y)
+            blocked: позиції, через які не можна проходити (наприклад, інші привиди)
+            max_depth: максимальна довжина шляху (None - без обмеження)
+
+        Returns:
+            індекс цільової клітинки або -1 якщо шлях не знайдено
+        """
+        start = self.index.get(start_pos)
+        target = self.index.get(target_pos)
+        if start is None or target is None:
+            return -1
+
+        stamp = self._next_stamp()
+        visited = self._visited
+        blocked_cells = self._blocked
+        parent = self._parent
+        step = self._step
+        depth = self._depth
+        queue = self._queue
+        neighbors = self.neighbors
+
+        if blocked:
+            for pos in blocked:
+                cell = self.index.get(pos)
+                if cell is not None:
+                    blocked_cells[cell] = stamp
+
+        visited[start] = stamp
+        parent[start] = -1
+        depth[start] = 0
+        if start == target:
+            return target
+
+        limit = max_depth if max_depth is not None else len(self.cells)
+        queue[0] = start
+        head, tail = 0, 1
+
+        while head < tail:
+            cell = queue[head]
+            head += 1
+            next_depth = depth[cell] + 1
+            if next_depth > limit:
+                continue
+
+            for d, neighbor in neighbors[cell]:
+                if visited[neighbor] == stamp or blocked_cells[neighbor] == stamp:
+                    continue
+
+                visited[neighbor] = stamp
+                parent[neighbor] = cell
+                step[neighbor] = d
+                depth[neighbor] = next_depth
+
+                if neighbor == target:
+                    return target
+
+                queue[tail] = neighbor
+                tail += 1
+
+        return -1
+
+    def next_step(self, start_pos, target_pos, blocked=None, max_depth=None):
+        """Напрямок першого кроку до цілі або None"""
+        cell = self.search(start_pos, target_pos, blocked, max_depth)
+        if cell < 0 or self._parent[cell] < 0:
+            return None
+
+        while self._parent[self._parent[cell]] >= 0:
+            cell = self._parent[cell]
+        return DIRECTIONS[self._step[cell]]
+
+    def distance(self, start_pos, target_pos, blocked=None, max_depth=None):
+        """Довжина шляху до цілі або None"""
+        cell = self.search(start_pos, target_pos, blocked, max_depth)
+        return None if cell < 0 else self._depth[cell]
+
+    def path(self, start_pos, target_pos, blocked=None, max_depth=None):
+        """Клітинки шляху без стартової (порожній список якщо шляху немає)"""
+        cell = self.search(start_pos, target_pos, blocked, max_depth)
+        path = []
+        while cell >= 0 and self._parent[cell] >= 0:
+            path.append(self.cells[cell])
+            cell = self._parent[cell]
+        path.reverse()
+        return path
+
+
+@lru_cache(maxsize=8)
+def _cached_finder(walls, map_width, map_height):
+    return PathFinder(NavigationTable.for_map(walls, map_width, map_height))
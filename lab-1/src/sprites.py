@@ -0,0 +1,123 @@
+# sprites.py - Попередньо відмальовані кадри пакмена та привидів
+import math
+from functools import lru_cache
+
+import pygame
+from src.constants import *
+
+MOUTH_ANGLE_STEP = 5  # Крок кута рота між кадрами (градуси)
+MOUTH_ANGLE_MAX = 45
+GHOST_WAVE_FRAMES = 12  # Кадрів на період хвилі низу привида
+GHOST_WAVE_SPEED = 5  # Кутова швидкість хвилі (як у Ghost.animation_timer * 5)
+
+PACMAN_ANGLES = {RIGHT: 0, UP: 90, LEFT: 180, DOWN: 270}
+
+
+def _frame_surface():
+    """Прозора поверхня для кадру; центр спрайта - у точці (CELL_SIZE, CELL_SIZE)"""
+    return pygame.Surface((CELL_SIZE * 2, CELL_SIZE * 2), pygame.SRCALPHA)
+
+
+def _trim(surface):
+    """
+    Обрізає кадр до непрозорої частини
+
+    Returns:
+        (поверхня, зміщення лівого верхнього кута від центру спрайта)
+    """
+    rect = surface.get_bounding_rect()
+    frame = surface.subsurface(rect).copy()
+    if pygame.display.get_surface() is not None:
+        frame = frame.convert_alpha()
+    return frame, (rect.x - CELL_SIZE, rect.y - CELL_SIZE)
+
+
+def _render_pacman(direction, mouth_angle):
+    """Малює пакмена так само, як раніше малював Pacman.draw"""
+    surface = _frame_surface()
+    center = (CELL_SIZE, CELL_SIZE)
+    radius = CELL_SIZE // 2 - 2
+    pygame.draw.circle(surface, YELLOW, center, radius)
+
+    if direction in PACMAN_ANGLES and mouth_angle > 0:
+        angle_offset = PACMAN_ANGLES[direction]
+        angle1 = math.radians(angle_offset + mouth_angle)
+        angle2 = math.radians(angle_offset - mouth_angle)
+        points = [center,
+                  (center[0] + radius * math.cos(angle1), center[1] - radius * math.sin(angle1)),
+                  (center[0] + radius * math.cos(angle2), center[1] - radius * math.sin(angle2))]
+        pygame.draw.polygon(surface, (0, 0, 0, 0), points)
+
+    if direction == RIGHT:
+        eye_pos = (center[0] - 3, center[1] - 5)
+    elif direction == LEFT:
+        eye_pos = (center[0] + 3, center[1] - 5)
+    elif direction == UP:
+        eye_pos = (center[0] + 5, center[1] + 3)
+    elif direction == DOWN:
+        eye_pos = (center[0] - 5, center[1] - 3)
+    else:
+        eye_pos = (center[0], center[1] - 5)
+    pygame.draw.circle(surface, BLACK, eye_pos, 2)
+
+    return _trim(surface)
+
+
+def _render_ghost(color, phase):
+    """Малює привида з фазою хвилі phase (радіани)"""
+    surface = _frame_surface()
+    center = (CELL_SIZE, CELL_SIZE)
+    size = CELL_SIZE - 4
+    half_size = size // 2
+
+    # Тіло та голова
+    pygame.draw.rect(surface, color, (center[0] - half_size, center[1] - half_size, size, size))
+    pygame.draw.circle(surface, color, (center[0], center[1] - half_size + half_size // 2), half_size)
+
+    # Хвилясті краї знизу
+    bottom_y = center[1] + half_size
+    wave_width = size // 4
+    for i in range(4):
+        x1 = center[0] - half_size + i * wave_width
+        x2 = x1 + wave_width
+        x_mid = (x1 + x2) // 2
+        wave_offset = int(3 * math.sin(phase + i))
+        pygame.draw.polygon(surface, color, [(x1, bottom_y), (x_mid, bottom_y - wave_width // 2 + wave_offset),
+                                             (x2, bottom_y)])
+
+    # Очі
+    eye_size = 3
+    eye_y = center[1] - half_size // 2
+    for eye in ((center[0] - half_size // 2, eye_y), (center[0] + half_size // 2, eye_y)):
+        pygame.draw.circle(surface, WHITE, eye, eye_size)
+        pygame.draw.circle(surface, BLACK, eye, eye_size // 2)
+
+    return _trim(surface)
+
+
+@lru_cache(maxsize=None)
+def pacman_frames():
+    """Кадри пакмена для кожного напрямку × кута рота: (напрямок, крок) -> (поверхня, зміщення)"""
+    frames = {}
+    for direction in [(0, 0)] + DIRECTIONS:
+        for step in range(MOUTH_ANGLE_MAX // MOUTH_ANGLE_STEP + 1):
+            frames[(direction, step)] = _render_pacman(direction, step * MOUTH_ANGLE_STEP)
+    return frames
+
+
+@lru_cache(maxsize=None)
+def ghost_frames(color):
+    """Кадри анімації привида заданого кольору: список (поверхня, зміщення)"""
+    return [_render_ghost(color, 2 * math.pi * frame / GHOST_WAVE_FRAMES) for frame in range(GHOST_WAVE_FRAMES)]
+
+
+def pacman_frame(direction, mouth_angle):
+    """Кадр пакмена для напрямку та кута рота (кут округлюється до MOUTH_ANGLE_STEP)"""
+    step = min(max(round(mouth_angle / MOUTH_ANGLE_STEP), 0), MOUTH_ANGLE_MAX // MOUTH_ANGLE_STEP)
+    return pacman_frames()[(direction, step)]
+
+
+def ghost_frame(color, animation_timer):
+    """Кадр привида для часу анімації"""
+    phase = animation_timer * GHOST_WAVE_SPEED / (2 * math.pi)
+    return ghost_frames(color)[int(phase * GHOST_WAVE_FRAMES) % GHOST_WAVE_FRAMES]
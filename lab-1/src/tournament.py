@@ -0,0 +1,161 @@
+# tournament.py - Пакетний запуск безголових ігор по рівнях, картах і зернах
+import argparse
+import csv
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.constants import *
+from src.controllers import CONTROLLERS, create_controller
+from src.difficulty import DifficultyManager
+from src.engine import GameEngine
+from src.map_loader import MapLoader
+
+
+def play_games(map_name, level_index, seed, games, controller_name, time_limit, dt):
+    """
+    Грає серію ігор однієї комбінації (виконується в окремому процесі)
+
+    Args:
+        map_name: файл карти
+        level_index: індекс рівня складності
+        seed: базове зерно серії
+        games: кількість ігор
+        controller_name: назва контролера пакмена
+        time_limit: обмеження ігрового часу однієї гри
+        dt: крок часу симуляції
+
+    Returns:
+        список словників GameResult
+    """
+    difficulty_manager = DifficultyManager()
+    difficulty_manager.set_level(level_index)
+    engine = GameEngine(map_name, difficulty_manager=difficulty_manager,
+                        controller=create_controller(controller_name),
+                        seed=seed, dt=dt, time_limit=time_limit)
+
+    results = []
+    for game in range(games):
+        engine.reset(seed * 10000 + game)
+        result = engine.run().as_dict()
+        result['level_index'] = level_index
+        results.append(result)
+    return results
+
+
+def summarize(results):
+    """
+    Зведена статистика по комбінаціях (рівень, карта)
+
+    Returns:
+        список словників, відсортований за рівнем і картою
+    """
+    groups = {}
+    for result in results:
+        groups.setdefault((result['level_index'], result['map_name']), []).append(result)
+
+    summary = []
+    for (level_index, map_name), group in sorted(groups.items()):
+        games = len(group)
+        ticks = sum(r['ticks'] for r in group)
+        summary.append({
+            'level': group[0]['level'],
+            'map': map_name,
+            'games': games,
+            'win_rate': sum(r['outcome'] == GAME_WON for r in group) / games,
+            'timeout_rate': sum(r['outcome'] == GAME_TIMEOUT for r in group) / games,
+            'avg_survival': sum(r['sim_time'] for r in group) / games,
+            'avg_dots_eaten': sum(r['dots_eaten'] for r in group) / games,
+            'dots_eaten_share': sum(r['dots_eaten'] / r['total_dots'] for r in group) / games,
+            'ai_ms_per_tick': 1000 * sum(r['ai_time'] for r in group) / ticks if ticks else 0.0,
+            'wall_time': sum(r['wall_time'] for r in group),
+        })
+    return summary
+
+
+def run_tournament(maps=None, levels=None, seeds=(1,), games=10, controller='autopilot',
+                   time_limit=SIMULATION_TIME_LIMIT, dt=SIMULATION_DT, workers=None):
+    """
+    Грає games ігор для кожного рівня × карти × зерна в пулі процесів
+
+    Args:
+        maps: список карт (None - усі карти в resources/maps)
+        levels: індекси рівнів складності (None - усі)
+        seeds: список зерен
+        games: ігор на кожну комбінацію та зерно
+        controller: назва контролера пакмена
+        time_limit: обмеження ігрового часу однієї гри
+        dt: крок часу симуляції
+        workers: кількість процесів (None - за кількістю ядер, 1 - без пулу)
+
+    Returns:
+        (результати всіх ігор, зведена статистика)
+    """
+    maps = maps or sorted(MapLoader().get_available_maps())
+    if levels is None:
+        levels = range(DifficultyManager().get_level_count())
+
+    tasks = [(map_name, level_index, seed, games, controller, time_limit, dt)
+             for level_index in levels for map_name in maps for seed in seeds]
+
+    results = []
+    if workers == 1:
+        for task in tasks:
+            results.extend(play_games(*task))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for task_results in executor.map(play_games, *zip(*tasks)):
+                results.extend(task_results)
+
+    return results, summarize(results)
+
+
+def print_summary(summary):
+    """Друкує зведену таблицю"""
+    header = f"{'Level':<13}{'Map':<24}{'Games':>6}{'Win %':>8}{'Survival':>10}{'Dots':>8}{'Dots %':>8}{'AI ms/tick':>12}"
+    print(header)
+    print('-' * len(header))
+    for row in summary:
+        print(f"{row['level']:<13}{row['map']:<24}{row['games']:>6}{row['win_rate'] * 100:>7.1f}%"
+              f"{row['avg_survival']:>9.1f}s{row['avg_dots_eaten']:>8.1f}{row['dots_eaten_share'] * 100:>7.1f}%"
+              f"{row['ai_ms_per_tick']:>12.3f}")
+
+
+def save_results(results, filename):
+    """Зберігає результати всіх ігор у CSV"""
+    if not results:
+        return
+    with open(filename, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(results[0].keys()))
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Турнір безголових ігор Pacman")
+    parser.add_argument('--games', type=int, default=10, help="ігор на комбінацію та зерно")
+    parser.add_argument('--seeds', type=int, nargs='+', default=[1], help="список зерен")
+    parser.add_argument('--maps', nargs='+', default=None, help="карти (за замовчуванням усі)")
+    parser.add_argument('--levels', type=int, nargs='+', default=None, help="номери рівнів з 1")
+    parser.add_argument('--controller', choices=list(CONTROLLERS), default='autopilot')
+    parser.add_argument('--time-limit', type=float, default=SIMULATION_TIME_LIMIT, help="ігрових секунд на гру")
+    parser.add_argument('--workers', type=int, default=None, help="кількість процесів")
+    parser.add_argument('--csv', default=None, help="зберегти результати ігор у CSV")
+    args = parser.parse_args()
+
+    levels = [level - 1 for level in args.levels] if args.levels else None
+
+    started = time.perf_counter()
+    results, summary = run_tournament(args.maps, levels, args.seeds, args.games, args.controller,
+                                      args.time_limit, workers=args.workers)
+    elapsed = time.perf_counter() - started
+
+    print_summary(summary)
+    print(f"\n{len(results)} games in {elapsed:.1f}s ({len(results) / elapsed * 60:.0f} games/min)")
+
+    if args.csv:
+        save_results(results, args.csv)
+        print(f"Results saved to {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
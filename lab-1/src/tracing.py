@@ -0,0 +1,108 @@
+# tracing.py - Журнал рішень привидів у кільцевому буфері
+import csv
+from collections import deque
+
+from src.constants import *
+
+# Назви кольорів привидів для форматування журналу
+GHOST_COLOR_NAMES = {
+    RED: "Red",
+    BLUE: "Blue",
+    PINK: "Pink",
+    ORANGE: "Orange",
+}
+
+
+class DecisionTrace:
+    """
+    Журнал рішень ШІ привидів
+
+    Кожен запис - кортеж (тік, привид, правило, напрямок, сила) без
+    жодного форматування; буфер обмежений capacity записами, старі
+    витісняються. Рівень level відсікає записи ще до створення кортежу:
+    TRACE_DECISIONS - лише голоси правил і вибір напрямку, TRACE_EVENTS -
+    також виявлення пакмена, мережа привидів та патрулювання. При
+    sample_every > 1 зберігається лише кожен sample_every-й запис. Рядки
+    формуються тільки під час dump() або для відладкової накладки.
+    """
+
+    def __init__(self, capacity=DECISION_TRACE_CAPACITY, level=TRACE_DECISIONS, sample_every=1):
+        """
+        Args:
+            capacity: максимальна кількість записів у буфері
+            level: рівень деталізації (TRACE_OFF, TRACE_DECISIONS, TRACE_EVENTS)
+            sample_every: зберігати кожен n-й запис
+        """
+        self.records = deque(maxlen=capacity)
+        self.level = level
+        self.sample_every = max(1, sample_every)
+        self.tick = 0  # Поточний тік гри (встановлює GameEngine)
+        self._counter = 0
+
+    def enabled(self, level=TRACE_DECISIONS):
+        """Чи записуються події заданого рівня"""
+        return level <= self.level
+
+    def record(self, ghost, rule, direction, strength, level=TRACE_DECISIONS):
+        """
+        Додає запис до журналу
+
+        Args:
+            ghost: колір привида (для подій мережі - позиція інформатора)
+            rule: назва правила або події
+            direction: напрямок (для подій - позиція пакмена або лічильник)
+            strength: сила правила (для подій - впевненість або частка)
+            level: рівень деталізації запису
+        """
+        if level > self.level:
+            return
+        self._counter += 1
+        if self._counter % self.sample_every:
+            return
+        self.records.append((self.tick, ghost, rule, direction, strength))
+
+    def clear(self):
+        """Очищує журнал"""
+        self.records.clear()
+        self._counter = 0
+
+    def __len__(self):
+        return len(self.records)
+
+    @staticmethod
+    def format_fields(record):
+        """Поля запису у вигляді рядків: (тік, привид, правило, напрямок, сила)"""
+        tick, ghost, rule, direction, strength = record
+        return str(tick), GHOST_COLOR_NAMES.get(ghost, str(ghost)), rule, str(direction), f"{strength:.2f}"
+
+    @classmethod
+    def format_record(cls, record):
+        """Рядок для одного запису"""
+        tick, ghost, rule, direction, strength = cls.format_fields(record)
+        return f"{tick:>6} {ghost:<8} {rule:<24} {direction:<9} {strength}"
+
+    def latest(self, count=None):
+        """Останні count записів (None - усі)"""
+        records = list(self.records)
+        return records if count is None else records[-count:]
+
+    def lines(self, count=None):
+        """Останні count записів у вигляді рядків (None - усі)"""
+        return [self.format_record(record) for record in self.latest(count)]
+
+    def dump(self, filename):
+        """Зберігає журнал у CSV і повертає кількість записів"""
+        with open(filename, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['tick', 'ghost', 'rule', 'direction', 'strength'])
+            for tick, ghost, rule, direction, strength in self.records:
+                writer.writerow([tick, GHOST_COLOR_NAMES.get(ghost, ghost), rule, direction, f"{strength:.3f}"])
+        return len(self.records)
+
+
+def get_decision_trace(game):
+    """Журнал рішень поточної гри або None, якщо журнал вимкнено"""
+    trace = getattr(game, 'decision_trace', None)
+    if trace is None or trace.level == TRACE_OFF:
+        return None
+    return trace
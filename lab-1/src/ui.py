@@ -11,35 +11,112 @@ class UI:
         self.small_font = pygame.font.Font(None, 20)
         self.tiny_font = pygame.font.Font(None, 16)
 
-    def draw_text_centered(self, text, font, color, y_offset=0):
-        """Малює текст по центру екрана"""
-        text_surface = font.render(text, True, color)
+        # Кеш відрендереного тексту: (рядок, шрифт, колір) -> поверхня
+        self._text_cache = {}
+        # Кеш розкладок (перенесені рядки з позиціями): назва -> список (поверхня, позиція)
+        self._layouts = {}
+        # Стан, від якого залежать розкладки: назва -> значення (рівень складності)
+        self._cache_state = {}
+        # Поверхня рахунку: (рядок, поверхня); оновлюється лише при зміні рядка
+        self._score_surface = (None, None)
+        # Напівпрозорі накладки екранів паузи, перемоги та поразки
+        self._overlays = {}
+
+    def render_text(self, text, font, color):
+        """Повертає поверхню з текстом (рендериться один раз для рядка, шрифту та кольору)"""
+        key = (text, font, color)
+        surface = self._text_cache.get(key)
+        if surface is None:
+            surface = font.render(text, True, color)
+            self._text_cache[key] = surface
+        return surface
+
+    def _invalidate_on(self, name, value, layouts):
+        """Видаляє розкладки layouts з кешу, якщо змінилось значення стану name"""
+        if self._cache_state.get(name) != value:
+            self._cache_state[name] = value
+            for layout in layouts:
+                self._layouts.pop(layout, None)
+
+    def _invalidate_level(self, difficulty_manager):
+        """Скидає розкладки, що залежать від рівня складності"""
+        level = (difficulty_manager.current_level, difficulty_manager.get_level_count())
+        self._invalidate_on('level', level, ('difficulty', 'pause'))
+
+    def _layout(self, name, build):
+        """Розкладка тексту з кешу; build будує список (поверхня, позиція)"""
+        layout = self._layouts.get(name)
+        if layout is None:
+            layout = build()
+            self._layouts[name] = layout
+        return layout
+
+    def _blit_layout(self, layout):
+        """Малює розкладку і повертає прямокутники"""
+        return [self.screen.blit(surface, position) for surface, position in layout]
+
+    def _overlay(self, color, alpha):
+        """Напівпрозора накладка на весь екран (створюється один раз)"""
+        overlay = self._overlays.get((color, alpha))
+        if overlay is None:
+            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            overlay.set_alpha(alpha)
+            overlay.fill(color)
+            self._overlays[(color, alpha)] = overlay
+        return overlay
+
+    def _centered(self, text, font, color, y_offset=0):
+        """Текст по центру екрана: (поверхня, прямокутник)"""
+        text_surface = self.render_text(text, font, color)
         text_rect = text_surface.get_rect()
         text_rect.centerx = SCREEN_WIDTH // 2
         text_rect.centery = SCREEN_HEIGHT // 2 + y_offset
+        return text_surface, text_rect
+
+    def draw_text_centered(self, text, font, color, y_offset=0):
+        """Малює текст по центру екрана"""
+        text_surface, text_rect = self._centered(text, font, color, y_offset)
         self.screen.blit(text_surface, text_rect)
         return text_rect
 
     def draw_score(self, remaining_dots, total_dots):
-        """Малює інформацію про залишок точок"""
+        """
+        Малює інформацію про залишок точок
+
+        Returns:
+            прямокутник, зайнятий текстом
+        """
         eaten_dots = total_dots - remaining_dots
         score_text = f"Eaten: {eaten_dots}/{total_dots}"
-        text_surface = self.font.render(score_text, True, WHITE)
-        self.screen.blit(text_surface, (10, 10))
+        # Рядок змінюється з кожною з'їденою точкою, тому не потрапляє до спільного кешу
+        cached_text, surface = self._score_surface
+        if cached_text != score_text:
+            surface = self.font.render(score_text, True, WHITE)
+            self._score_surface = (score_text, surface)
+        return self.screen.blit(surface, (10, 10))
 
     def draw_difficulty_info(self, difficulty_manager):
-        """Малює інформацію про поточний рівень складності та активні правила"""
+        """
+        Малює інформацію про поточний рівень складності та активні правила
+
+        Returns:
+            список прямокутників, зайнятих текстом
+        """
+        self._invalidate_level(difficulty_manager)
+        return self._blit_layout(self._layout('difficulty', lambda: self._difficulty_layout(difficulty_manager)))
+
+    def _difficulty_layout(self, difficulty_manager):
+        """Розкладка інформації про рівень складності: список (поверхня, позиція)"""
+        layout = []
         current_level = difficulty_manager.get_current_level()
 
         # Назва рівня
         level_text = f"Level: {current_level.name} ({difficulty_manager.current_level + 1}/{difficulty_manager.get_level_count()})"
-        text_surface = self.small_font.render(level_text, True, WHITE)
-        self.screen.blit(text_surface, (10, 45))
+        layout.append((self.render_text(level_text, self.small_font, WHITE), (10, 45)))
 
         # Опис рівня
         desc_text = current_level.description
-        text_surface = self.small_font.render(desc_text, True, CYAN)
-        self.screen.blit(text_surface, (10, 65))
+        layout.append((self.render_text(desc_text, self.small_font, CYAN), (10, 65)))
 
         # Активні правила
         rules_text = f"Active rules: {difficulty_manager.get_active_rules_description()}"
@@ -63,34 +140,39 @@ class UI:
 
         y_pos = 85
         for line in lines[:2]:  # Показуємо максимум 2 рядки
-            text_surface = self.tiny_font.render(line, True, YELLOW)
-            self.screen.blit(text_surface, (10, y_pos))
+            layout.append((self.render_text(line, self.tiny_font, YELLOW), (10, y_pos)))
             y_pos += 16
 
         # Підказка про керування
         controls_text = "+/- to change difficulty"
-        text_surface = self.small_font.render(controls_text, True, WHITE)
+        text_surface = self.render_text(controls_text, self.small_font, WHITE)
         text_rect = text_surface.get_rect()
         text_rect.topright = (SCREEN_WIDTH - 10, 10)
-        self.screen.blit(text_surface, text_rect)
+        layout.append((text_surface, text_rect))
+        return layout
 
     def draw_pause_screen(self, difficulty_manager=None):
         """Малює екран паузи з детальною інформацією про правила"""
         # Напівпрозора накладка
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(128)
-        overlay.fill(BLACK)
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self._overlay(BLACK, 128), (0, 0))
+
+        if difficulty_manager:
+            self._invalidate_level(difficulty_manager)
+        name = 'pause' if difficulty_manager else 'pause_short'
+        self._blit_layout(self._layout(name, lambda: self._pause_layout(difficulty_manager)))
+
+    def _pause_layout(self, difficulty_manager):
+        """Розкладка екрана паузи: список (поверхня, прямокутник)"""
+        layout = []
 
         # Текст паузи
-        self.draw_text_centered("PAUSED", self.big_font, WHITE, -150)
-        self.draw_text_centered("Press ESC to continue", self.font, WHITE, -110)
-        self.draw_text_centered("Press R to restart", self.font, WHITE, -80)
+        layout.append(self._centered("PAUSED", self.big_font, WHITE, -150))
+        layout.append(self._centered("Press ESC to continue", self.font, WHITE, -110))
+        layout.append(self._centered("Press R to restart", self.font, WHITE, -80))
 
         if difficulty_manager:
             # Інформація про рівні складності
-            self.draw_text_centered("DIFFICULTY LEVELS:", self.font, YELLOW, -40)
-
+            layout.append(self._centered("DIFFICULTY LEVELS:", self.font, YELLOW, -40))
             y_offset = -10
             for i, level in enumerate(difficulty_manager.levels):
                 color = WHITE
@@ -100,13 +182,13 @@ class UI:
                     prefix = "> "
 
                 level_text = f"{prefix}{i + 1}. {level.name}"
-                self.draw_text_centered(level_text, self.small_font, color, y_offset)
+                layout.append(self._centered(level_text, self.small_font, color, y_offset))
                 y_offset += 20
 
                 # Показуємо опис поточного рівня
                 if i == difficulty_manager.current_level:
                     desc_text = f"   {level.description}"
-                    self.draw_text_centered(desc_text, self.tiny_font, CYAN, y_offset)
+                    layout.append(self._centered(desc_text, self.tiny_font, CYAN, y_offset))
                     y_offset += 16
 
                     # Показуємо активні правила для поточного рівня
@@ -116,7 +198,7 @@ class UI:
                     if self.tiny_font.size(rules_text)[0] > max_width:
                         words = rules_text.split(': ', 1)
                         if len(words) > 1:
-                            self.draw_text_centered(f"   Rules:", self.tiny_font, YELLOW, y_offset)
+                            layout.append(self._centered(f"   Rules:", self.tiny_font, YELLOW, y_offset))
                             y_offset += 16
                             rule_words = words[1].split(', ')
                             current_line = "   "
@@ -126,40 +208,57 @@ class UI:
                                     current_line = test_line
                                 else:
                                     if len(current_line) > 3:
-                                        self.draw_text_centered(current_line, self.tiny_font, YELLOW, y_offset)
+                                        layout.append(self._centered(current_line, self.tiny_font, YELLOW, y_offset))
                                         y_offset += 16
                                     current_line = "   " + rule
                             if len(current_line) > 3:
-                                self.draw_text_centered(current_line, self.tiny_font, YELLOW, y_offset)
+                                layout.append(self._centered(current_line, self.tiny_font, YELLOW, y_offset))
                                 y_offset += 16
                     else:
-                        self.draw_text_centered(rules_text, self.tiny_font, YELLOW, y_offset)
+                        layout.append(self._centered(rules_text, self.tiny_font, YELLOW, y_offset))
                         y_offset += 16
 
                     y_offset += 10  # Додатковий простір після поточного рівня
 
-            self.draw_text_centered("Use +/- or number keys (1-4) to change", self.small_font, CYAN, y_offset + 10)
+            layout.append(self._centered("Use +/- or number keys (1-4) to change", self.small_font, CYAN, y_offset + 10))
+        return layout
 
     def draw_win_screen(self):
         """Малює екран перемоги"""
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(150)
-        overlay.fill((0, 100, 0))  # Зелений відтінок
-        self.screen.blit(overlay, (0, 0))
-        self.draw_text_centered("YOU WIN!", self.big_font, WHITE, -50)
-        self.draw_text_centered("All dots collected!", self.font, WHITE, 0)
-        self.draw_text_centered("Press R to restart", self.font, WHITE, 30)
-        self.draw_text_centered("Press ESC to quit", self.font, WHITE, 60)
-        self.draw_text_centered("Use +/- to change difficulty", self.small_font, YELLOW, 90)
+        self.screen.blit(self._overlay((0, 100, 0), 150), (0, 0))  # Зелений відтінок
+        self._blit_layout(self._layout('win', lambda: self._end_layout("YOU WIN!", "All dots collected!")))
 
     def draw_lose_screen(self):
         """Малює екран поразки"""
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(150)
-        overlay.fill((100, 0, 0))  # Червоний відтінок
-        self.screen.blit(overlay, (0, 0))
-        self.draw_text_centered("GAME OVER!", self.big_font, WHITE, -50)
-        self.draw_text_centered("Ghost caught you!", self.font, WHITE, 0)
-        self.draw_text_centered("Press R to restart", self.font, WHITE, 30)
-        self.draw_text_centered("Press ESC to quit", self.font, WHITE, 60)
-        self.draw_text_centered("Use +/- to change difficulty", self.small_font, YELLOW, 90)
\ No newline at end of file
+        self.screen.blit(self._overlay((100, 0, 0), 150), (0, 0))  # Червоний відтінок
+        self._blit_layout(self._layout('lose', lambda: self._end_layout("GAME OVER!", "Ghost caught you!")))
+
+    def _end_layout(self, title, message):
+        """Розкладка екрана завершення гри"""
+        return [
+            self._centered(title, self.big_font, WHITE, -50),
+            self._centered(message, self.font, WHITE, 0),
+            self._centered("Press R to restart", self.font, WHITE, 30),
+            self._centered("Press ESC to quit", self.font, WHITE, 60),
+            self._centered("Use +/- to change difficulty", self.small_font, YELLOW, 90),
+        ]
+
+    def draw_trace(self, rows):
+        """
+        Відладкова накладка з останніми записами журналу рішень (внизу екрана)
+
+        Args:
+            rows: записи у вигляді кортежів рядків (тік, привид, правило, напрямок, сила)
+        """
+        columns = (10, 60, 130, 320, 400)
+        line_height = 14
+        height = line_height * len(rows) + 8
+        top = SCREEN_HEIGHT - height
+        self.screen.blit(self._overlay(BLACK, 180), (0, top), (0, 0, SCREEN_WIDTH, height))
+
+        y_pos = top + 4
+        for row in rows:
+            # Записи журналу щокадру інші, тому не кешуються
+            for x, field in zip(columns, row):
+                self.screen.blit(self.tiny_font.render(field, True, GREEN), (x, y_pos))
+            y_pos += line_height
@@ -0,0 +1,348 @@
+# test_game.py - Базові тести навігації та симуляції
+import functools
+import os
+import random
+from collections import deque
+
+from src.constants import *
+from src.map_loader import MapLoader
+from src.navigation import NavigationTable, UNREACHABLE
+from src.pathfinding import PathFinder
+from src.junction_graph import JunctionGraph
+from src.engine import GameEngine
+from src.tournament import run_tournament
+from src.controllers import AutopilotController
+
+TEST_MAP = "classic.txt"  # Карта з тунелями та недосяжними клітинками
+LAB_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def in_lab_directory(test):
+    """Запускає тест з директорії lab-1: карти шукаються в ./resources/maps"""
+    @functools.wraps(test)
+    def wrapper(*args, **kwargs):
+        cwd = os.getcwd()
+        os.chdir(LAB_DIR)
+        try:
+            return test(*args, **kwargs)
+        finally:
+            os.chdir(cwd)
+    return wrapper
+
+
+def load_test_map(map_name=TEST_MAP):
+    """Повертає (дані карти, ширина, висота)"""
+    map_data = MapLoader().load_map(map_name)
+    walls = map_data['walls']
+    return map_data, max(x for x, y in walls) + 1, max(y for x, y in walls) + 1
+
+
+def reference_bfs(walls, map_width, map_height, start, blocked=()):
+    """Звичайний BFS по клітинках: клітинка -> (відстань, напрямок першого кроку)"""
+    result = {start: (0, None)}
+    queue = deque([start])
+    while queue:
+        pos = queue.popleft()
+        distance, first = result[pos]
+        for direction in DIRECTIONS:
+            next_pos = ((pos[0] + direction[0]) % map_width, (pos[1] + direction[1]) % map_height)
+            if next_pos in walls or next_pos in blocked or next_pos in result:
+                continue
+            result[next_pos] = (distance + 1, first or direction)
+            queue.append(next_pos)
+    return result
+
+
+def walk(pos, direction, map_width, map_height):
+    return (pos[0] + direction[0]) % map_width, (pos[1] + direction[1]) % map_height
+
+
+@in_lab_directory
+def test_navigation_table():
+    """Тест таблиці навігації"""
+    print("=" * 50)
+    print("ТЕСТ ТАБЛИЦІ НАВІГАЦІЇ")
+    print("=" * 50)
+
+    map_data, width, height = load_test_map()
+    walls = map_data['walls']
+    table = NavigationTable.for_map(walls, width, height)
+
+    unreachable = 0
+    for start in table.cells:
+        reference = reference_bfs(walls, width, height, start)
+        for target in table.cells:
+            expected = reference.get(target)
+            assert table.distance(start, target) == (expected[0] if expected else None)
+            if expected is None:
+                unreachable += 1
+                assert table.next_step(start, target) is None
+                assert table.distances[table.index[start] * len(table.cells) + table.index[target]] == UNREACHABLE
+            elif start != target:
+                # Перший крок таблиці веде по найкоротшому шляху
+                step = walk(start, table.next_step(start, target), width, height)
+                assert step not in walls and table.distance(step, target) == expected[0] - 1
+    assert unreachable > 0
+    print(f"✓ Відстані збігаються з BFS для {len(table.cells) ** 2} пар, недосяжних: {unreachable}")
+
+    # Тунель: крок за край карти
+    tunnel = next(pos for pos in table.cells if pos[0] == 0 and (width - 1, pos[1]) in table.index)
+    assert table.distance(tunnel, (width - 1, tunnel[1])) == 1
+    assert table.next_step(tunnel, (width - 1, tunnel[1])) == LEFT
+    assert table.path(tunnel, (width - 1, tunnel[1])) == [(width - 1, tunnel[1])]
+    print(f"✓ Тунель {tunnel} -> {(width - 1, tunnel[1])}")
+
+    assert table.distance(tunnel, next(iter(walls))) is None
+    assert NavigationTable.for_map(walls, width, height) is table  # Таблиця кешується на карту
+    print()
+
+
+@in_lab_directory
+def test_pathfinder():
+    """Тест пошуку з блокуваннями"""
+    print("=" * 50)
+    print("ТЕСТ ПОШУКУ З БЛОКУВАННЯМИ")
+    print("=" * 50)
+
+    map_data, width, height = load_test_map()
+    walls = map_data['walls']
+    finder = PathFinder(NavigationTable.for_map(walls, width, height))
+    cells = finder.cells
+    rng = random.Random(1)
+
+    def check(start, target, blocked):
+        reference = reference_bfs(walls, width, height, start, blocked - {start})
+        expected = reference.get(target, (None, None))
+        assert finder.distance(start, target, blocked) == expected[0]
+        assert finder.next_step(start, target, blocked) == expected[1]
+        path = finder.path(start, target, blocked)
+        assert len(path) == (expected[0] or 0) and blocked.isdisjoint(path)
+
+    for _ in range(300):
+        start, target = rng.choice(cells), rng.choice(cells)
+        blocked = set(rng.sample(cells, 6)) - {target}
+        check(start, target, set())
+        check(start, target, blocked)
+        # Блокування попереднього пошуку не впливають на наступний
+        check(start, target, set())
+    print("✓ Збігається з BFS без блокувань і з ними")
+
+    # Переповнення лічильника пошуків очищує мітки
+    finder._stamp = PathFinder.MAX_STAMP - 2
+    start, target = cells[0], cells[-1]
+    for _ in range(4):
+        check(start, target, set(rng.sample(cells, 6)) - {target})
+        check(start, target, set())
+    assert finder._stamp < 100  # Лічильник почався знову
+    print("✓ Застарілі мітки не просочуються між пошуками")
+
+    distance = finder.distance(start, target)
+    assert finder.distance(start, target, max_depth=distance) == distance
+    assert finder.distance(start, target, max_depth=distance - 1) is None
+    print()
+
+
+@in_lab_directory
+def test_junction_graph():
+    """Тест графа перехресть"""
+    print("=" * 50)
+    print("ТЕСТ ГРАФА ПЕРЕХРЕСТЬ")
+    print("=" * 50)
+
+    map_data, width, height = load_test_map()
+    walls = map_data['walls']
+    graph = JunctionGraph.for_map(walls, width, height)
+
+    # Кожна клітинка - або вершина, або всередині рівно одного коридору з двома сусідами
+    for pos, neighbors in graph.cell_neighbors.items():
+        assert graph.is_junction(pos) != (pos in graph.cell_edge)
+        if not graph.is_junction(pos):
+            assert len(neighbors) == 2
+    print(f"✓ {len(graph.cell_neighbors)} клітинок стиснуто до {len(graph.nodes)} вершин "
+          f"і {len(graph.edge_cells)} коридорів")
+
+    # Відстані по графу між вершинами дорівнюють BFS по клітинках
+    for start in graph.nodes:
+        reference = reference_bfs(walls, width, height, start)
+        for target in graph.nodes:
+            expected = reference.get(target, (None, None))[0]
+            assert graph.distance(start, target) == expected
+    print("✓ Дейкстра по вершинах збігається з BFS")
+
+    # Довільні клітинки з блокуваннями
+    rng = random.Random(2)
+    cells = list(graph.cell_neighbors)
+    for _ in range(300):
+        start, target = rng.choice(cells), rng.choice(cells)
+        blocked = set(rng.sample(cells, 4)) - {start, target}
+        expected = reference_bfs(walls, width, height, start, blocked).get(target, (None, None))[0]
+        distance, direction = graph.search(start, target, blocked)
+        assert distance == expected
+        if distance:
+            step = walk(start, direction, width, height)
+            assert step not in blocked
+            assert reference_bfs(walls, width, height, step, blocked)[target][0] == distance - 1
+    print("✓ Пошук з блокуваннями збігається з BFS")
+
+    # Коридори
+    edge = max(range(len(graph.edge_cells)), key=lambda e: len(graph.edge_cells[e]))
+    corridor = graph.edge_cells[edge]
+    assert graph.same_corridor(corridor[0], corridor[-1])
+    assert not graph.same_corridor(corridor[0], graph.edge_from[edge])
+    heading = graph.direction(graph.edge_from[edge], corridor[0])
+    assert graph.corridor_direction(corridor[0], heading) == graph.direction(corridor[0], corridor[1])
+    assert graph.corridor_direction(graph.edge_from[edge], heading) is None
+    print(f"✓ Коридор з {len(corridor)} клітинок")
+    print()
+
+
+@in_lab_directory
+def test_ghost_keeps_corridor_heading():
+    """Тест руху привида коридором без рішень ШІ"""
+    print("=" * 50)
+    print("ТЕСТ РУХУ КОРИДОРОМ")
+    print("=" * 50)
+
+    class ReversingAI:
+        """ШІ, що завжди хоче розвернутися"""
+
+        def __init__(self, ghost):
+            self.ghost = ghost
+            self.calls = []
+
+        def get_next_direction(self, walls, pacman, other_ghosts):
+            self.calls.append((self.ghost.grid_x, self.ghost.grid_y))
+            return -self.ghost.direction[0], -self.ghost.direction[1]
+
+    engine = GameEngine(TEST_MAP, seed=1)
+    graph = engine.junction_graph
+    pacman_pos = (engine.pacman.grid_x, engine.pacman.grid_y)
+    edge = max((e for e in range(len(graph.edge_cells)) if pacman_pos not in graph.edge_cells[e]),
+               key=lambda e: len(graph.edge_cells[e]))
+    corridor = graph.edge_cells[edge]
+
+    ghost = engine.ghosts[0]
+    engine.ghosts = [ghost]
+    ghost.grid_x, ghost.grid_y = corridor[0]
+    ghost.target_x, ghost.target_y = corridor[0]
+    ghost.direction = graph.direction(graph.edge_from[edge], corridor[0])
+    ghost.ai = ReversingAI(ghost)
+
+    visited = [corridor[0]]
+    while (ghost.grid_x, ghost.grid_y) != graph.edge_to[edge]:
+        ghost.update(SIMULATION_DT, engine.walls, engine.pacman, engine.ghosts)
+        if (ghost.grid_x, ghost.grid_y) != visited[-1]:
+            visited.append((ghost.grid_x, ghost.grid_y))
+        assert len(visited) <= len(corridor) + 1
+    assert visited == corridor + [graph.edge_to[edge]]
+    assert not ghost.ai.calls
+    print(f"✓ Привид пройшов {len(corridor)} клітинок коридору без звернень до ШІ")
+
+    ghost.update(SIMULATION_DT, engine.walls, engine.pacman, engine.ghosts)
+    assert ghost.ai.calls == [graph.edge_to[edge]]
+    print("✓ На перехресті рішення приймає ШІ")
+    print()
+
+
+@in_lab_directory
+def test_tournament():
+    """Тест безголового турніру"""
+    print("=" * 50)
+    print("ТЕСТ ТУРНІРУ")
+    print("=" * 50)
+
+    # Крок симуляції залишається фіксованим після оновлення з довільним dt
+    engine = GameEngine(TEST_MAP, seed=1)
+    engine.update(0.25)
+    assert engine.dt == SIMULATION_DT
+    print("✓ Рушій зберігає фіксований крок часу")
+
+    def play():
+        return run_tournament(maps=["map1.txt"], levels=[0, 3], seeds=(1,), games=2,
+                              controller='greedy', time_limit=30, workers=1)
+
+    results, summary = play()
+    assert len(results) == 4 and len(summary) == 2
+    for result in results:
+        assert abs(result['sim_time'] - result['ticks'] * SIMULATION_DT) < 1e-6
+        assert result['sim_time'] <= 30 + SIMULATION_DT
+
+    # Результати відтворюються для тих самих зерен (крім реального часу)
+    timing = ('ai_time', 'wall_time', 'ai_time_per_tick')
+    strip = lambda rows: [{k: v for k, v in row.items() if k not in timing} for row in rows]
+    assert strip(play()[0]) == strip(results)
+    print(f"✓ {len(results)} ігор відтворюються для фіксованого зерна")
+
+    for row in summary:
+        for rate in ('win_rate', 'timeout_rate', 'dots_eaten_share'):
+            assert 0.0 <= row[rate] <= 1.0
+        print(f"  {row['level']}: перемоги {row['win_rate']:.0%}, точки {row['dots_eaten_share']:.0%}")
+    print("✓ Частки в зведенні в межах [0, 1]")
+    print()
+
+
+@in_lab_directory
+def test_autopilot_avoids_ghost():
+    """Тест автопілота: утеча від сусіднього привида"""
+    print("=" * 50)
+    print("ТЕСТ АВТОПІЛОТА")
+    print("=" * 50)
+
+    controller = AutopilotController()
+    engine = GameEngine(TEST_MAP, controller=controller, seed=1)
+    graph = engine.junction_graph
+
+    # Середина найдовшого коридору: привид з одного боку, точка за ним
+    edge = max(range(len(graph.edge_cells)), key=lambda e: len(graph.edge_cells[e]))
+    corridor = graph.edge_cells[edge]
+    middle = len(corridor) // 2
+    pacman_pos, ghost_pos, bait = corridor[middle], corridor[middle - 1], corridor[middle - 2]
+
+    pacman = engine.pacman
+    pacman.grid_x, pacman.grid_y = pacman_pos
+    pacman.target_x, pacman.target_y = pacman_pos
+    pacman.direction = graph.direction(pacman_pos, ghost_pos)  # Пакмен іде назустріч привиду
+
+    ghost = engine.ghosts[0]
+    ghost.grid_x, ghost.grid_y = ghost_pos
+    ghost.target_x, ghost.target_y = ghost_pos
+    engine.ghosts = [ghost]
+    engine.dots = {bait}
+
+    direction = controller.get_direction(engine)
+    assert direction is not None
+    assert walk(pacman_pos, direction, engine.map_width, engine.map_height) != ghost_pos
+    print(f"✓ Привид у {ghost_pos}, точка за ним - автопілот тікає в напрямку {direction}")
+
+    # Без привида автопілот іде до точки
+    engine.ghosts = []
+    assert walk(pacman_pos, controller.get_direction(engine), engine.map_width, engine.map_height) == ghost_pos
+    print("✓ Без привидів автопілот іде до найближчої точки")
+
+    # Після нової гри контролер не тримає стану попереднього рішення
+    engine.reset(2)
+    assert not controller.ghost_positions and not controller._danger and not controller.transpositions
+    assert not hasattr(controller, 'engine')
+    print()
+
+
+def run_all_tests():
+    """Запустити всі тести"""
+    print("\n" + "=" * 50)
+    print("БАЗОВІ ТЕСТИ НАВІГАЦІЇ")
+    print("=" * 50 + "\n")
+
+    test_navigation_table()
+    test_pathfinder()
+    test_junction_graph()
+    test_ghost_keeps_corridor_heading()
+    test_tournament()
+    test_autopilot_avoids_ghost()
+
+    print("=" * 50)
+    print("ВСІ ТЕСТИ ПРОЙДЕНО!")
+    print("=" * 50 + "\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,180 @@
+# archive.py - Архів популяцій усіх поколінь (memory-mapped)
+
+import json
+import os
+
+import numpy as np
+from genome import Genome
+
+
+class PopulationArchive:
+    """
+    Архів популяцій для офлайн-аналізу: лише дописування, запис фіксованого
+    розміру на кожну особину
+
+    Кожне покоління - це population_size записів у файлі records.bin:
+    номер покоління, fitness, індекси двох батьків у попередньому поколінні
+    (-1 - батька немає) та ваги у форматі int8. Параметри архіву лежать у
+    meta.json. Читання відбувається через np.memmap, тому будь-яке покоління
+    або зріз по тисячах поколінь доступні без розбору тексту і без
+    завантаження всього файлу в пам'ять.
+    """
+
+    def __init__(self, path, genome_size=None, population_size=None, policy=None):
+        """
+        Відкрити існуючий архів або створити новий
+
+        Args:
+            path: папка архіву
+            genome_size: кількість ваг у геномі (потрібно для нового архіву)
+            population_size: кількість особин у поколінні (потрібно для нового архіву)
+            policy: назва політики геномів
+        """
+        self.path = path
+        self.meta_path = os.path.join(path, "meta.json")
+        self.records_path = os.path.join(path, "records.bin")
+
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path) as f:
+                meta = json.load(f)
+            for name, value in (('genome_size', genome_size), ('population_size', population_size)):
+                if value is not None and value != meta[name]:
+                    raise ValueError(f"Архів {path}: {name}={meta[name]}, очікувалось {value}")
+        else:
+            if genome_size is None or population_size is None:
+                raise ValueError(f"Архів {path} не знайдено, потрібні genome_size та population_size")
+            meta = {
+                'genome_size': int(genome_size),
+                'population_size': int(population_size),
+                'policy': policy,
+                'shape': None,
+            }
+            os.makedirs(path, exist_ok=True)
+            with open(self.meta_path, 'w') as f:
+                json.dump(meta, f)
+
+        self.meta = meta
+        self.genome_size = meta['genome_size']
+        self.population_size = meta['population_size']
+        self.dtype = np.dtype([
+            ('generation', '<i4'),
+            ('fitness', '<f8'),
+            ('parents', '<i4', (2,)),
+            ('weights', 'i1', (self.genome_size,)),
+        ])
+
+        self._file = None
+        self._records = None
+
+    def append(self, generation, population, fitnesses, parent_indices=None):
+        """
+        Дописати покоління в кінець архіву
+
+        Args:
+            generation: номер покоління
+            population: список об'єктів Genome
+            fitnesses: fitness кожної особини
+            parent_indices: масив (N, 2) індексів батьків (None - невідомі)
+        """
+        if len(population) != self.population_size:
+            raise ValueError(f"Архів очікує {self.population_size} особин, отримано {len(population)}")
+
+        weights = np.array([genome.to_flat() for genome in population])
+        if np.abs(weights).max(initial=0) > 127:
+            raise ValueError("Ваги не вміщуються в int8")
+
+        records = np.zeros(self.population_size, dtype=self.dtype)
+        records['generation'] = generation
+        records['fitness'] = fitnesses
+        records['parents'] = -1 if parent_indices is None else parent_indices
+        records['weights'] = weights
+
+        if self.meta['shape'] is None:
+            # Форма ваг потрібна, щоб відновити геноми при читанні
+            self.meta['shape'] = list(population[0].weights.shape)
+            self.meta['policy'] = population[0].policy_name
+            with open(self.meta_path, 'w') as f:
+                json.dump(self.meta, f)
+
+        if self._file is None:
+            self._file = open(self.records_path, 'ab')
+        self._file.write(records.tobytes())
+        self._file.flush()
+        self._records = None
+
+    def close(self):
+        """Закрити файл для запису"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @property
+    def records(self):
+        """
+        Returns:
+            numpy memmap (G, N) лише для читання (обрізаний до повних поколінь)
+        """
+        if self._records is None:
+            generation_bytes = self.dtype.itemsize * self.population_size
+            size = os.path.getsize(self.records_path) if os.path.exists(self.records_path) else 0
+            count = size // generation_bytes
+            if count == 0:
+                return np.zeros((0, self.population_size), dtype=self.dtype)
+            self._records = np.memmap(self.records_path, dtype=self.dtype, mode='r',
+                                      shape=(count, self.population_size))
+        return self._records
+
+    def __len__(self):
+        return len(self.records)
+
+    def generation(self, index):
+        """
+        Args:
+            index: порядковий номер покоління в архіві
+
+        Returns:
+            numpy structured array (N,) - вигляд без копіювання
+        """
+        return self.records[index]
+
+    def fitness(self):
+        """
+        Returns:
+            numpy array (G, N): fitness усіх особин усіх поколінь
+        """
+        return self.records['fitness']
+
+    def genomes(self, index):
+        """
+        Відновити геноми покоління
+
+        Args:
+            index: порядковий номер покоління в архіві
+
+        Returns:
+            list: об'єкти Genome
+        """
+        shape = tuple(self.meta['shape'])
+        return [Genome(row.astype(int).reshape(shape), self.meta['policy'])
+                for row in self.records[index]['weights']]
+
+    def lineage(self, index, individual):
+        """
+        Простежити родовід особини по першому батьку
+
+        Args:
+            index: порядковий номер покоління в архіві
+            individual: індекс особини в поколінні
+
+        Returns:
+            list: пари (покоління, індекс) від особини до найдавнішого предка
+        """
+        chain = [(int(self.records[index]['generation'][individual]), individual)]
+        while index > 0:
+            parent = int(self.records[index]['parents'][individual][0])
+            if parent < 0:
+                break
+            index -= 1
+            individual = parent
+            chain.append((int(self.records[index]['generation'][individual]), individual))
+        return chain
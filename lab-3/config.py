@@ -13,6 +13,9 @@ MIN_LENGTH = 4          # Мінімальна довжина до смерті
 # Геном
 GENOME_SIZE = 120 * 2 * 4  # 960
 WEIGHT_RANGE = 99       # Ваги від -99 до 99
+POLICY = 'linear'       # Політика рішень: 'linear' (пряме відображення) або 'mlp'
+MLP_HIDDEN = 16         # Розмір прихованого шару для політики 'mlp'
+SPARSE_OCCUPANCY = 0.01  # Розріджене обчислення рішень, якщо заповнено менше 1% входів огляду
 
 # Генетичний алгоритм
 POPULATION_SIZE = 128    # Змійок одночасно на полі
@@ -22,14 +25,46 @@ MUTATION_RATE = 0.05     # 5% ваг мутують
 MUTATION_SIGMA = 15     # Сила мутації
 ELITE_SIZE = 4          # Топ-4 переходять без змін
 TOURNAMENT_SIZE = 16     # Розмір турніру для селекції
+CRN_SCENARIOS = 0        # Спільні сценарії оцінки на покоління (0 = одна випадкова арена)
+HALL_OF_FAME_SIZE = 0    # Розмір архіву найкращих геномів (0 = вимкнено)
+HOF_REEVAL_INTERVAL = 5  # Кожні N поколінь архів грає разом з популяцією
+
+# Збіжність (плато та рання зупинка)
+PLATEAU_PATIENCE = 0     # Поколінь без покращення, після яких посилюється мутація (0 = вимкнено)
+PLATEAU_MIN_IMPROVEMENT = 0.01  # Мінімальне відносне покращення найкращого fitness
+MUTATION_BUMP = 1.5      # Множник сили та ймовірності мутації на плато
+MAX_MUTATION_BUMPS = 3   # Максимум послідовних посилень
+MIN_GAIN_PER_CPU_MINUTE = 0.0  # Зупинка, коли приріст fitness за CPU-хвилину нижчий (0 = не зупиняти)
+CONVERGENCE_WINDOW = 20  # Вікно поколінь для оцінки приросту
+
+# Еволюційна стратегія (альтернатива ГА)
+ES_SIGMA = 10.0          # Стандартне відхилення збурень ваг
+ES_LEARNING_RATE = 2.0   # Крок Adam для середнього вектора ваг
+
+# Пошук новизни
+NOVELTY_WEIGHT = 0.0     # Вага новизни при виборі батьків (0 = лише fitness)
+NOVELTY_K = 15           # Кількість найближчих сусідів
+NOVELTY_ARCHIVE_SIZE = 50000  # Максимум поведінок в архіві
+NOVELTY_ADD_PER_GEN = 4  # Скільки найновіших поведінок додавати за покоління
 
 # Їжа
 FOOD_COUNT = 1000         # Кількість їжі на полі одночасно
 
+# Перешкоди
+OBSTACLE_MAP = None       # Текстова карта перешкод ('#' - стіна), None - без карти
+OBSTACLE_DENSITY = 0.0    # Частка поля під процедурними стінами (0 = лише бар'єр)
+OBSTACLE_SEED = 0         # Зерно процедурних стін
+
 # Візуалізація
 VISUALIZE = True
 FPS = 60                # Швидкість відображення
+VIEWPORT_SIZE = 750     # Максимальний розмір області поля у вікні (пікселі)
 HEADLESS_GENERATIONS = 200  # Скільки поколінь тренувати в headless
+POPULATION_ARCHIVE = False  # Записувати кожне покоління в memory-mapped архів (data/archive)
+CHECKPOINT_INTERVAL = 1     # Контрольна точка популяції кожні N поколінь (0 = лише кожні 50)
+STATS_FLUSH_INTERVAL = 1    # Переписувати CSV статистики кожні N поколінь
+MONITOR_PORT = 0            # Порт HTTP/JSON монітора тренування (0 = вимкнено)
+MEMORY_PROFILE = False      # Профіль пам'яті по поколіннях (data/profiles, сповільнює тренування)
 
 # Кольори (RGB)
 COLOR_BACKGROUND = (20, 20, 20)
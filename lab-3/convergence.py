@@ -0,0 +1,113 @@
+# convergence.py - Виявлення плато та рання зупинка тренування
+
+import time
+
+import config
+
+
+class ConvergenceMonitor:
+    """
+    Стежить за stats_history і вирішує, чи варто тренувати далі
+
+    Якщо найкращий fitness не покращувався patience поколінь, монітор
+    посилює мутацію (mutation_rate / mutation_sigma генетичного алгоритму
+    або sigma еволюційної стратегії) і повертає початкові значення після
+    першого покращення. Тренування зупиняється, коли приріст найкращого
+    fitness за CPU-хвилину на останньому вікні поколінь падає нижче порогу.
+    """
+
+    # Атрибути оптимізаторів, які можна посилювати на плато
+    MUTATION_ATTRIBUTES = ('mutation_rate', 'mutation_sigma', 'sigma')
+
+    def __init__(self, patience=None, min_improvement=None, bump_factor=None,
+                 max_bumps=None, min_gain_per_cpu_minute=None, window=None,
+                 clock=time.process_time):
+        """
+        Ініціалізація монітора (None - значення з config)
+
+        Args:
+            patience: поколінь без покращення до посилення мутації (0 - не посилювати)
+            min_improvement: мінімальне відносне покращення найкращого fitness
+            bump_factor: множник мутації на плато
+            max_bumps: максимум послідовних посилень
+            min_gain_per_cpu_minute: поріг приросту fitness за CPU-хвилину (0 - не зупиняти)
+            window: кількість поколінь для оцінки приросту
+            clock: функція часу CPU в секундах
+        """
+        self.patience = config.PLATEAU_PATIENCE if patience is None else patience
+        self.min_improvement = config.PLATEAU_MIN_IMPROVEMENT if min_improvement is None else min_improvement
+        self.bump_factor = config.MUTATION_BUMP if bump_factor is None else bump_factor
+        self.max_bumps = config.MAX_MUTATION_BUMPS if max_bumps is None else max_bumps
+        self.min_gain_per_cpu_minute = (config.MIN_GAIN_PER_CPU_MINUTE
+                                        if min_gain_per_cpu_minute is None else min_gain_per_cpu_minute)
+        self.window = config.CONVERGENCE_WINDOW if window is None else window
+        self.clock = clock
+
+        self.best = None
+        self.last_improvement = 0  # Індекс запису stats_history з останнім покращенням
+        self.bumps = 0
+        self.base_mutation = None
+        self.cpu_times = []  # Час CPU після кожного покоління
+        self.stop_reason = None
+        self.events = []  # (покоління, подія)
+
+    @property
+    def enabled(self):
+        return self.patience > 0 or self.min_gain_per_cpu_minute > 0
+
+    def update(self, ga):
+        """
+        Оцінити останнє покоління
+
+        Args:
+            ga: GeneticAlgorithm або EvolutionStrategy
+
+        Returns:
+            bool: True - продовжувати тренування, False - зупинитись
+        """
+        history = ga.stats_history
+        self.cpu_times.append(self.clock())
+        best = history[-1]['best_overall_fitness']
+        generation = history[-1]['generation']
+
+        if self.base_mutation is None:
+            self.base_mutation = {name: getattr(ga, name) for name in self.MUTATION_ATTRIBUTES
+                                  if hasattr(ga, name)}
+
+        # Покращення відносно попереднього найкращого
+        if self.best is None or best - self.best > self.min_improvement * max(abs(self.best), 1):
+            self.best = best
+            self.last_improvement = len(history) - 1
+            if self.bumps:
+                self._set_mutation(ga, 1.0)
+                self.bumps = 0
+                self.events.append((generation, 'мутацію відновлено'))
+
+        stalled = len(history) - 1 - self.last_improvement
+
+        # Плато - посилити мутацію (не частіше ніж раз на patience поколінь)
+        if self.patience > 0 and stalled >= self.patience * (self.bumps + 1) and self.bumps < self.max_bumps:
+            self.bumps += 1
+            self._set_mutation(ga, self.bump_factor ** self.bumps)
+            self.events.append((generation, f'плато {stalled} поколінь, мутація x{self.bump_factor ** self.bumps:.2f}'))
+
+        # Рання зупинка за приростом на вікні поколінь
+        if self.min_gain_per_cpu_minute > 0 and len(self.cpu_times) > self.window:
+            gain = best - history[-1 - self.window]['best_overall_fitness']
+            cpu_minutes = (self.cpu_times[-1] - self.cpu_times[-1 - self.window]) / 60
+            rate = gain / max(cpu_minutes, 1e-9)
+            if rate < self.min_gain_per_cpu_minute:
+                self.stop_reason = (f'приріст {rate:.1f} fitness/CPU-хв за останні {self.window} '
+                                    f'поколінь нижчий за {self.min_gain_per_cpu_minute:.1f}')
+                self.events.append((generation, self.stop_reason))
+                return False
+
+        return True
+
+    def _set_mutation(self, ga, factor):
+        """Встановити мутацію як базову, помножену на factor"""
+        for name, value in self.base_mutation.items():
+            bumped = value * factor
+            if name == 'mutation_rate':
+                bumped = min(bumped, 1.0)
+            setattr(ga, name, bumped)
@@ -1,44 +1,138 @@
 # environment.py - Середовище гри
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+import config
 from food import Food
+from snake import Snake
+from obstacles import obstacle_layer
+from policy import get_policy
+
+
+class EnvironmentSnapshot:
+    """
+    Компактний знімок стану середовища
+    
+    Весь стан зберігається в масивах numpy лише для читання: сітка,
+    координати їжі, скалярні параметри змійок та їх тіла, склеєні в один
+    масив зі зміщеннями. Геноми не копіюються, а передаються за посиланням,
+    тому один знімок можна відновлювати чи розгалужувати багато разів
+    (і передавати в інші процеси) без глибокого копіювання об'єктів.
+    """
+    
+    def __init__(self, environment, include_rng=False):
+        """
+        Зняти стан середовища
+        
+        Args:
+            environment: об'єкт Environment
+            include_rng: зберегти також стан генератора numpy
+                         (для точного відтворення продовження)
+        """
+        snakes = environment.snakes
+        self.width = environment.width
+        self.height = environment.height
+        self.static_obstacles = environment.static_obstacles  # Статичний шар спільний, не копіюється
+        self.grid = self._frozen(environment.grid.copy())
+        self.foods = self._frozen(np.array([(f.x, f.y) for f in environment.foods], dtype=int).reshape(-1, 2))
+        
+        self.genomes = tuple(snake.genome for snake in snakes)
+        self.ids = self._frozen(np.array([snake.id for snake in snakes]))
+        self.directions = self._frozen(np.array([snake.direction for snake in snakes], dtype=int))
+        self.energy = self._frozen(np.array([snake.energy for snake in snakes], dtype=int))
+        self.length = self._frozen(np.array([snake.length for snake in snakes], dtype=int))
+        self.food_eaten = self._frozen(np.array([snake.food_eaten for snake in snakes], dtype=int))
+        self.alive = self._frozen(np.array([snake.alive for snake in snakes], dtype=bool))
+        self.steps = self._frozen(np.array([snake.steps for snake in snakes], dtype=int))
+        self.start_positions = self._frozen(np.array([snake.start_position for snake in snakes], dtype=int).reshape(-1, 2))
+        self.direction_counts = self._frozen(np.array([snake.direction_counts for snake in snakes], dtype=int).reshape(-1, 4))
+        
+        # Тіла всіх змійок: body_offsets[i]:body_offsets[i + 1] - сегменти змійки i
+        lengths = [len(snake.body) for snake in snakes]
+        self.body_offsets = self._frozen(np.concatenate([[0], np.cumsum(lengths, dtype=int)]))
+        self.bodies = self._frozen(np.array([seg for snake in snakes for seg in snake.body], dtype=int).reshape(-1, 2))
+        
+        self.rng_state = np.random.get_state() if include_rng else None
+    
+    @staticmethod
+    def _frozen(array):
+        array.setflags(write=False)
+        return array
+    
+    def __len__(self):
+        return len(self.genomes)
+    
+    def build_snakes(self):
+        """
+        Відтворити змійки зі знімка
+        
+        Returns:
+            list: нові об'єкти Snake з тими ж геномами
+        """
+        snakes = []
+        bodies = self.bodies.tolist()
+        offsets = self.body_offsets.tolist()
+        
+        for i, genome in enumerate(self.genomes):
+            start_x, start_y = self.start_positions[i].tolist()
+            snake = Snake(start_x, start_y, genome, self.ids[i].item(), direction=int(self.directions[i]))
+            snake.body = [tuple(seg) for seg in bodies[offsets[i]:offsets[i + 1]]]
+            snake.energy = int(self.energy[i])
+            snake.length = int(self.length[i])
+            snake.food_eaten = int(self.food_eaten[i])
+            snake.alive = bool(self.alive[i])
+            snake.steps = int(self.steps[i])
+            snake.direction_counts = self.direction_counts[i].tolist()
+            snakes.append(snake)
+        
+        return snakes
 
 
 class Environment:
     """Клас що управляє ігровим полем, їжею та перешкодами"""
     
-    def __init__(self, width, height):
+    def __init__(self, width, height, static_obstacles=None):
         """
         Ініціалізація середовища
         
         Args:
             width: ширина поля
             height: висота поля
+            static_obstacles: булевий шар перешкод (height, width)
+                              (None - бар'єр та перешкоди з config)
         """
         self.width = width
         self.height = height
         self.snakes = []
         self.foods = []
-        self.obstacles = []
-        
-        # Створити бар'єр навколо поля
-        self._create_barrier()
         
         # Сітка для швидкої перевірки зайнятості
         # 0 = пусто, 1 = їжа, 2 = перешкода, 3 = тіло змійки
         self.grid = np.zeros((height, width), dtype=int)
-    
-    def _create_barrier(self):
-        """Створити бар'єр навколо поля"""
-        # Верхня та нижня стіни
-        for x in range(self.width):
-            self.obstacles.append((x, 0))
-            self.obstacles.append((x, self.height - 1))
         
-        # Ліва та права стіни
-        for y in range(self.height):
-            self.obstacles.append((0, y))
-            self.obstacles.append((self.width - 1, y))
+        # Статичний шар перешкод (бар'єр навколо поля та внутрішні стіни)
+        if static_obstacles is None:
+            static_obstacles = obstacle_layer(width, height)
+        self._set_static_obstacles(static_obstacles)
+        
+        # Буфери для пакетного обчислення поля зору та рішень
+        self._padded = None
+        self._weights = {}  # політика -> (стек ваг, кількість змійок)
+        self._features = None
+        self._inputs = None
+    
+    def _set_static_obstacles(self, static_obstacles):
+        """Встановити статичний шар та відповідну йому базову сітку"""
+        self.static_obstacles = static_obstacles
+        self._static_grid = np.where(static_obstacles, 2, 0).astype(self.grid.dtype)
+    
+    @property
+    def obstacles(self):
+        """
+        Returns:
+            list: координати (x, y) всіх статичних перешкод
+        """
+        return [(x, y) for y, x in np.argwhere(self.static_obstacles).tolist()]
     
     def add_snake(self, snake):
         """
@@ -70,15 +164,20 @@ class Environment:
                 self.foods.append(Food(x, y))
                 spawned += 1
     
+    def place_food(self, positions):
+        """
+        Розмістити їжу на заданих координатах (наприклад, зі сценарію)
+        
+        Args:
+            positions: масив або список пар (x, y)
+        """
+        for x, y in positions:
+            self.foods.append(Food(int(x), int(y)))
+    
     def update_grid(self):
         """Оновити сітку з поточними об'єктами"""
-        # Очистити сітку
-        self.grid.fill(0)
-        
-        # Позначити перешкоди
-        for obs_x, obs_y in self.obstacles:
-            if 0 <= obs_x < self.width and 0 <= obs_y < self.height:
-                self.grid[obs_y, obs_x] = 2
+        # Статичні перешкоди (бар'єр та стіни) - одне копіювання готового шару
+        np.copyto(self.grid, self._static_grid)
         
         # Позначити їжу
         for food in self.foods:
@@ -123,19 +222,142 @@ class Environment:
         # Перешкода або тіло змійки
         return self.grid[y, x] in [2, 3]
     
+    def _vision_windows(self, snakes):
+        """
+        Вікна огляду навколо голів змійок (копія значень сітки)
+        
+        Поле доповнюється перешкодами (2) на ширину радіусу огляду,
+        тому клітинки за межами поля бачаться як перешкоди.
+        
+        Args:
+            snakes: список змійок
+        
+        Returns:
+            numpy array (N, 2r+1, 2r+1) зі значеннями сітки
+        """
+        r = config.VISION_RADIUS
+        shape = (self.height + 2 * r, self.width + 2 * r)
+        if self._padded is None or self._padded.shape != shape:
+            self._padded = np.full(shape, 2, dtype=self.grid.dtype)
+        self._padded[r:r + self.height, r:r + self.width] = self.grid
+        
+        size = 2 * r + 1
+        windows = sliding_window_view(self._padded, (size, size))
+        heads = np.array([snake.body[0] for snake in snakes], dtype=int).reshape(-1, 2)
+        return windows[heads[:, 1], heads[:, 0]]
+    
+    def get_visions(self, snakes):
+        """
+        Поле зору для кількох змійок одразу
+        
+        Args:
+            snakes: список змійок
+        
+        Returns:
+            numpy array (N, 2r+1, 2r+1, 2)
+            [..., 0] = їжа, [..., 1] = перешкода (межі, стіни, тіла змійок)
+        """
+        windows = self._vision_windows(snakes)
+        r = config.VISION_RADIUS
+        
+        vision = np.zeros(windows.shape + (2,))
+        vision[..., 0] = windows == 1
+        vision[..., 1] = windows >= 2
+        
+        # Центральна клітинка - голова змійки
+        vision[:, r, r, :] = 0
+        return vision
+    
+    def _policy_inputs(self, snakes):
+        """
+        Сплющені входи політики (N, V*2) без центральної клітинки
+        
+        Args:
+            snakes: список змійок
+        
+        Returns:
+            numpy array (N, V*2) bool у перевикористовуваному буфері
+        """
+        windows = self._vision_windows(snakes)
+        n = len(snakes)
+        cells = windows.shape[1] * windows.shape[2]
+        flat = windows.reshape(n, cells)
+        
+        if self._features is None or self._features.shape[0] < n or self._features.shape[1] != cells:
+            self._features = np.empty((max(n, 1), cells, 2), dtype=bool)
+            self._inputs = np.empty((max(n, 1), (cells - 1) * 2), dtype=bool)
+        features = self._features[:n]
+        np.equal(flat, 1, out=features[..., 0])
+        np.greater_equal(flat, 2, out=features[..., 1])
+        
+        # Прибрати центральну клітинку (голову) двома суцільними копіюваннями
+        features = features.reshape(n, cells * 2)
+        center = (cells // 2) * 2
+        inputs = self._inputs[:n]
+        inputs[:, :center] = features[:, :center]
+        inputs[:, center:] = features[:, center + 2:]
+        return inputs
+    
+    def _weights_stack(self, policy_name):
+        """
+        Стек сплющених ваг усіх змійок з даною політикою
+        
+        Будується один раз на набір змійок, рядок i відповідає self.snakes[i]
+        (для змійок з іншою політикою рядок лишається нульовим).
+        """
+        cached = self._weights.get(policy_name)
+        if cached is not None and cached[1] == len(self.snakes):
+            return cached[0]
+        
+        size = int(np.prod(get_policy(policy_name).weights_shape()))
+        stack = np.zeros((len(self.snakes), size))
+        for i, snake in enumerate(self.snakes):
+            if snake.genome.policy_name == policy_name:
+                stack[i] = snake.genome.weights.ravel()
+        self._weights[policy_name] = (stack, len(self.snakes))
+        return stack
+    
+    def decide_outputs(self, indices):
+        """
+        Пакетно обчислити виходи політик для змійок
+        
+        Змійки групуються за політикою, і кожна група обчислюється одним
+        викликом forward_batch замість циклу по змійках.
+        
+        Args:
+            indices: індекси змійок у self.snakes
+        
+        Returns:
+            numpy array (N, 4): виходи в порядку indices
+        """
+        indices = np.asarray(indices, dtype=int)
+        snakes = [self.snakes[i] for i in indices]
+        inputs = self._policy_inputs(snakes)
+        outputs = np.empty((len(snakes), 4))
+        
+        policy_names = np.array([snake.genome.policy_name for snake in snakes])
+        for policy_name in np.unique(policy_names):
+            group = np.flatnonzero(policy_names == policy_name)
+            weights = self._weights_stack(policy_name)[indices[group]]
+            outputs[group] = get_policy(policy_name).forward_batch(weights, inputs[group])
+        
+        return outputs
+    
     def step(self):
         """Виконати один крок симуляції"""
         # Оновити сітку перед рухом
         self.update_grid()
         
+        # Рішення всіх живих змійок одним пакетом (сітка між ними не змінюється)
+        alive = [i for i, snake in enumerate(self.snakes) if snake.alive]
+        if not alive:
+            return
+        outputs = self.decide_outputs(alive)
+        
         # Рухати кожну живу змійку
-        for snake in self.snakes:
-            if not snake.alive:
-                continue
-            
-            # Отримати поле зору та прийняти рішення
-            vision = snake.get_vision(self)
-            snake.decide_direction(vision)
+        for i, snake_outputs in zip(alive, outputs):
+            snake = self.snakes[i]
+            snake.choose_direction(snake_outputs)
             
             # Рух
             snake.move()
@@ -159,6 +381,66 @@ class Environment:
         # Фінальне оновлення сітки
         self.update_grid()
     
+    def snapshot(self, include_rng=False):
+        """
+        Зняти компактний знімок поточного стану
+        
+        Args:
+            include_rng: зберегти стан генератора numpy
+        
+        Returns:
+            EnvironmentSnapshot
+        """
+        return EnvironmentSnapshot(self, include_rng)
+    
+    def restore(self, snapshot):
+        """
+        Повернути середовище до стану зі знімка (наприклад, після пробного
+        прогону на кілька кроків вперед)
+        
+        Args:
+            snapshot: EnvironmentSnapshot
+        """
+        self.width = snapshot.width
+        self.height = snapshot.height
+        self._set_static_obstacles(snapshot.static_obstacles)
+        self.grid = snapshot.grid.copy()
+        self.foods = [Food(x, y) for x, y in snapshot.foods.tolist()]
+        self.snakes = snapshot.build_snakes()
+        self._weights.clear()
+        
+        if snapshot.rng_state is not None:
+            np.random.set_state(snapshot.rng_state)
+    
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """
+        Створити нове середовище зі знімка (наприклад, у процесі пулу)
+        
+        Args:
+            snapshot: EnvironmentSnapshot
+        
+        Returns:
+            Environment
+        """
+        env = cls.__new__(cls)
+        env.grid = snapshot.grid.copy()
+        env._padded = None
+        env._weights = {}
+        env._features = None
+        env._inputs = None
+        env.restore(snapshot)
+        return env
+    
+    def fork(self):
+        """
+        Розгалузити симуляцію: незалежна копія поточного стану
+        
+        Returns:
+            Environment: нове середовище, зміни в якому не впливають на це
+        """
+        return Environment.from_snapshot(self.snapshot())
+    
     def get_alive_count(self):
         """
         Отримати кількість живих змійок
@@ -172,4 +454,5 @@ class Environment:
         """Очистити середовище"""
         self.snakes.clear()
         self.foods.clear()
-        self.grid.fill(0)
\ No newline at end of file
+        np.copyto(self.grid, self._static_grid)
+        self._weights.clear()
\ No newline at end of file
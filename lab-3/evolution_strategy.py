@@ -0,0 +1,118 @@
+# evolution_strategy.py - Еволюційна стратегія (OpenAI-ES)
+
+import time
+
+import numpy as np
+from genome import Genome
+from genetic_algorithm import GeneticAlgorithm
+from config import (
+    POPULATION_SIZE, WEIGHT_RANGE, ES_SIGMA, ES_LEARNING_RATE
+)
+
+
+class EvolutionStrategy(GeneticAlgorithm):
+    """
+    Альтернатива генетичному алгоритму: еволюційна стратегія у стилі OpenAI-ES
+
+    Замість селекції та схрещування зберігається один середній вектор ваг.
+    Кожне покоління - це симетричні (антитетичні) гаусові збурення навколо
+    середнього; їх ранги дають оцінку градієнта, а середнє оновлюється
+    оптимізатором Adam. Вибірка, ранжування та оновлення векторизовані.
+
+    Оцінка популяції, статистика, збереження та завантаження успадковані
+    від GeneticAlgorithm, тому клас можна підставити замість нього.
+    """
+
+    def __init__(self, population_size=POPULATION_SIZE, sigma=ES_SIGMA,
+                 learning_rate=ES_LEARNING_RATE, crn_scenarios=None):
+        """
+        Ініціалізація еволюційної стратегії
+
+        Args:
+            population_size: кількість збурень на покоління
+            sigma: стандартне відхилення збурень (в одиницях ваг)
+            learning_rate: крок Adam для середнього вектора
+            crn_scenarios: кількість спільних сценаріїв оцінки
+        """
+        super().__init__(population_size, crn_scenarios=crn_scenarios,
+                         hall_of_fame_size=0, novelty_weight=0)
+
+        self.sigma = sigma
+        self.learning_rate = learning_rate
+
+        # Середнє стартує з випадкового генома з вбудованими штрафами за перешкоди
+        self.shape = self.population[0].weights.shape
+        self.policy_name = self.population[0].policy_name
+        self.mean = self.population[0].to_flat().astype(float)
+
+        # Стан Adam
+        self.adam_m = np.zeros_like(self.mean)
+        self.adam_v = np.zeros_like(self.mean)
+        self.adam_t = 0
+
+        self.noise = None
+        self._sample_population()
+
+    def _sample_population(self):
+        """Згенерувати популяцію симетричних збурень навколо середнього"""
+        half = self.population_size // 2
+        eps = np.random.standard_normal((half, self.mean.size))
+
+        noise = [eps, -eps]
+        if self.population_size % 2:
+            # Непарний розмір - додатково оцінюємо саме середнє
+            noise.append(np.zeros((1, self.mean.size)))
+        self.noise = np.concatenate(noise)
+
+        candidates = np.clip(np.round(self.mean + self.sigma * self.noise),
+                             -WEIGHT_RANGE, WEIGHT_RANGE).astype(int)
+        self.population = [Genome(row.reshape(self.shape), self.policy_name) for row in candidates]
+
+    def evolve(self):
+        """Виконати один крок еволюційної стратегії"""
+        start = time.perf_counter()
+        fitnesses, max_length, max_food = self.evaluate_population()
+        self._record_stats(fitnesses, max_length, max_food)
+        self._archive_generation(fitnesses)
+
+        # Центровані ранги в [-0.5, 0.5] - стійкі до масштабу fitness
+        n = len(fitnesses)
+        ranks = np.argsort(np.argsort(fitnesses)) / max(n - 1, 1) - 0.5
+
+        # Оцінка градієнта середнього
+        gradient = ranks @ self.noise / (n * self.sigma)
+
+        # Крок Adam (підйом по градієнту)
+        beta1, beta2 = 0.9, 0.999
+        self.adam_t += 1
+        self.adam_m = beta1 * self.adam_m + (1 - beta1) * gradient
+        self.adam_v = beta2 * self.adam_v + (1 - beta2) * gradient ** 2
+        m_hat = self.adam_m / (1 - beta1 ** self.adam_t)
+        v_hat = self.adam_v / (1 - beta2 ** self.adam_t)
+        self.mean += self.learning_rate * m_hat / (np.sqrt(v_hat) + 1e-8)
+        self.mean = np.clip(self.mean, -WEIGHT_RANGE, WEIGHT_RANGE)
+
+        self._sample_population()
+        self.generation += 1
+        self.timings['generation'] = time.perf_counter() - start
+
+    def load_population(self, filename):
+        """
+        Завантажити популяцію та взяти її середнє як стартову точку
+
+        Args:
+            filename: шлях до файлу
+        """
+        super().load_population(filename)
+        self.mean = np.mean([genome.to_flat() for genome in self.population], axis=0)
+        self.adam_m = np.zeros_like(self.mean)
+        self.adam_v = np.zeros_like(self.mean)
+        self.adam_t = 0
+        self._sample_population()
+
+    def get_mean_genome(self):
+        """
+        Returns:
+            Genome: поточне середнє, округлене до цілих ваг
+        """
+        return Genome(np.round(self.mean).astype(int).reshape(self.shape), self.policy_name)
@@ -1,80 +1,155 @@
 # genetic_algorithm.py - Генетичний алгоритм
 
+import time
+
 import numpy as np
 from genome import Genome
-from snake import Snake
-from environment import Environment
+from hall_of_fame import HallOfFame
+from novelty import NoveltyArchive, combine_ranks
+from scenarios import generate_scenario, generate_scenarios
 from config import (
     POPULATION_SIZE, MAX_STEPS, MUTATION_RATE, MUTATION_SIGMA,
-    ELITE_SIZE, TOURNAMENT_SIZE, GRID_SIZE, SURVIVORS, FOOD_COUNT
+    ELITE_SIZE, TOURNAMENT_SIZE, SURVIVORS, CRN_SCENARIOS,
+    HALL_OF_FAME_SIZE, HOF_REEVAL_INTERVAL,
+    NOVELTY_WEIGHT, NOVELTY_K, NOVELTY_ARCHIVE_SIZE, NOVELTY_ADD_PER_GEN
 )
 
 
 class GeneticAlgorithm:
     """Клас що керує еволюцією популяції змійок"""
     
-    def __init__(self, population_size=POPULATION_SIZE):
+    def __init__(self, population_size=POPULATION_SIZE, crn_scenarios=None,
+                 hall_of_fame_size=None, novelty_weight=None):
         """
         Ініціалізація генетичного алгоритму
         
         Args:
             population_size: розмір популяції
+            crn_scenarios: кількість спільних сценаріїв оцінки
+                           (None - значення CRN_SCENARIOS з config)
+            hall_of_fame_size: розмір архіву найкращих геномів
+                               (None - значення HALL_OF_FAME_SIZE з config, 0 - вимкнено)
+            novelty_weight: вага новизни при селекції
+                            (None - значення NOVELTY_WEIGHT з config, 0 - лише fitness)
         """
         self.population_size = population_size
+        self.mutation_rate = MUTATION_RATE
+        self.mutation_sigma = MUTATION_SIGMA
+        self.crn_scenarios = CRN_SCENARIOS if crn_scenarios is None else crn_scenarios
+        self.scenarios = None  # Генеруються один раз при першій оцінці
         self.population = [Genome() for _ in range(population_size)]
         self.generation = 0
         self.best_genome = None
         self.best_fitness = -np.inf
         self.stats_history = []
+        
+        hall_of_fame_size = HALL_OF_FAME_SIZE if hall_of_fame_size is None else hall_of_fame_size
+        self.hall_of_fame = None
+        if hall_of_fame_size > 0:
+            self.hall_of_fame = HallOfFame(hall_of_fame_size, self.population[0].weights.size)
+        
+        self.novelty_weight = NOVELTY_WEIGHT if novelty_weight is None else novelty_weight
+        self.novelty_archive = None
+        self.behaviours = None  # Дескриптори поведінки з останньої оцінки
+        
+        # Родовід: індекси двох батьків кожної особини в попередньому поколінні
+        self.parent_indices = np.full((population_size, 2), -1, dtype=int)
+        self.archive = None  # PopulationArchive для запису кожного покоління
+        self.profiler = None  # MemoryProfiler (вимірює середовища після симуляції)
+        
+        # Час фаз останнього покоління (секунди) та кількість кроків арен
+        self.timings = {}
     
-    def evaluate_population(self):
+    def evaluate_population(self, extra_genomes=None):
         """
         Оцінити всю популяцію - всі змійки грають одночасно
         
+        Якщо увімкнено спільні сценарії (crn_scenarios > 0), кожне покоління
+        грає на тих самих K аренах, а fitness усереднюється між ними.
+        
+        Args:
+            extra_genomes: додаткові геноми, що грають на тій самій арені
+                           (наприклад, архів найкращих); їх fitness
+                           повертається після fitness популяції
+        
         Returns:
             list: список fitness для кожного генома
+        
+        Дескриптори поведінки зберігаються в self.behaviours.
+        """
+        start = time.perf_counter()
+        self.timings['steps'] = 0
+        genomes = self.population + list(extra_genomes or [])
+        
+        if self.crn_scenarios > 0:
+            # Точок появи вистачає і для популяції, і для повного архіву
+            spawn_count = len(self.population)
+            if self.hall_of_fame is not None:
+                spawn_count += self.hall_of_fame.capacity
+            spawn_count = max(spawn_count, len(genomes))
+            
+            if self.scenarios is None or len(self.scenarios[0].spawn_positions) < spawn_count:
+                self.scenarios = generate_scenarios(self.crn_scenarios, spawn_count)
+            
+            results = [self._simulate(scenario, genomes) for scenario in self.scenarios]
+            
+            fitnesses = np.mean([r[0] for r in results], axis=0).tolist()
+            max_length = max(r[1] for r in results)
+            max_food = max(r[2] for r in results)
+            self.behaviours = np.mean([r[3] for r in results], axis=0)
+        else:
+            fitnesses, max_length, max_food, self.behaviours = self._simulate(
+                generate_scenario(len(genomes)), genomes
+            )
+        
+        self.timings['evaluate'] = time.perf_counter() - start
+        return fitnesses, max_length, max_food
+    
+    def _simulate(self, scenario, genomes):
+        """
+        Зіграти одну арену з переданими геномами
+        
+        Args:
+            scenario: об'єкт Scenario
+            genomes: список об'єктів Genome
+        
+        Returns:
+            tuple: (fitnesses, max_length, max_food, behaviours)
         """
-        # Створити середовище
-        env = Environment(GRID_SIZE, GRID_SIZE)
-        
-        # Створити всі змійки одночасно на полі
-        # Розмістити їх рівномірно по полю, уникаючи бар'єру
-        grid_positions = []
-        grid_step = (GRID_SIZE - 4) // int(np.sqrt(POPULATION_SIZE))
-        
-        for i in range(int(np.sqrt(POPULATION_SIZE)) + 1):
-            for j in range(int(np.sqrt(POPULATION_SIZE)) + 1):
-                if len(grid_positions) < POPULATION_SIZE:
-                    x = 2 + j * grid_step + np.random.randint(-2, 3)
-                    y = 2 + i * grid_step + np.random.randint(-2, 3)
-                    # Переконатися що не на бар'єрі
-                    x = max(2, min(GRID_SIZE - 3, x))
-                    y = max(2, min(GRID_SIZE - 3, y))
-                    grid_positions.append((x, y))
-        
-        # Створити змійок
-        for i, genome in enumerate(self.population):
-            x, y = grid_positions[i]
-            snake = Snake(x, y, genome, snake_id=i + 1)
-            env.add_snake(snake)
-        
-        # Створити їжу (фіксована кількість)
-        env.spawn_food(FOOD_COUNT)
-        
-        # Запустити симуляцію
-        step = 0
-        while env.get_alive_count() > 0 and step < MAX_STEPS:
-            env.step()
-            step += 1
+        # Зафіксувати випадковість симуляції (появу нової їжі, вибір серед
+        # рівних виходів), не зачіпаючи генератор самого алгоритму
+        rng_state = None
+        if scenario.seed is not None:
+            rng_state = np.random.get_state()
+            np.random.seed(scenario.seed)
+        
+        try:
+            env = scenario.build_environment(genomes)
+            
+            # Запустити симуляцію
+            step = 0
+            while env.get_alive_count() > 0 and step < MAX_STEPS:
+                env.step()
+                step += 1
+            self.timings['steps'] = self.timings.get('steps', 0) + step
+            if self.profiler is not None:
+                self.profiler.measure_environment(env)
+        finally:
+            if rng_state is not None:
+                np.random.set_state(rng_state)
         
         # Зібрати fitness
         fitnesses = [snake.get_fitness() for snake in env.snakes]
         
         # Зібрати додаткову статистику (поточна довжина, а не максимальна)
-        max_length = max(len(snake.body) for snake in env.snakes)
-        max_food = max(snake.food_eaten for snake in env.snakes)
+        # лише по змійках популяції
+        population_snakes = env.snakes[:len(self.population)]
+        max_length = max(len(snake.body) for snake in population_snakes)
+        max_food = max(snake.food_eaten for snake in population_snakes)
         
-        return fitnesses, max_length, max_food
+        behaviours = np.array([snake.get_behaviour(env.width) for snake in env.snakes])
+        
+        return fitnesses, max_length, max_food, behaviours
     
     def tournament_selection(self, fitnesses):
         """
@@ -101,44 +176,52 @@ class GeneticAlgorithm:
     
     def evolve(self):
         """Виконати один цикл еволюції"""
-        # Оцінити популяцію (всі 16 змійок одночасно)
-        fitnesses, max_length, max_food = self.evaluate_population()
+        start = time.perf_counter()
         
-        # Зібрати статистику
-        max_fitness = max(fitnesses)
-        avg_fitness = np.mean(fitnesses)
+        # Періодично переоцінювати архів найкращих на тій самій арені
+        hof = self.hall_of_fame
+        hof_genomes = []
+        if hof is not None and hof.size > 0 and self.generation % HOF_REEVAL_INTERVAL == 0:
+            hof_genomes = hof.genomes()
         
-        # Оновити найкращий геном
-        if max_fitness > self.best_fitness:
-            best_idx = np.argmax(fitnesses)
-            self.best_genome = Genome(self.population[best_idx].weights.copy())
-            self.best_fitness = max_fitness
+        # Оцінити популяцію (всі 16 змійок одночасно)
+        fitnesses, max_length, max_food = self.evaluate_population(hof_genomes)
         
-        # Зберегти статистику
-        stats = {
-            'generation': self.generation,
-            'max_fitness': max_fitness,
-            'avg_fitness': avg_fitness,
-            'best_overall_fitness': self.best_fitness,
-            'max_length': max_length,
-            'max_food': max_food
-        }
-        self.stats_history.append(stats)
+        if hof is not None:
+            if hof_genomes:
+                hof.record_evaluation(fitnesses[len(self.population):], self.generation)
+                fitnesses = fitnesses[:len(self.population)]
+            hof.update(self.population, fitnesses, self.generation)
+        
+        stats = self._record_stats(fitnesses, max_length, max_food)
+        self._archive_generation(fitnesses)
         
         # НОВА ЛОГІКА: Відібрати 8 найкращих
         sorted_indices = np.argsort(fitnesses)[::-1]  # Від найкращих до найгірших
         survivors_indices = sorted_indices[:SURVIVORS]  # Топ-8
+        elite_indices = sorted_indices[:ELITE_SIZE]
+        
+        # Пошук новизни: батьків обираємо за поєднанням fitness і новизни,
+        # еліта лишається за чистим fitness
+        if self.novelty_weight > 0:
+            novelty = self._score_novelty()
+            stats['avg_novelty'] = float(np.mean(novelty))
+            selection_score = combine_ranks(fitnesses, novelty, self.novelty_weight)
+            survivors_indices = np.argsort(selection_score)[::-1][:SURVIVORS]
         
         # Створити нову популяцію з 16 особин
         new_population = []
+        parent_indices = []
         
         # 1. Еліта: топ-2 переходять без змін
-        for i in range(ELITE_SIZE):
-            elite_genome = Genome(self.population[survivors_indices[i]].weights.copy())
+        for i in elite_indices:
+            elite = self.population[i]
+            elite_genome = Genome(elite.weights.copy(), elite.policy_name)
             new_population.append(elite_genome)
+            parent_indices.append((i, i))
         
         # 2. Решта 14 особин - схрещування та мутація з 8 виживших
-        while len(new_population) < POPULATION_SIZE:
+        while len(new_population) < self.population_size:
             # Вибрати двох батьків випадково з виживших (топ-8)
             parent1_idx = np.random.choice(survivors_indices)
             parent2_idx = np.random.choice(survivors_indices)
@@ -149,13 +232,83 @@ class GeneticAlgorithm:
             )
             
             # Мутація
-            child.mutate(MUTATION_RATE, MUTATION_SIGMA)
+            child.mutate(self.mutation_rate, self.mutation_sigma)
             
             new_population.append(child)
+            parent_indices.append((parent1_idx, parent2_idx))
         
         # Оновити популяцію
         self.population = new_population
+        self.parent_indices = np.array(parent_indices, dtype=int)
         self.generation += 1
+        self.timings['generation'] = time.perf_counter() - start
+    
+    def _archive_generation(self, fitnesses):
+        """
+        Записати оцінене покоління в архів популяцій (якщо він підключений)
+        
+        Args:
+            fitnesses: fitness кожної особини популяції
+        """
+        if self.archive is not None:
+            self.archive.append(self.generation, self.population, fitnesses, self.parent_indices)
+    
+    def _record_stats(self, fitnesses, max_length, max_food):
+        """
+        Оновити найкращий геном та зберегти статистику покоління
+        
+        Args:
+            fitnesses: fitness кожного генома популяції
+            max_length: максимальна довжина змійки
+            max_food: максимум з'їденої їжі
+        
+        Returns:
+            dict: статистика покоління (також додається до stats_history)
+        """
+        # Зібрати статистику
+        max_fitness = max(fitnesses)
+        avg_fitness = np.mean(fitnesses)
+        
+        # Оновити найкращий геном
+        if max_fitness > self.best_fitness:
+            best_idx = np.argmax(fitnesses)
+            best = self.population[best_idx]
+            self.best_genome = Genome(best.weights.copy(), best.policy_name)
+            self.best_fitness = max_fitness
+        
+        # Зберегти статистику
+        stats = {
+            'generation': self.generation,
+            'max_fitness': max_fitness,
+            'avg_fitness': avg_fitness,
+            'best_overall_fitness': self.best_fitness,
+            'max_length': max_length,
+            'max_food': max_food
+        }
+        if self.hall_of_fame is not None:
+            stats['hof_best_fitness'] = self.hall_of_fame.best_fitness()
+        self.stats_history.append(stats)
+        
+        return stats
+    
+    def _score_novelty(self):
+        """
+        Оцінити новизну поточної популяції та поповнити архів поведінок
+        
+        Returns:
+            numpy array: новизна кожної особини популяції
+        """
+        descriptors = self.behaviours[:len(self.population)]
+        
+        if self.novelty_archive is None:
+            self.novelty_archive = NoveltyArchive(
+                descriptors.shape[1], k=NOVELTY_K,
+                capacity=NOVELTY_ARCHIVE_SIZE, add_per_generation=NOVELTY_ADD_PER_GEN
+            )
+        
+        novelty = self.novelty_archive.score(descriptors)
+        self.novelty_archive.add(descriptors, novelty)
+        return novelty
     
     def save_population(self, filename):
         """
@@ -189,5 +342,6 @@ class GeneticAlgorithm:
         # Відновити геноми
         self.population = [Genome.from_flat(flat) for flat in flat_genomes]
         self.population_size = len(self.population)
+        self.parent_indices = np.full((self.population_size, 2), -1, dtype=int)
         
         print(f"✓ Популяцію завантажено з {filename} ({self.population_size} геномів)")
\ No newline at end of file
@@ -1,58 +1,41 @@
 # genome.py - Геном змійки
 
 import numpy as np
-from config import WEIGHT_RANGE, VISION_RADIUS
+from config import WEIGHT_RANGE
+from policy import get_policy
 
 
 class Genome:
     """
     Клас що представляє геном змійки - набір ваг для прийняття рішень
     
-    Структура ваг: (120, 2, 4)
+    Форма ваг визначається політикою (див. policy.py). Для лінійної
+    політики за замовчуванням структура ваг: (120, 2, 4)
     - 120 позицій в полі огляду (11x11 - 1 центральна клітинка)
     - 2 типи датчиків: 0=їжа, 1=перешкода
     - 4 напрямки: 0=вгору, 1=вправо, 2=вниз, 3=вліво
     """
     
-    def __init__(self, weights=None):
+    def __init__(self, weights=None, policy=None):
         """
         Ініціалізація генома
         
         Args:
-            weights: numpy array (120, 2, 4) або None для випадкової ініціалізації
+            weights: numpy array у формі ваг політики або None для випадкової ініціалізації
+            policy: назва політики ('linear', 'mlp'; None - config.POLICY)
         """
+        self.policy_name = get_policy(policy).name
+        
         if weights is None:
-            # Ініціалізувати випадково цілими числами з {-1, 0, 1}
-            vision_size = (VISION_RADIUS * 2 + 1) ** 2 - 1  # 11*11 - 1 = 120
-            self.weights = np.random.randint(-1, 2, size=(vision_size, 2, 4))
-            
-            # Додати від'ємні ваги для сусідніх перешкод
-            self._add_obstacle_penalties()
+            # Випадкові ваги (для лінійної політики - з вбудованими штрафами за перешкоди)
+            self.weights = self.policy.init_weights()
         else:
             self.weights = weights.copy()
     
-    def _add_obstacle_penalties(self):
-        """
-        Додає від'ємні ваги для напрямків, що ведуть до перешкод у сусідніх клітинках
-        Використовує прямі формули для обчислення індексів
-        """
-        r = VISION_RADIUS  # 5
-        size = 2 * r + 1   # 11
-        
-        # Обчислити індекси сусідніх клітинок за формулами
-        top_index = (r - 1) * size + (r + 1) - 1
-        left_index = r * size + r - 1
-        right_index = r * size + r
-        bottom_index = (r + 1) * size + (r + 1) - 1 - 1
-        
-        # Відповідність індексів напрямкам:
-        # 0: вгору, 1: вправо, 2: вниз, 3: вліво
-        direction_indices = [top_index, right_index, bottom_index, left_index]
-        
-        # Для кожного напрямку встановити вагу -5 для датчика перешкод (індекс 1)
-        for direction, neighbor_idx in enumerate(direction_indices):
-            if neighbor_idx < len(self.weights):
-                self.weights[neighbor_idx, 1, direction] = -7
+    @property
+    def policy(self):
+        """Об'єкт політики, що інтерпретує ваги цього генома"""
+        return get_policy(self.policy_name)
     
     def mutate(self, mutation_rate, sigma):
         """
@@ -92,7 +75,7 @@ class Genome:
         # Округлити до цілих чисел
         new_weights = np.round(new_weights).astype(int)
         
-        return Genome(new_weights)
+        return Genome(new_weights, self.policy_name)
     
     def to_flat(self):
         """
@@ -104,16 +87,16 @@ class Genome:
         return self.weights.flatten()
     
     @staticmethod
-    def from_flat(flat_array):
+    def from_flat(flat_array, policy=None):
         """
         Відновлює геном з одновимірного масиву
         
         Args:
-            flat_array: numpy array з 960 елементами
+            flat_array: numpy array з усіма вагами (960 для лінійної політики)
+            policy: назва політики (None - config.POLICY)
         
         Returns:
             Новий об'єкт Genome
         """
-        vision_size = (VISION_RADIUS * 2 + 1) ** 2 - 1  # 120
-        weights = flat_array.reshape((vision_size, 2, 4))
-        return Genome(weights)
\ No newline at end of file
+        weights = flat_array.reshape(get_policy(policy).weights_shape())
+        return Genome(weights, policy)
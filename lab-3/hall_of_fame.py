@@ -0,0 +1,130 @@
+# hall_of_fame.py - Архів найкращих геномів
+
+import numpy as np
+from genome import Genome
+
+
+class HallOfFame:
+    """
+    Обмежений архів найкращих геномів за всю історію тренування
+
+    Ваги всіх записів зберігаються в одному суцільному масиві
+    (capacity, genome_size), а для кожного запису накопичується історія
+    fitness (сума та кількість оцінок), тому рейтинг будується за
+    середнім значенням, а не за одним вдалим запуском.
+    """
+
+    def __init__(self, capacity, genome_size):
+        """
+        Ініціалізація архіву
+
+        Args:
+            capacity: максимальна кількість записів
+            genome_size: кількість ваг у геномі
+        """
+        self.capacity = capacity
+        self.weights = np.zeros((capacity, genome_size), dtype=int)
+        self.fitness_sum = np.zeros(capacity)
+        self.eval_count = np.zeros(capacity, dtype=int)
+        self.last_fitness = np.zeros(capacity)
+        self.added_generation = np.zeros(capacity, dtype=int)
+        self.size = 0
+        self.policy_name = None
+        self.history = []  # (покоління, найкращий середній fitness, середній по архіву)
+
+        # Швидкий пошук дублікатів: байти ваг -> індекс запису
+        self._index = {}
+
+    def mean_fitness(self):
+        """
+        Returns:
+            numpy array: середній fitness кожного запису
+        """
+        return self.fitness_sum[:self.size] / np.maximum(self.eval_count[:self.size], 1)
+
+    def update(self, population, fitnesses, generation):
+        """
+        Додати кращих особин покоління до архіву
+
+        Якщо геном уже є в архіві (наприклад, еліта), його fitness
+        додається як ще одна оцінка замість створення дубліката.
+
+        Args:
+            population: список об'єктів Genome
+            fitnesses: fitness кожного генома
+            generation: номер покоління
+        """
+        order = np.argsort(fitnesses)[::-1][:self.capacity]
+        self.policy_name = population[0].policy_name
+
+        for idx in order:
+            flat = population[idx].to_flat()
+            key = flat.tobytes()
+            fitness = fitnesses[idx]
+
+            slot = self._index.get(key)
+            if slot is not None:
+                self._record(slot, fitness)
+                continue
+
+            if self.size < self.capacity:
+                slot = self.size
+                self.size += 1
+            else:
+                means = self.mean_fitness()
+                slot = int(np.argmin(means))
+                if fitness <= means[slot]:
+                    # Кандидати відсортовані - решта ще гірші
+                    break
+                del self._index[self.weights[slot].tobytes()]
+
+            self.weights[slot] = flat
+            self.fitness_sum[slot] = 0
+            self.eval_count[slot] = 0
+            self.added_generation[slot] = generation
+            self._index[key] = slot
+            self._record(slot, fitness)
+
+    def record_evaluation(self, fitnesses, generation):
+        """
+        Записати результати пакетної переоцінки всього архіву
+
+        Args:
+            fitnesses: fitness кожного запису (в порядку genomes())
+            generation: номер покоління
+        """
+        for slot, fitness in enumerate(fitnesses[:self.size]):
+            self._record(slot, fitness)
+
+        means = self.mean_fitness()
+        self.history.append((generation, float(means.max()), float(means.mean())))
+
+    def _record(self, slot, fitness):
+        self.fitness_sum[slot] += fitness
+        self.eval_count[slot] += 1
+        self.last_fitness[slot] = fitness
+
+    def genomes(self):
+        """
+        Returns:
+            list: геноми архіву (в порядку записів)
+        """
+        return [Genome.from_flat(row, self.policy_name) for row in self.weights[:self.size]]
+
+    def best_genome(self):
+        """
+        Returns:
+            Genome або None: геном з найкращим середнім fitness
+        """
+        if self.size == 0:
+            return None
+        return Genome.from_flat(self.weights[int(np.argmax(self.mean_fitness()))], self.policy_name)
+
+    def best_fitness(self):
+        """
+        Returns:
+            float: найкращий середній fitness в архіві
+        """
+        if self.size == 0:
+            return 0.0
+        return float(self.mean_fitness().max())
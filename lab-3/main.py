@@ -2,11 +2,21 @@
 
 import numpy as np
 import os
-from config import GRID_SIZE, POPULATION_SIZE, FOOD_COUNT, MAX_STEPS
+from config import (
+    GRID_SIZE, POPULATION_SIZE, FOOD_COUNT, MAX_STEPS, POPULATION_ARCHIVE,
+    CHECKPOINT_INTERVAL, STATS_FLUSH_INTERVAL, MONITOR_PORT, MEMORY_PROFILE
+)
 from genome import Genome
 from snake import Snake
 from environment import Environment
 from genetic_algorithm import GeneticAlgorithm
+from evolution_strategy import EvolutionStrategy
+from scenarios import generate_scenario
+from archive import PopulationArchive
+from writer import BackgroundWriter
+from monitor import TrainingMonitor
+from profiling import MemoryProfiler
+from convergence import ConvergenceMonitor
 from visualizer import Visualizer
 
 
@@ -21,29 +31,9 @@ def create_population_environment(ga, food_count=FOOD_COUNT):
     Returns:
         Environment: середовище з популяцією
     """
-    env = Environment(GRID_SIZE, GRID_SIZE)
-    
-    # Розмістити змійки рівномірно по полю
-    grid_positions = []
-    grid_step = (GRID_SIZE - 4) // int(np.sqrt(ga.population_size))
-    
-    for i in range(int(np.sqrt(ga.population_size)) + 1):
-        for j in range(int(np.sqrt(ga.population_size)) + 1):
-            if len(grid_positions) < ga.population_size:
-                x = 2 + j * grid_step + np.random.randint(-2, 3)
-                y = 2 + i * grid_step + np.random.randint(-2, 3)
-                x = max(2, min(GRID_SIZE - 3, x))
-                y = max(2, min(GRID_SIZE - 3, y))
-                grid_positions.append((x, y))
-    
-    # Додати всіх змійок
-    for i, genome in enumerate(ga.population):
-        x, y = grid_positions[i]
-        snake = Snake(x, y, genome, snake_id=i + 1)
-        env.add_snake(snake)
-    
-    # Додати їжу
-    env.spawn_food(food_count)
+    # Розмістити змійки рівномірно по полю та додати їжу
+    scenario = generate_scenario(ga.population_size, food_count)
+    env = scenario.build_environment(ga.population)
     
     return env
 
@@ -149,42 +139,89 @@ def run_training_visualized(generations=10):
     return ga
 
 
-def run_training_headless(generations=100, save_stats=True):
+def run_training_headless(generations=100, save_stats=True, optimizer='ga', target_fitness=None,
+                          archive=POPULATION_ARCHIVE, profile_memory=MEMORY_PROFILE):
     """
     Швидке тренування без візуалізації
+    
+    Args:
+        generations: кількість поколінь
+        save_stats: зберігати статистику в CSV
+        optimizer: 'ga' - генетичний алгоритм, 'es' - еволюційна стратегія
+        target_fitness: зупинитись, щойно найкращий fitness досягне цього значення
+        archive: записувати кожне покоління в архів популяцій (data/archive)
+        profile_memory: записувати профіль пам'яті кожного покоління (data/profiles)
     """
+    import time
+    import datetime
+    
     print("=" * 50)
     print("ШВИДКЕ ТРЕНУВАННЯ (БЕЗ ВІЗУАЛІЗАЦІЇ)")
     print("=" * 50)
     
-    ga = GeneticAlgorithm(population_size=POPULATION_SIZE)
+    if optimizer == 'es':
+        ga = EvolutionStrategy(population_size=POPULATION_SIZE)
+    else:
+        ga = GeneticAlgorithm(population_size=POPULATION_SIZE)
     
     print(f"✓ Початок тренування {generations} поколінь")
     print(f"  Популяція: {POPULATION_SIZE} змійок одночасно")
     print(f"  Їжі на полі: {FOOD_COUNT}")
     print(f"  Виживають найкращі {POPULATION_SIZE // 2}\n")
     
-    # Підготувати CSV файл для статистики
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    
+    # Архів усіх поколінь для офлайн-аналізу
+    if archive:
+        archive_path = f"data/archive/run_{timestamp}"
+        ga.archive = PopulationArchive(archive_path, ga.population[0].weights.size,
+                                       len(ga.population), ga.population[0].policy_name)
+        print(f"✓ Архів поколінь: {archive_path}\n")
+    
+    # Статистика та контрольні точки пишуться у фоновому потоці
+    stats_filename = None
+    header = [
+        'Generation', 'Max_Fitness', 'Avg_Fitness', 
+        'Best_Overall_Fitness', 'Max_Length', 'Max_Food'
+    ]
+    if ga.hall_of_fame is not None:
+        header.append('HoF_Best_Fitness')
+    header.append('Wall_Time')
     if save_stats:
-        import csv
-        import datetime
-        
-        os.makedirs("data/stats", exist_ok=True)
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         stats_filename = f"data/stats/training_{timestamp}.csv"
-        
-        stats_file = open(stats_filename, 'w', newline='')
-        stats_writer = csv.writer(stats_file)
-        stats_writer.writerow([
-            'Generation', 'Max_Fitness', 'Avg_Fitness', 
-            'Best_Overall_Fitness', 'Max_Length', 'Max_Food'
-        ])
+    writer = BackgroundWriter(stats_filename, header, flush_interval=STATS_FLUSH_INTERVAL)
+    checkpoint_filename = f"data/populations/checkpoint_{timestamp}.csv"
+    
+    # Профіль пам'яті (tracemalloc, RSS, розміри структур)
+    profiler = None
+    if profile_memory:
+        profiler = MemoryProfiler(f"data/profiles/memory_{timestamp}.jsonl")
+        ga.profiler = profiler
+        print(f"✓ Профіль пам'яті: {profiler.filename}\n")
+    
+    # Монітор для віддалених запусків (GET /status, /stats, POST /snapshot)
+    monitor = None
+    if MONITOR_PORT:
+        monitor = TrainingMonitor(port=MONITOR_PORT)
+        print(f"✓ Монітор тренування: {monitor.start()}/status\n")
+    
+    # Плато та рання зупинка (generations - верхня межа бюджету)
+    convergence = ConvergenceMonitor()
+    
+    start_time = time.perf_counter()
+    target_time = None
+    completed = False
     
     try:
         for gen in range(generations):
             ga.evolve()
             
             stats = ga.stats_history[-1]
+            elapsed = time.perf_counter() - start_time
+            if monitor is not None:
+                monitor.publish(ga)
+            if profiler is not None:
+                profiler.record(ga)
             
             # Виводити кожне покоління
             print(f"Gen {stats['generation']:3d} | "
@@ -196,28 +233,75 @@ def run_training_headless(generations=100, save_stats=True):
             
             # Записати статистику в CSV
             if save_stats:
-                stats_writer.writerow([
+                row = [
                     stats['generation'],
                     stats['max_fitness'],
                     stats['avg_fitness'],
                     stats['best_overall_fitness'],
                     stats['max_length'],
                     stats['max_food']
-                ])
+                ]
+                if ga.hall_of_fame is not None:
+                    row.append(stats['hof_best_fitness'])
+                row.append(round(elapsed, 3))
+                writer.write_stats(row)
             
             # Зберегти кожні 50 поколінь
             if (gen + 1) % 50 == 0:
-                os.makedirs("data/populations", exist_ok=True)
-                filename = f"data/populations/gen_{gen + 1}.csv"
-                ga.save_population(filename)
+                writer.save_population(ga.population, f"data/populations/gen_{gen + 1}.csv")
+            
+            # Контрольна точка (остання популяція, замінюється атомарно)
+            if CHECKPOINT_INTERVAL and (gen + 1) % CHECKPOINT_INTERVAL == 0:
+                writer.save_population(ga.population, checkpoint_filename)
+            
+            # Плато: посилення мутації або зупинка, коли тренування більше не окупається
+            if convergence.enabled:
+                events = len(convergence.events)
+                keep_going = convergence.update(ga)
+                for event_gen, event in convergence.events[events:]:
+                    print(f"  ⚠ Покоління {event_gen}: {event}")
+                if not keep_going:
+                    print(f"\n✓ Рання зупинка на поколінні {stats['generation']}")
+                    break
+            
+            # Час до цільового fitness (для порівняння оптимізаторів)
+            if target_fitness is not None and stats['best_overall_fitness'] >= target_fitness:
+                target_time = elapsed
+                print(f"\n✓ Ціль {target_fitness:.0f} досягнута за {elapsed:.1f}s "
+                      f"(покоління {stats['generation']})")
+                break
+        
+        completed = True
     
     finally:
-        if save_stats:
-            stats_file.close()
-            print(f"\n✓ Статистика збережена в {stats_filename}")
+        try:
+            if monitor is not None:
+                monitor.stop()
+            if profiler is not None:
+                profiler.close()
+            if ga.archive is not None:
+                ga.archive.close()
+                print(f"✓ Архів: {len(ga.archive)} поколінь")
+        finally:
+            # Запис закривається останнім: його помилка не скасовує інших прибирань
+            try:
+                writer.close()
+            except RuntimeError as error:
+                if completed:
+                    raise
+                # Не підміняти виняток, що вже перервав тренування
+                print(f"\n⚠ {error}: {error.__cause__}")
+            else:
+                if save_stats:
+                    print(f"\n✓ Статистика збережена в {stats_filename}")
+                if CHECKPOINT_INTERVAL:
+                    print(f"✓ Контрольна точка: {checkpoint_filename}")
     
     print(f"\n✓ Тренування завершено!")
     print(f"  Найкращий fitness: {ga.best_fitness:.0f}")
+    print(f"  Час: {time.perf_counter() - start_time:.1f}s")
+    if target_fitness is not None and target_time is None:
+        print(f"  Ціль {target_fitness:.0f} не досягнута")
     
     return ga
 
@@ -397,6 +481,7 @@ def main_menu():
     print("  3. Переглянути найкращу змійку")
     print("  4. Завантажити популяцію і продовжити тренування")
     print("  5. Тест системи (базові тести)")
+    print("  6. Пошук гіперпараметрів (паралельно)")
     print("  0. Вихід")
     
     choice = input("\nВаш вибір: ").strip()
@@ -426,7 +511,12 @@ def main_menu():
         save_csv = input("Зберігати статистику в CSV? (y/n, default=y): ").strip().lower()
         save_csv = save_csv != 'n'
         
-        ga = run_training_headless(gens, save_stats=save_csv)
+        optimizer = input("Оптимізатор (ga/es, default=ga): ").strip().lower() or 'ga'
+        target = input("Цільовий fitness (Enter - без цілі): ").strip()
+        target = float(target) if target else None
+        
+        ga = run_training_headless(gens, save_stats=save_csv,
+                                   optimizer=optimizer, target_fitness=target)
         
         # Автоматично зберегти популяцію
         os.makedirs("data/populations", exist_ok=True)
@@ -477,6 +567,23 @@ def main_menu():
         from test_basic import run_all_tests
         run_all_tests()
     
+    elif choice == "6":
+        # Пошук гіперпараметрів
+        from sweep import run_sweep, DEFAULT_SWEEP_SPEC
+
+        mode = input("Режим (grid/random, default=grid): ").strip().lower() or 'grid'
+        gens = input("Поколінь на конфігурацію (default=5): ").strip()
+        gens = int(gens) if gens else 5
+        workers = input("Кількість процесів (default=всі ядра): ").strip()
+        workers = int(workers) if workers else None
+
+        results = run_sweep(DEFAULT_SWEEP_SPEC, mode=mode, generations=gens, workers=workers)
+
+        print("\nНайефективніші конфігурації:")
+        for r in results[:5]:
+            print(f"  {r['config']} | Best: {r['best_fitness']:.0f} | "
+                  f"{r['fitness_per_second']:.1f} fitness/с")
+
     elif choice == "0":
         print("\nДо побачення!")
         return False
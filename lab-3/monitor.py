@@ -0,0 +1,211 @@
+# monitor.py - HTTP/JSON монітор тренування
+
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import numpy as np
+from writer import atomic_write
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def memory_usage():
+    """
+    Використання пам'яті процесом
+
+    Returns:
+        dict: поточний та пиковий RSS у мегабайтах (None, якщо невідомо)
+    """
+    current = None
+    try:
+        with open('/proc/self/statm') as f:
+            current = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    peak = None
+    if resource is not None:
+        # Linux повертає кілобайти
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    return {'rss_mb': current, 'peak_rss_mb': peak}
+
+
+def to_json(value):
+    """Перетворити типи numpy на звичайні типи Python"""
+    if isinstance(value, dict):
+        return {key: to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json(item) for item in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+class TrainingMonitor:
+    """
+    Легкий локальний HTTP-сервер зі станом тренування у форматі JSON
+
+    Потік тренування раз на покоління викликає publish(), який складає
+    невеликий словник стану та атомарно підміняє посилання на нього.
+    Сервер працює у фоновому потоці й лише читає останній опублікований
+    стан, тому опитування не блокує і не сповільнює тренування.
+
+    Маршрути:
+        GET  /status         - покоління, fitness, кроки/с, час фаз, пам'ять
+        GET  /stats?n=50     - останні n записів stats_history
+        POST /snapshot       - зберегти найкращий геном у CSV
+    """
+
+    def __init__(self, host='127.0.0.1', port=8765, history=50, snapshot_dir="data/snapshots"):
+        """
+        Ініціалізація монітора (сервер запускається методом start)
+
+        Args:
+            host: адреса (за замовчуванням лише локальна)
+            port: порт (0 - вибрати вільний)
+            history: скільки останніх записів статистики зберігати
+            snapshot_dir: папка для знімків найкращого генома
+        """
+        self.host = host
+        self.port = port
+        self.history = history
+        self.snapshot_dir = snapshot_dir
+        self.started = time.time()
+
+        self._state = {'generation': None}
+        self._stats = []
+        self._best_genome = None
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        """
+        Запустити сервер у фоновому потоці
+
+        Returns:
+            str: адреса монітора
+        """
+        monitor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                monitor._handle(self, 'GET')
+
+            def do_POST(self):
+                monitor._handle(self, 'POST')
+
+            def log_message(self, format, *args):
+                pass  # Не засмічувати stdout тренування
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="training-monitor", daemon=True)
+        self._thread.start()
+        return self.url
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def stop(self):
+        """Зупинити сервер"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def publish(self, ga):
+        """
+        Опублікувати стан після покоління (викликається з потоку тренування)
+
+        Args:
+            ga: GeneticAlgorithm або EvolutionStrategy
+        """
+        timings = dict(ga.timings)
+        evaluate = timings.get('evaluate')
+        steps_per_second = None
+        if evaluate:
+            steps_per_second = timings.get('steps', 0) / evaluate
+            timings['selection'] = max(timings.get('generation', evaluate) - evaluate, 0.0)
+
+        if ga.stats_history:
+            self._stats = (self._stats + [to_json(ga.stats_history[-1])])[-self.history:]
+
+        # Нові об'єкти замість змін на місці - сервер бачить або старий, або новий стан
+        self._best_genome = ga.best_genome
+        self._state = to_json({
+            'generation': ga.generation,
+            'best_fitness': ga.best_fitness if ga.best_genome is not None else None,
+            'population_size': len(ga.population),
+            'steps_per_second': steps_per_second,
+            'population_steps_per_second': None if steps_per_second is None
+                                           else steps_per_second * len(ga.population),
+            'timings': timings,
+            'updated': time.time(),
+        })
+
+    def status(self):
+        """
+        Returns:
+            dict: останній опублікований стан з пам'яттю та часом роботи
+        """
+        state = dict(self._state)
+        state['last_stats'] = self._stats[-1] if self._stats else None
+        state['memory'] = memory_usage()
+        state['uptime'] = time.time() - self.started
+        return state
+
+    def snapshot_best(self):
+        """
+        Зберегти найкращий геном у CSV (у потоці сервера)
+
+        Returns:
+            str або None: шлях до файлу
+        """
+        genome = self._best_genome
+        if genome is None:
+            return None
+
+        generation = self._state.get('generation')
+        filename = os.path.join(self.snapshot_dir, f"best_gen_{generation}.csv")
+        flat = genome.to_flat().reshape(1, -1)
+        atomic_write(filename, lambda f: np.savetxt(f, flat, delimiter=',', fmt='%d'))
+        return filename
+
+    def _handle(self, request, method):
+        """Обробити запит"""
+        url = urlparse(request.path)
+
+        if method == 'GET' and url.path in ('/', '/status'):
+            code, body = 200, self.status()
+        elif method == 'GET' and url.path == '/stats':
+            try:
+                n = int(parse_qs(url.query).get('n', [self.history])[0])
+            except ValueError:
+                n = self.history
+            code, body = 200, {'stats': self._stats[-n:] if n > 0 else []}
+        elif method == 'POST' and url.path == '/snapshot':
+            filename = self.snapshot_best()
+            if filename is None:
+                code, body = 409, {'error': 'Найкращого генома ще немає'}
+            else:
+                code, body = 200, {'filename': filename}
+        else:
+            code, body = 404, {'error': f'Невідомий маршрут: {method} {url.path}'}
+
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        request.send_response(code)
+        request.send_header('Content-Type', 'application/json; charset=utf-8')
+        request.send_header('Content-Length', str(len(data)))
+        request.end_headers()
+        request.wfile.write(data)
@@ -0,0 +1,115 @@
+# novelty.py - Пошук новизни (novelty search)
+
+import numpy as np
+
+
+class NoveltyArchive:
+    """
+    Архів поведінок для оцінки новизни
+
+    Кожна змійка описується вектором поведінки (дескриптором), а її
+    новизна - це середня відстань до k найближчих сусідів серед архіву
+    та поточного покоління. Архів зберігається як одна матриця numpy,
+    відстані рахуються пакетно блоками, тому пам'ять обмежена навіть
+    для десятків тисяч записів.
+    """
+
+    def __init__(self, dim, k=15, capacity=50000, add_per_generation=4, block_size=8192):
+        """
+        Ініціалізація архіву
+
+        Args:
+            dim: розмірність дескриптора поведінки
+            k: кількість найближчих сусідів
+            capacity: максимальна кількість записів
+            add_per_generation: скільки найновіших поведінок додавати за покоління
+            block_size: розмір блоку архіву для пакетного обчислення відстаней
+        """
+        self.k = k
+        self.capacity = capacity
+        self.add_per_generation = add_per_generation
+        self.block_size = block_size
+        self.data = np.zeros((capacity, dim))
+        self.sq_norms = np.zeros(capacity)
+        self.size = 0
+        self.total_added = 0
+
+    def score(self, descriptors):
+        """
+        Обчислити новизну для покоління
+
+        Args:
+            descriptors: numpy array (N, dim) з дескрипторами покоління
+
+        Returns:
+            numpy array (N,): новизна кожної особини
+        """
+        descriptors = np.asarray(descriptors, dtype=float)
+        n = len(descriptors)
+        k = min(self.k, self.size + n - 1)
+        if k <= 0:
+            return np.zeros(n)
+
+        q_norms = np.einsum('ij,ij->i', descriptors, descriptors)
+
+        # Відстані всередині покоління (без відстані до самого себе)
+        d2 = q_norms[:, None] + q_norms[None, :] - 2 * descriptors @ descriptors.T
+        np.fill_diagonal(d2, np.inf)
+        nearest = self._smallest(d2, k)
+
+        # Відстані до архіву блоками, з оновленням k найкращих
+        for start in range(0, self.size, self.block_size):
+            end = min(start + self.block_size, self.size)
+            block = self.data[start:end]
+            d2 = q_norms[:, None] + self.sq_norms[None, start:end] - 2 * descriptors @ block.T
+            nearest = self._smallest(np.concatenate([nearest, d2], axis=1), k)
+
+        return np.sqrt(np.maximum(nearest, 0)).mean(axis=1)
+
+    @staticmethod
+    def _smallest(d2, k):
+        """k найменших значень у кожному рядку (без сортування)"""
+        if d2.shape[1] <= k:
+            return d2
+        return np.partition(d2, k - 1, axis=1)[:, :k]
+
+    def add(self, descriptors, novelty):
+        """
+        Додати найновіші поведінки покоління до архіву
+
+        Коли архів заповнений, нові записи замінюють випадкові старі.
+
+        Args:
+            descriptors: numpy array (N, dim)
+            novelty: новизна кожної особини
+        """
+        order = np.argsort(novelty)[::-1][:self.add_per_generation]
+
+        for idx in order:
+            if self.size < self.capacity:
+                slot = self.size
+                self.size += 1
+            else:
+                slot = np.random.randint(self.capacity)
+
+            self.data[slot] = descriptors[idx]
+            self.sq_norms[slot] = descriptors[idx] @ descriptors[idx]
+            self.total_added += 1
+
+
+def combine_ranks(fitnesses, novelty, novelty_weight):
+    """
+    Поєднати fitness і новизну через нормалізовані ранги
+
+    Args:
+        fitnesses: fitness кожної особини
+        novelty: новизна кожної особини
+        novelty_weight: вага новизни (0.0 - лише fitness, 1.0 - лише новизна)
+
+    Returns:
+        numpy array: оцінка для селекції (більше - краще)
+    """
+    n = len(fitnesses)
+    fitness_rank = np.argsort(np.argsort(fitnesses)) / max(n - 1, 1)
+    novelty_rank = np.argsort(np.argsort(novelty)) / max(n - 1, 1)
+    return (1 - novelty_weight) * fitness_rank + novelty_weight * novelty_rank
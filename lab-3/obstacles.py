@@ -0,0 +1,121 @@
+# obstacles.py - Карти перешкод (статичний шар поля)
+
+import functools
+
+import numpy as np
+import config
+
+
+def load_obstacle_map(filename, width, height):
+    """
+    Завантажити перешкоди з текстової карти
+
+    Кожен рядок файлу - рядок поля, символ '#' - перешкода, будь-який
+    інший - вільна клітинка. Карта прикладається до лівого верхнього кута;
+    те, що не вміщується в поле, відкидається.
+
+    Args:
+        filename: шлях до файлу карти
+        width: ширина поля
+        height: висота поля
+
+    Returns:
+        numpy array (height, width) bool
+    """
+    layer = np.zeros((height, width), dtype=bool)
+
+    with open(filename) as f:
+        for y, line in enumerate(f):
+            if y >= height:
+                break
+            for x, char in enumerate(line.rstrip('\n')[:width]):
+                if char == '#':
+                    layer[y, x] = True
+
+    return layer
+
+
+def generate_obstacles(width, height, density, seed=None):
+    """
+    Процедурно згенерувати внутрішні стіни
+
+    Додає випадкові горизонтальні та вертикальні відрізки довжиною 3-12
+    клітинок, поки частка зайнятих клітинок не досягне density.
+
+    Args:
+        width: ширина поля
+        height: висота поля
+        density: частка клітинок поля під перешкодами (0.0 - без перешкод)
+        seed: зерно генератора (карта не залежить від глобального генератора)
+
+    Returns:
+        numpy array (height, width) bool
+    """
+    layer = np.zeros((height, width), dtype=bool)
+    if density <= 0 or width < 5 or height < 5:
+        return layer
+
+    rng = np.random.default_rng(seed)
+    target = int(density * width * height)
+
+    for _ in range(target * 10):  # Обмеження для дуже великої щільності
+        if layer.sum() >= target:
+            break
+        length = int(rng.integers(3, 13))
+        x = int(rng.integers(2, width - 2))
+        y = int(rng.integers(2, height - 2))
+        if rng.random() < 0.5:
+            layer[y, x:min(x + length, width - 2)] = True
+        else:
+            layer[y:min(y + length, height - 2), x] = True
+
+    return layer
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_layer(width, height, obstacle_map, density, seed):
+    layer = np.zeros((height, width), dtype=bool)
+
+    # Бар'єр навколо поля
+    layer[0, :] = layer[-1, :] = True
+    layer[:, 0] = layer[:, -1] = True
+
+    if obstacle_map:
+        layer |= load_obstacle_map(obstacle_map, width, height)
+    if density > 0:
+        layer |= generate_obstacles(width, height, density, seed)
+
+    layer.setflags(write=False)
+    return layer
+
+
+def obstacle_layer(width, height, obstacle_map=None, density=None, seed=None):
+    """
+    Статичний шар перешкод: бар'єр, карта з файлу та процедурні стіни
+
+    Шар обчислюється один раз для кожного набору параметрів і
+    повертається лише для читання, тому всі середовища однакового розміру
+    спільно використовують один масив.
+
+    Args:
+        width: ширина поля
+        height: висота поля
+        obstacle_map: шлях до текстової карти (None - config.OBSTACLE_MAP)
+        density: щільність процедурних стін (None - config.OBSTACLE_DENSITY)
+        seed: зерно процедурних стін (None - config.OBSTACLE_SEED)
+
+    Returns:
+        numpy array (height, width) bool
+    """
+    obstacle_map = config.OBSTACLE_MAP if obstacle_map is None else obstacle_map
+    density = config.OBSTACLE_DENSITY if density is None else density
+    seed = config.OBSTACLE_SEED if seed is None else seed
+    return _cached_layer(width, height, obstacle_map, density, seed)
+
+
+def has_interior(layer):
+    """
+    Returns:
+        bool: чи є в шарі перешкоди всередині бар'єру
+    """
+    return bool(layer[1:-1, 1:-1].any())
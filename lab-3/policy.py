@@ -0,0 +1,261 @@
+# policy.py - Політики прийняття рішень (лінійна та MLP)
+
+import numpy as np
+import config
+
+
+def vision_keep_indices(radius):
+    """
+    Індекси клітинок огляду без центральної (голова змійки)
+
+    Args:
+        radius: радіус огляду
+
+    Returns:
+        numpy array: індекси у сплющеному полі (2r+1)^2
+    """
+    size = 2 * radius + 1
+    return np.delete(np.arange(size * size), radius * size + radius)
+
+
+def flatten_vision(vision):
+    """
+    Перетворити поле зору (S, S, 2) у вхід політики (V, 2) без центру
+
+    Args:
+        vision: numpy array (2r+1, 2r+1, 2)
+
+    Returns:
+        numpy array (V, 2), де V = (2r+1)^2 - 1
+    """
+    size = vision.shape[0]
+    keep = vision_keep_indices(size // 2)
+    return vision.reshape(size * size, 2)[keep]
+
+
+def sparse_row_sum(weights, features):
+    """
+    Сума рядків матриць ваг лише для увімкнених входів (розріджений шлях)
+
+    Вартість пропорційна кількості увімкнених входів, а не розміру огляду.
+
+    Args:
+        weights: numpy array (N, I, K) - матриця ваг кожної змійки
+        features: numpy array (N, I) bool - увімкнені входи
+
+    Returns:
+        numpy array (N, K)
+    """
+    n, inputs = features.shape
+    out = np.zeros((n, weights.shape[2]))
+    ids = np.flatnonzero(features)
+    if len(ids) == 0:
+        return out
+
+    # Індекси відсортовані, тож рядки кожної змійки йдуть суцільним відрізком
+    owners = ids // inputs
+    starts = np.flatnonzero(np.r_[True, owners[1:] != owners[:-1]])
+    out[owners[starts]] = np.add.reduceat(weights[owners, ids % inputs], starts, axis=0)
+    return out
+
+
+def use_sparse(features):
+    """
+    Чи вигідний розріджений шлях для цього пакета входів
+
+    Пакетне множення матриць у numpy швидше за вибірку рядків, доки
+    заповненість огляду не падає нижче config.SPARSE_OCCUPANCY.
+    """
+    return (features.dtype == bool
+            and np.count_nonzero(features) < config.SPARSE_OCCUPANCY * features.size)
+
+
+class Policy:
+    """
+    Базовий інтерфейс політики: відображає поле зору у чотири виходи
+    (вгору, вправо, вниз, вліво). Ваги зберігаються в геномі, а політика
+    лише знає їх форму та як обчислити виходи - одиночно або пакетно.
+    """
+
+    name = 'base'
+
+    def weights_shape(self):
+        """Форма масиву ваг генома"""
+        raise NotImplementedError
+
+    def init_weights(self):
+        """Випадкові початкові ваги"""
+        raise NotImplementedError
+
+    def forward(self, weights, vision):
+        """
+        Виходи для однієї змійки
+
+        Args:
+            weights: ваги генома
+            vision: numpy array (2r+1, 2r+1, 2)
+
+        Returns:
+            numpy array (4,)
+        """
+        inputs = flatten_vision(vision).reshape(1, -1).astype(float)
+        weights = np.asarray(weights, dtype=float).reshape(1, -1)
+        return self.forward_batch(weights, inputs)[0].copy()
+
+    def forward_batch(self, weights, inputs):
+        """
+        Виходи для багатьох змійок одразу
+
+        Args:
+            weights: numpy array (N, P) - сплющені ваги кожної змійки
+            inputs: numpy array (N, V*2) - сплющені входи без центру (bool або float)
+
+        Returns:
+            numpy array (N, 4) (може бути внутрішнім буфером політики)
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _buffer(buffers, key, shape):
+        """Перевикористати попередньо виділений буфер потрібного розміру"""
+        buf = buffers.get(key)
+        if buf is None or buf.shape[0] < shape[0] or buf.shape[1:] != shape[1:]:
+            buf = np.empty((max(shape[0], 1),) + shape[1:])
+            buffers[key] = buf
+        return buf[:shape[0]]
+
+    def _dense_inputs(self, inputs):
+        """Входи як float (копія у буфер, якщо передано bool)"""
+        if inputs.dtype == float:
+            return inputs
+        dense = self._buffer(self._buffers, 'inputs', inputs.shape)
+        np.copyto(dense, inputs)
+        return dense
+
+
+class LinearPolicy(Policy):
+    """
+    Пряме відображення: сума ваг для кожної зайнятої клітинки огляду
+    Ваги (V, 2, 4): позиція, тип датчика (їжа/перешкода), напрямок
+    """
+
+    name = 'linear'
+
+    def __init__(self):
+        self._buffers = {}
+
+    def weights_shape(self):
+        vision_size = (config.VISION_RADIUS * 2 + 1) ** 2 - 1  # 11*11 - 1 = 120
+        return (vision_size, 2, 4)
+
+    def init_weights(self):
+        # Ініціалізувати випадково цілими числами з {-1, 0, 1}
+        weights = np.random.randint(-1, 2, size=self.weights_shape())
+
+        # Додати від'ємні ваги для сусідніх перешкод
+        self._add_obstacle_penalties(weights)
+        return weights
+
+    @staticmethod
+    def _add_obstacle_penalties(weights):
+        """
+        Додає від'ємні ваги для напрямків, що ведуть до перешкод у сусідніх клітинках
+        Використовує прямі формули для обчислення індексів
+        """
+        r = config.VISION_RADIUS  # 5
+        size = 2 * r + 1   # 11
+
+        # Обчислити індекси сусідніх клітинок за формулами
+        top_index = (r - 1) * size + (r + 1) - 1
+        left_index = r * size + r - 1
+        right_index = r * size + r
+        bottom_index = (r + 1) * size + (r + 1) - 1 - 1
+
+        # Відповідність індексів напрямкам:
+        # 0: вгору, 1: вправо, 2: вниз, 3: вліво
+        direction_indices = [top_index, right_index, bottom_index, left_index]
+
+        # Для кожного напрямку встановити вагу -7 для датчика перешкод (індекс 1)
+        for direction, neighbor_idx in enumerate(direction_indices):
+            if neighbor_idx < len(weights):
+                weights[neighbor_idx, 1, direction] = -7
+
+    def forward_batch(self, weights, inputs):
+        n = inputs.shape[0]
+        if use_sparse(inputs):
+            return sparse_row_sum(weights.reshape(n, -1, 4), inputs)
+
+        out = self._buffer(self._buffers, 'out', (n, 4))
+        np.matmul(self._dense_inputs(inputs)[:, None, :], weights.reshape(n, -1, 4),
+                  out=out[:, None, :])
+        return out
+
+
+class MLPPolicy(Policy):
+    """
+    Невелика нейромережа: вхід (V*2) -> прихований шар ReLU -> 4 виходи
+    Ваги генома - сплющені матриці W1 (V*2, H) та W2 (H, 4)
+    Зсувів немає: ReLU додатно однорідна, тому масштаб цілих ваг не важливий.
+    """
+
+    name = 'mlp'
+
+    def __init__(self, hidden=None):
+        self._hidden = hidden
+        self._buffers = {}
+
+    @property
+    def hidden(self):
+        """Розмір прихованого шару (None у конструкторі - config.MLP_HIDDEN)"""
+        return self._hidden or config.MLP_HIDDEN
+
+    def _input_size(self):
+        return ((config.VISION_RADIUS * 2 + 1) ** 2 - 1) * 2
+
+    def weights_shape(self):
+        return (self._input_size() * self.hidden + self.hidden * 4,)
+
+    def init_weights(self):
+        return np.random.randint(-10, 11, size=self.weights_shape())
+
+    def forward_batch(self, weights, inputs):
+        n = inputs.shape[0]
+        split = self._input_size() * self.hidden
+        w1 = weights[:, :split].reshape(n, -1, self.hidden)
+        w2 = weights[:, split:].reshape(n, self.hidden, 4)
+
+        if use_sparse(inputs):
+            hidden = sparse_row_sum(w1, inputs)
+        else:
+            hidden = self._buffer(self._buffers, 'hidden', (n, self.hidden))
+            np.matmul(self._dense_inputs(inputs)[:, None, :], w1, out=hidden[:, None, :])
+        np.maximum(hidden, 0, out=hidden)
+
+        out = self._buffer(self._buffers, 'out', (n, 4))
+        np.matmul(hidden[:, None, :], w2, out=out[:, None, :])
+        return out
+
+
+_POLICIES = {
+    'linear': LinearPolicy,
+    'mlp': MLPPolicy,
+}
+_instances = {}
+
+
+def get_policy(name=None):
+    """
+    Отримати екземпляр політики за назвою (один на процес)
+
+    Args:
+        name: 'linear' або 'mlp' (None - config.POLICY)
+
+    Returns:
+        Policy
+    """
+    name = name or config.POLICY
+    if name not in _POLICIES:
+        raise ValueError(f"Невідома політика: {name}")
+    if name not in _instances:
+        _instances[name] = _POLICIES[name]()
+    return _instances[name]
@@ -0,0 +1,185 @@
+# profiling.py - Профілювання пам'яті тренування
+
+import json
+import os
+import sys
+import tracemalloc
+
+from monitor import memory_usage, to_json
+
+
+def _object_bytes(obj):
+    """Розмір об'єкта разом з його __dict__ (без вкладених об'єктів)"""
+    size = sys.getsizeof(obj)
+    if hasattr(obj, '__dict__'):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def environment_bytes(environment):
+    """
+    Приблизний розмір структур середовища за категоріями
+
+    Args:
+        environment: об'єкт Environment
+
+    Returns:
+        dict: байти на сітку, статичний шар, буфери, їжу та тіла змійок
+    """
+    buffers = 0
+    if environment._padded is not None:
+        buffers += environment._padded.nbytes
+    if environment._inputs is not None:
+        buffers += environment._inputs.nbytes + environment._features.nbytes
+    buffers += sum(stack.nbytes for stack, _ in environment._weights.values())
+
+    foods = sys.getsizeof(environment.foods)
+    foods += sum(_object_bytes(food) for food in environment.foods)
+
+    bodies = 0
+    snakes = sys.getsizeof(environment.snakes)
+    for snake in environment.snakes:
+        snakes += _object_bytes(snake)
+        bodies += sys.getsizeof(snake.body) + sum(sys.getsizeof(seg) for seg in snake.body)
+
+    return {
+        'grid': environment.grid.nbytes,
+        'static_obstacles': environment.static_obstacles.nbytes,
+        'buffers': buffers,
+        'foods': foods,
+        'snakes': snakes,
+        'snake_bodies': bodies,
+        'food_count': len(environment.foods),
+        'body_segments': sum(len(snake.body) for snake in environment.snakes),
+    }
+
+
+def algorithm_bytes(ga):
+    """
+    Приблизний розмір структур алгоритму за категоріями
+
+    Args:
+        ga: GeneticAlgorithm або EvolutionStrategy
+
+    Returns:
+        dict: байти на популяцію, історію статистики та архіви
+    """
+    population = sys.getsizeof(ga.population)
+    population += sum(_object_bytes(genome) + genome.weights.nbytes for genome in ga.population)
+
+    stats_history = sys.getsizeof(ga.stats_history)
+    stats_history += sum(sys.getsizeof(stats) for stats in ga.stats_history)
+
+    sizes = {
+        'population': population,
+        'stats_history': stats_history,
+        'hall_of_fame': 0,
+        'novelty_archive': 0,
+    }
+    if ga.hall_of_fame is not None:
+        hof = ga.hall_of_fame
+        sizes['hall_of_fame'] = (hof.weights.nbytes + hof.fitness_sum.nbytes + hof.eval_count.nbytes
+                                 + hof.last_fitness.nbytes + hof.added_generation.nbytes)
+    if ga.novelty_archive is not None:
+        sizes['novelty_archive'] = ga.novelty_archive.data.nbytes + ga.novelty_archive.sq_norms.nbytes
+    if getattr(ga, 'noise', None) is not None:
+        sizes['es_noise'] = ga.noise.nbytes
+    return sizes
+
+
+class MemoryProfiler:
+    """
+    Профілювання пам'яті по поколіннях (вмикається окремо)
+
+    Для кожного покоління записує в JSON Lines файл поточний і пиковий
+    RSS, найбільші місця виділення пам'яті за tracemalloc (і їх приріст з
+    попереднього покоління) та розміри основних структур: середовища
+    (найбільшого з оцінених у поколінні), тіл змійок і популяції.
+    """
+
+    def __init__(self, filename, top=10, frames=1):
+        """
+        Ініціалізація та запуск tracemalloc
+
+        Args:
+            filename: шлях до файлу профілю (.jsonl)
+            top: скільки місць виділення записувати
+            frames: глибина стеку для tracemalloc
+        """
+        self.filename = filename
+        self.top = top
+        self.environment = None
+        self._previous = None
+
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(filename, 'w')
+
+        self._started_tracemalloc = not tracemalloc.is_tracing()
+        if self._started_tracemalloc:
+            tracemalloc.start(frames)
+
+    def measure_environment(self, environment):
+        """
+        Запам'ятати розміри середовища після симуляції (викликається з GA)
+
+        Args:
+            environment: об'єкт Environment
+        """
+        sizes = environment_bytes(environment)
+        if self.environment is None or sum(sizes.values()) > sum(self.environment.values()):
+            self.environment = sizes
+
+    def record(self, ga):
+        """
+        Записати профіль покоління
+
+        Args:
+            ga: GeneticAlgorithm або EvolutionStrategy
+
+        Returns:
+            dict: записаний профіль
+        """
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ])
+        current, peak = tracemalloc.get_traced_memory()
+
+        top_allocations = [
+            {'location': str(stat.traceback), 'bytes': stat.size, 'count': stat.count}
+            for stat in snapshot.statistics('lineno')[:self.top]
+        ]
+        top_growth = []
+        if self._previous is not None:
+            top_growth = [
+                {'location': str(stat.traceback), 'bytes_diff': stat.size_diff, 'bytes': stat.size}
+                for stat in snapshot.compare_to(self._previous, 'lineno')[:self.top]
+            ]
+        self._previous = snapshot
+
+        profile = to_json({
+            'generation': ga.generation,
+            'memory': memory_usage(),
+            'traced_bytes': current,
+            'traced_peak_bytes': peak,
+            'environment': self.environment,
+            'algorithm': algorithm_bytes(ga),
+            'top_allocations': top_allocations,
+            'top_growth': top_growth,
+        })
+        self.environment = None
+        tracemalloc.reset_peak()
+
+        self._file.write(json.dumps(profile, ensure_ascii=False) + '\n')
+        self._file.flush()
+        return profile
+
+    def close(self):
+        """Закрити файл профілю та зупинити tracemalloc"""
+        self._file.close()
+        self._previous = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
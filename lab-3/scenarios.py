@@ -0,0 +1,159 @@
+# scenarios.py - Стартові сценарії арени
+
+import numpy as np
+import config
+from environment import Environment
+from obstacles import obstacle_layer, has_interior
+from snake import Snake
+
+
+class Scenario:
+    """
+    Зафіксований стартовий стан арени: розкладка їжі, точки появи та
+    початкові напрямки змійок. Зберігається у вигляді масивів, тому
+    одна й та сама арена може бути відтворена для будь-якої популяції.
+    """
+
+    def __init__(self, food_positions, spawn_positions, directions, seed=None):
+        """
+        Ініціалізація сценарію
+
+        Args:
+            food_positions: numpy array (FOOD_COUNT, 2) з координатами (x, y)
+            spawn_positions: numpy array (N, 2) з координатами голів змійок
+            directions: numpy array (N,) з початковими напрямками
+            seed: зерно для випадковості під час симуляції (None - не фіксувати)
+        """
+        self.food_positions = food_positions
+        self.spawn_positions = spawn_positions
+        self.directions = directions
+        self.seed = seed
+
+    def build_environment(self, genomes, grid_size=None):
+        """
+        Створити середовище з цього сценарію
+
+        Args:
+            genomes: список об'єктів Genome (не більше ніж точок появи)
+            grid_size: розмір поля (None - config.GRID_SIZE)
+
+        Returns:
+            Environment: середовище зі змійками та їжею
+        """
+        grid_size = grid_size or config.GRID_SIZE
+        env = Environment(grid_size, grid_size)
+
+        for i, genome in enumerate(genomes):
+            x, y = self.spawn_positions[i]
+            snake = Snake(int(x), int(y), genome, snake_id=i + 1,
+                          direction=int(self.directions[i]))
+            env.add_snake(snake)
+
+        env.place_food(self.food_positions)
+        return env
+
+
+def generate_scenario(n_snakes, food_count=None, grid_size=None, rng=np.random, seed=None):
+    """
+    Згенерувати сценарій: змійки рівномірно по полю з невеликим зсувом,
+    їжа у випадкових клітинках всередині бар'єру
+
+    Args:
+        n_snakes: кількість точок появи
+        food_count: кількість їжі (None - config.FOOD_COUNT)
+        grid_size: розмір поля (None - config.GRID_SIZE)
+        rng: генератор випадкових чисел (модуль np.random або np.random.Generator)
+        seed: зерно, що зберігається у сценарії для симуляції
+
+    Returns:
+        Scenario
+    """
+    food_count = config.FOOD_COUNT if food_count is None else food_count
+    grid_size = grid_size or config.GRID_SIZE
+    randint = rng.integers if isinstance(rng, np.random.Generator) else rng.randint
+
+    side = int(np.sqrt(n_snakes))
+    grid_step = (grid_size - 4) // max(side, 1)
+
+    spawn_positions = []
+    for i in range(side + 1):
+        for j in range(side + 1):
+            if len(spawn_positions) < n_snakes:
+                x = 2 + j * grid_step + randint(-2, 3)
+                y = 2 + i * grid_step + randint(-2, 3)
+                # Переконатися що не на бар'єрі
+                x = max(2, min(grid_size - 3, x))
+                y = max(2, min(grid_size - 3, y))
+                spawn_positions.append((x, y))
+
+    directions = randint(0, 4, size=n_snakes)
+    food_positions = np.stack([
+        randint(1, grid_size - 1, size=food_count),  # Уникаємо бар'єру
+        randint(1, grid_size - 1, size=food_count),
+    ], axis=1)
+
+    # Внутрішні стіни: їжа та змійки не повинні з'являтися в перешкодах
+    layer = obstacle_layer(grid_size, grid_size)
+    if has_interior(layer):
+        _avoid_obstacles(layer, spawn_positions, food_positions, randint)
+
+    return Scenario(food_positions, np.array(spawn_positions, dtype=int), directions, seed)
+
+
+def _avoid_obstacles(layer, spawn_positions, food_positions, randint):
+    """
+    Перенести точки появи та їжу з перешкод на вільні клітинки (на місці)
+
+    Args:
+        layer: статичний шар перешкод
+        spawn_positions: список (x, y) голів змійок
+        food_positions: numpy array (F, 2)
+        randint: функція випадкових цілих чисел генератора сценарію
+    """
+    size = layer.shape[0]
+
+    def body_blocked(x, y):
+        column = layer[y:min(y + config.INITIAL_SNAKE_LENGTH, size), x]
+        return bool(column.any())
+
+    for i, (x, y) in enumerate(spawn_positions):
+        attempts = 0
+        while body_blocked(x, y) and attempts < 1000:
+            x, y = int(randint(2, size - 2)), int(randint(2, size - 2))
+            attempts += 1
+        spawn_positions[i] = (x, y)
+
+    blocked = layer[food_positions[:, 1], food_positions[:, 0]]
+    while blocked.any():
+        count = int(blocked.sum())
+        food_positions[blocked] = np.stack([
+            randint(1, size - 1, size=count),
+            randint(1, size - 1, size=count),
+        ], axis=1)
+        blocked = layer[food_positions[:, 1], food_positions[:, 0]]
+
+
+def generate_scenarios(k, n_snakes, food_count=None, grid_size=None, seed=None):
+    """
+    Згенерувати K відтворюваних сценаріїв для оцінки зі спільними
+    випадковими числами (common random numbers)
+
+    Args:
+        k: кількість сценаріїв
+        n_snakes: кількість точок появи в кожному сценарії
+        food_count: кількість їжі
+        grid_size: розмір поля
+        seed: базове зерно (None - взяти з глобального генератора numpy)
+
+    Returns:
+        list: список Scenario
+    """
+    seed_rng = np.random.default_rng(seed) if seed is not None else np.random
+    randint = seed_rng.integers if seed is not None else seed_rng.randint
+    seeds = randint(0, 2 ** 31 - 1, size=k)
+
+    return [
+        generate_scenario(n_snakes, food_count, grid_size,
+                          rng=np.random.default_rng(int(s)), seed=int(s))
+        for s in seeds
+    ]
@@ -7,7 +7,7 @@ from config import INITIAL_SNAKE_LENGTH, ENERGY, MIN_LENGTH
 class Snake:
     """Клас змійки що використовує геном для прийняття рішень"""
     
-    def __init__(self, start_x, start_y, genome, snake_id):
+    def __init__(self, start_x, start_y, genome, snake_id, direction=None):
         """
         Ініціалізація змійки
         
@@ -16,6 +16,7 @@ class Snake:
             start_y: початкова координата Y
             genome: об'єкт Genome
             snake_id: унікальний ідентифікатор
+            direction: початковий напрямок (None - випадковий)
         """
         self.genome = genome
         self.id = snake_id
@@ -23,8 +24,10 @@ class Snake:
         # Створити тіло змійки (голова перша)
         self.body = [(start_x, start_y + i) for i in range(INITIAL_SNAKE_LENGTH)]
         
-        # Випадковий початковий напрямок (0=вгору, 1=вправо, 2=вниз, 3=вліво)
-        self.direction = np.random.randint(0, 4)
+        # Початковий напрямок (0=вгору, 1=вправо, 2=вниз, 3=вліво)
+        if direction is None:
+            direction = np.random.randint(0, 4)
+        self.direction = direction
         
         # Статистика
         self.energy = ENERGY
@@ -32,6 +35,10 @@ class Snake:
         self.food_eaten = 0
         self.alive = True
         self.steps = 0
+        
+        # Для дескриптора поведінки (пошук новизни)
+        self.start_position = (start_x, start_y)
+        self.direction_counts = [0, 0, 0, 0]
     
     def get_vision(self, environment):
         """
@@ -45,35 +52,7 @@ class Snake:
             [y][x][0] = їжа (1 якщо є, 0 якщо немає)
             [y][x][1] = перешкода (1 якщо є, 0 якщо немає)
         """
-        from config import VISION_RADIUS
-        
-        vision = np.zeros((VISION_RADIUS * 2 + 1, VISION_RADIUS * 2 + 1, 2))
-        head_x, head_y = self.body[0]
-        
-        # Пройтись по всіх клітинках в радіусі огляду
-        for dy in range(-VISION_RADIUS, VISION_RADIUS + 1):
-            for dx in range(-VISION_RADIUS, VISION_RADIUS + 1):
-                # Пропустити центральну клітинку (голова змійки)
-                if dy == 0 and dx == 0:
-                    continue
-                
-                # Координати в полі
-                x = head_x + dx
-                y = head_y + dy
-                
-                # Координати в масиві vision (зміщені на VISION_RADIUS)
-                vis_y = dy + VISION_RADIUS
-                vis_x = dx + VISION_RADIUS
-                
-                # Перевірити їжу
-                if environment.is_food(x, y):
-                    vision[vis_y, vis_x, 0] = 1
-                
-                # Перевірити перешкоду
-                if environment.is_obstacle(x, y):
-                    vision[vis_y, vis_x, 1] = 1
-        
-        return vision
+        return environment.get_visions([self])[0]
     
     def decide_direction(self, vision):
         """
@@ -82,30 +61,17 @@ class Snake:
         Args:
             vision: numpy array (11, 11, 2) з поля зору
         """
-        from config import VISION_RADIUS
-        
-        # Ініціалізувати виходи для кожного напрямку
-        outputs = np.zeros(4)  # [вгору, вправо, вниз, вліво]
-        
-        # Індекс позиції в геномі (пропускаємо центральну клітинку)
-        position_idx = 0
-        
-        # Пройтись по всіх клітинках огляду
-        for vis_y in range(VISION_RADIUS * 2 + 1):
-            for vis_x in range(VISION_RADIUS * 2 + 1):
-                # Пропустити центральну клітинку
-                if vis_y == VISION_RADIUS and vis_x == VISION_RADIUS:
-                    continue
-                
-                # Для їжі
-                if vision[vis_y, vis_x, 0] == 1:
-                    outputs += self.genome.weights[position_idx, 0, :]
-                
-                # Для перешкоди
-                if vision[vis_y, vis_x, 1] == 1:
-                    outputs += self.genome.weights[position_idx, 1, :]
-                
-                position_idx += 1
+        outputs = self.genome.policy.forward(self.genome.weights, vision)
+        self.choose_direction(outputs)
+    
+    def choose_direction(self, outputs):
+        """
+        Обрати напрямок за виходами політики
+        
+        Args:
+            outputs: виходи для кожного напрямку [вгору, вправо, вниз, вліво]
+        """
+        outputs = np.array(outputs, dtype=float)
         
         # Не можна рухатися в протилежний напрямок
         opposite_direction = (self.direction + 2) % 4
@@ -147,6 +113,7 @@ class Snake:
         
         # Додати нову голову
         self.body.insert(0, new_head)
+        self.direction_counts[self.direction] += 1
         
         # Видалити хвіст якщо тіло довше ніж потрібно
         while len(self.body) > self.length:
@@ -174,8 +141,8 @@ class Snake:
             self.alive = False
             return
         
-        # Перевірка зіткнення з перешкодами
-        if (head_x, head_y) in environment.obstacles:
+        # Перевірка зіткнення з перешкодами (статичний шар)
+        if environment.static_obstacles[head_y, head_x]:
             self.alive = False
             return
         
@@ -191,6 +158,28 @@ class Snake:
                     self.alive = False
                     return
     
+    def get_behaviour(self, grid_size):
+        """
+        Дескриптор поведінки для пошуку новизни
+        
+        Args:
+            grid_size: розмір поля (для нормалізації координат)
+        
+        Returns:
+            numpy array (8,): фінальна позиція голови, зміщення від старту
+            та частка кроків у кожному напрямку
+        """
+        head_x, head_y = self.body[0]
+        start_x, start_y = self.start_position
+        total = max(sum(self.direction_counts), 1)
+        
+        return np.array([
+            head_x / grid_size,
+            head_y / grid_size,
+            (head_x - start_x) / grid_size,
+            (head_y - start_y) / grid_size,
+        ] + [count / total for count in self.direction_counts])
+    
     def get_fitness(self):
         """
         Обчислити фітнес-функцію змійки
@@ -0,0 +1,248 @@
+# sweep.py - Паралельний пошук гіперпараметрів
+
+import csv
+import datetime
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+import config
+import genetic_algorithm
+
+
+# Параметри, які можна змінювати під час пошуку
+TUNABLE_PARAMETERS = (
+    'POPULATION_SIZE', 'SURVIVORS', 'ELITE_SIZE', 'MAX_STEPS',
+    'MUTATION_RATE', 'MUTATION_SIGMA', 'TOURNAMENT_SIZE', 'CRN_SCENARIOS',
+    'FOOD_COUNT', 'VISION_RADIUS', 'GRID_SIZE', 'ENERGY',
+    'HALL_OF_FAME_SIZE', 'HOF_REEVAL_INTERVAL', 'NOVELTY_WEIGHT', 'NOVELTY_K',
+    'POLICY', 'MLP_HIDDEN', 'OBSTACLE_DENSITY',
+)
+
+# Значення за замовчуванням (знімаються до будь-яких змін у процесі)
+_DEFAULTS = {name: getattr(config, name) for name in TUNABLE_PARAMETERS}
+
+# Каталог модулів проєкту (лише вони можуть імпортувати константи з config)
+_PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Простір пошуку за замовчуванням для меню
+DEFAULT_SWEEP_SPEC = {
+    'MUTATION_RATE': [0.02, 0.05, 0.1],
+    'MUTATION_SIGMA': [10, 15, 25],
+    'SURVIVORS': [16, 32],
+}
+
+
+def grid_configs(spec):
+    """
+    Повний перебір усіх комбінацій параметрів
+
+    Args:
+        spec: словник {параметр: список значень}
+
+    Returns:
+        list: список словників-конфігурацій
+    """
+    names = list(spec)
+    return [dict(zip(names, values)) for values in itertools.product(*(spec[n] for n in names))]
+
+
+def random_configs(spec, n_samples, seed=None):
+    """
+    Випадкова вибірка конфігурацій
+
+    Args:
+        spec: словник {параметр: список значень або кортеж (min, max)}
+              Список - вибір одного зі значень, кортеж - рівномірний діапазон
+              (цілі числа, якщо обидві межі цілі)
+        n_samples: кількість конфігурацій
+        seed: зерно генератора
+
+    Returns:
+        list: список словників-конфігурацій
+    """
+    rng = np.random.default_rng(seed)
+    configs = []
+
+    for _ in range(n_samples):
+        cfg = {}
+        for name, values in spec.items():
+            if isinstance(values, tuple):
+                low, high = values
+                if isinstance(low, int) and isinstance(high, int):
+                    cfg[name] = int(rng.integers(low, high + 1))
+                else:
+                    cfg[name] = float(rng.uniform(low, high))
+            else:
+                cfg[name] = values[rng.integers(len(values))]
+        configs.append(cfg)
+
+    return configs
+
+
+def _config_modules():
+    """
+    config та всі завантажені модулі проєкту
+
+    Модуль, що зробив "from config import ...", тримає власну копію
+    константи, тому підставляти значення треба в кожен такий модуль.
+    Список будується з sys.modules, а не вручну, щоб новий модуль не
+    ігнорував пошук непомітно. Модулі, імпортовані пізніше, отримають
+    вже змінені значення з config.
+    """
+    modules = [config]
+    for module in list(sys.modules.values()):
+        filename = getattr(module, '__file__', None)
+        if module is not config and filename and os.path.dirname(os.path.abspath(filename)) == _PROJECT_DIR:
+            modules.append(module)
+    return modules
+
+
+def apply_config(overrides):
+    """
+    Застосувати конфігурацію в поточному процесі
+
+    Спочатку відновлює значення за замовчуванням (процеси пулу
+    перевикористовуються між задачами), потім підставляє нові значення
+    у config та всі модулі, що імпортували константи напряму.
+
+    Args:
+        overrides: словник {параметр: значення}
+    """
+    unknown = set(overrides) - set(TUNABLE_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Невідомі параметри: {', '.join(sorted(unknown))}")
+
+    values = dict(_DEFAULTS)
+    values.update(overrides)
+
+    modules = _config_modules()
+    for name, value in values.items():
+        for module in modules:
+            if hasattr(module, name):
+                setattr(module, name, value)
+
+    # Розмір генома залежить від радіусу огляду
+    r = values['VISION_RADIUS']
+    config.GENOME_SIZE = ((2 * r + 1) ** 2 - 1) * 2 * 4
+
+
+def run_config(overrides, generations, seed=None):
+    """
+    Коротке тренування з однією конфігурацією (виконується у процесі пулу)
+
+    Args:
+        overrides: словник {параметр: значення}
+        generations: кількість поколінь
+        seed: зерно генератора numpy
+
+    Returns:
+        dict: конфігурація та результати тренування
+    """
+    apply_config(overrides)
+    if seed is not None:
+        np.random.seed(seed)
+
+    start = time.perf_counter()
+    ga = genetic_algorithm.GeneticAlgorithm(population_size=config.POPULATION_SIZE)
+    for _ in range(generations):
+        ga.evolve()
+    wall_time = time.perf_counter() - start
+
+    last = ga.stats_history[-1]
+    return {
+        'config': overrides,
+        'generations': generations,
+        'best_fitness': float(ga.best_fitness),
+        'final_max_fitness': float(last['max_fitness']),
+        'final_avg_fitness': float(last['avg_fitness']),
+        'mean_avg_fitness': float(np.mean([s['avg_fitness'] for s in ga.stats_history])),
+        'wall_time': wall_time,
+    }
+
+
+def run_sweep(spec, mode='grid', n_samples=8, generations=5, workers=None,
+              seed=0, output_dir="data/sweeps"):
+    """
+    Запустити пошук гіперпараметрів у пулі процесів
+
+    Args:
+        spec: простір пошуку (див. grid_configs / random_configs)
+        mode: 'grid' або 'random'
+        n_samples: кількість конфігурацій для режиму 'random'
+        generations: поколінь на одну конфігурацію
+        workers: кількість процесів (None = кількість ядер)
+        seed: базове зерно (кожна конфігурація отримує seed + індекс)
+        output_dir: папка для таблиці результатів (None - не зберігати)
+
+    Returns:
+        list: результати, відсортовані за найкращим fitness на секунду
+    """
+    if mode == 'grid':
+        configs = grid_configs(spec)
+    elif mode == 'random':
+        configs = random_configs(spec, n_samples, seed)
+    else:
+        raise ValueError(f"Невідомий режим пошуку: {mode}")
+
+    print(f"✓ Пошук: {len(configs)} конфігурацій × {generations} поколінь")
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(run_config, cfg, generations, seed + i)
+            for i, cfg in enumerate(configs)
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            print(f"  {result['config']} | "
+                  f"Best: {result['best_fitness']:7.0f} | "
+                  f"Avg: {result['final_avg_fitness']:7.2f} | "
+                  f"Time: {result['wall_time']:6.1f}s")
+
+    for result in results:
+        result['fitness_per_second'] = result['best_fitness'] / max(result['wall_time'], 1e-9)
+    results.sort(key=lambda r: r['fitness_per_second'], reverse=True)
+
+    if output_dir is not None:
+        save_sweep_results(results, list(spec), output_dir)
+
+    return results
+
+
+def save_sweep_results(results, parameter_names, output_dir="data/sweeps"):
+    """
+    Зберегти зведену таблицю результатів у CSV
+
+    Args:
+        results: список результатів run_config
+        parameter_names: назви параметрів (колонки таблиці)
+        output_dir: папка для файлу
+
+    Returns:
+        str: шлях до файлу
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = os.path.join(output_dir, f"sweep_{timestamp}.csv")
+
+    with open(filename, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(list(parameter_names) + [
+            'Generations', 'Best_Fitness', 'Final_Max_Fitness', 'Final_Avg_Fitness',
+            'Mean_Avg_Fitness', 'Wall_Time', 'Fitness_Per_Second'
+        ])
+        for r in results:
+            writer.writerow([r['config'].get(name) for name in parameter_names] + [
+                r['generations'], r['best_fitness'], r['final_max_fitness'],
+                r['final_avg_fitness'], r['mean_avg_fitness'], r['wall_time'],
+                r['fitness_per_second']
+            ])
+
+    print(f"✓ Результати пошуку збережено в {filename}")
+    return filename
@@ -81,6 +81,534 @@ def test_genetic_algorithm():
     print()
 
 
+def test_common_random_numbers():
+    """Тест оцінки на спільних сценаріях"""
+    print("=" * 50)
+    print("ТЕСТ СПІЛЬНИХ СЦЕНАРІЇВ")
+    print("=" * 50)
+    
+    ga = GeneticAlgorithm(population_size=8, crn_scenarios=2)
+    first, _, _ = ga.evaluate_population()
+    second, _, _ = ga.evaluate_population()
+    print(f"✓ Сценаріїв: {len(ga.scenarios)}, fitness: {first[:4]}")
+    assert len(first) == 8
+    assert first == second, "Однакова популяція на тих самих сценаріях має давати той самий fitness"
+    print("✓ Оцінка відтворювана")
+    
+    ga.evolve()
+    assert len(ga.population) == 8
+    print()
+
+
+def test_hall_of_fame():
+    """Тест архіву найкращих геномів"""
+    print("=" * 50)
+    print("ТЕСТ АРХІВУ НАЙКРАЩИХ")
+    print("=" * 50)
+    
+    from hall_of_fame import HallOfFame
+    
+    hof = HallOfFame(capacity=3, genome_size=Genome().weights.size)
+    genomes = [Genome() for _ in range(5)]
+    hof.update(genomes, [10, 50, 30, 40, 20], generation=0)
+    assert hof.size == 3
+    assert hof.best_fitness() == 50
+    
+    # Повторна поява того самого генома - нова оцінка, а не дублікат
+    hof.update([genomes[1]], [30], generation=1)
+    assert hof.size == 3
+    assert hof.best_fitness() == 40
+    print(f"✓ Середній fitness архіву: {hof.mean_fitness()}")
+    
+    from config import HOF_REEVAL_INTERVAL
+    ga = GeneticAlgorithm(population_size=8, hall_of_fame_size=4)
+    for _ in range(HOF_REEVAL_INTERVAL + 1):
+        ga.evolve()
+    assert ga.hall_of_fame.history, "Архів мав бути переоцінений разом з популяцією"
+    print(f"✓ Історія переоцінок: {ga.hall_of_fame.history}")
+    print()
+
+
+def test_novelty():
+    """Тест пошуку новизни"""
+    print("=" * 50)
+    print("ТЕСТ ПОШУКУ НОВИЗНИ")
+    print("=" * 50)
+    
+    from novelty import NoveltyArchive
+    
+    archive = NoveltyArchive(dim=3, k=4, capacity=100, add_per_generation=10, block_size=16)
+    for _ in range(5):
+        descriptors = np.random.random((12, 3))
+        novelty = archive.score(descriptors)
+        archive.add(descriptors, novelty)
+    
+    # Порівняння з прямим перебором
+    queries = np.random.random((6, 3))
+    reference = np.vstack([archive.data[:archive.size], queries])
+    expected = []
+    for i, q in enumerate(queries):
+        d = np.linalg.norm(reference - q, axis=1)
+        d[archive.size + i] = np.inf
+        expected.append(np.sort(d)[:4].mean())
+    assert np.allclose(archive.score(queries), expected)
+    print(f"✓ Новизна збігається з прямим перебором (архів: {archive.size})")
+    
+    ga = GeneticAlgorithm(population_size=8, novelty_weight=0.5)
+    ga.evolve()
+    assert ga.behaviours.shape == (8, 8)
+    print(f"✓ Середня новизна покоління: {ga.stats_history[-1]['avg_novelty']:.3f}")
+    print()
+
+
+def test_evolution_strategy():
+    """Тест еволюційної стратегії"""
+    print("=" * 50)
+    print("ТЕСТ ЕВОЛЮЦІЙНОЇ СТРАТЕГІЇ")
+    print("=" * 50)
+    
+    from evolution_strategy import EvolutionStrategy
+    
+    es = EvolutionStrategy(population_size=9)
+    assert len(es.population) == 9
+    # Антитетичні пари симетричні відносно середнього
+    assert np.allclose(es.noise[:4], -es.noise[4:8])
+    
+    mean_before = es.mean.copy()
+    for _ in range(2):
+        es.evolve()
+    assert not np.allclose(mean_before, es.mean)
+    assert es.get_mean_genome().weights.shape == es.population[0].weights.shape
+    print(f"✓ ES: {len(es.stats_history)} поколінь, best={es.best_fitness:.0f}")
+    print()
+
+
+def test_sweep():
+    """Тест пошуку гіперпараметрів"""
+    print("=" * 50)
+    print("ТЕСТ ПОШУКУ ГІПЕРПАРАМЕТРІВ")
+    print("=" * 50)
+    
+    from sweep import grid_configs, random_configs, run_sweep, apply_config
+    import config
+    
+    configs = grid_configs({'MUTATION_RATE': [0.05, 0.1], 'SURVIVORS': [4, 8]})
+    assert len(configs) == 4
+    print(f"✓ Сітка: {len(configs)} конфігурацій")
+    
+    sampled = random_configs({'MUTATION_SIGMA': (5, 25), 'MUTATION_RATE': [0.05, 0.1]}, 3, seed=1)
+    assert all(5 <= c['MUTATION_SIGMA'] <= 25 for c in sampled)
+    print(f"✓ Випадкова вибірка: {sampled}")
+    
+    spec = {'MUTATION_RATE': [0.05, 0.2]}
+    base = {'POPULATION_SIZE': 16, 'SURVIVORS': 4, 'ELITE_SIZE': 2,
+            'TOURNAMENT_SIZE': 4, 'MAX_STEPS': 30, 'FOOD_COUNT': 50, 'GRID_SIZE': 40}
+    spec.update({name: [value] for name, value in base.items()})
+    results = run_sweep(spec, generations=2, workers=2, output_dir=None)
+    assert len(results) == 2
+    print(f"✓ Пошук завершено, найкраща: {results[0]['config']['MUTATION_RATE']}")
+    
+    # Параметр доходить до кожного модуля, що імпортував його через "from config import"
+    import evolution_strategy
+    import genetic_algorithm
+    apply_config({'POPULATION_SIZE': 24, 'MUTATION_SIGMA': 7})
+    assert evolution_strategy.POPULATION_SIZE == genetic_algorithm.POPULATION_SIZE == 24
+    assert genetic_algorithm.MUTATION_SIGMA == 7
+    print("✓ Параметри застосовано до всіх модулів проєкту")
+    
+    # Процес тестів не повинен залишитись зі зміненою конфігурацією
+    apply_config({})
+    assert config.POPULATION_SIZE == 128
+    assert evolution_strategy.POPULATION_SIZE == 128
+    print()
+
+
+def test_policy():
+    """Тест політик та пакетного обчислення рішень"""
+    print("=" * 50)
+    print("ТЕСТ ПОЛІТИК")
+    print("=" * 50)
+    
+    from policy import get_policy
+    
+    env = Environment(GRID_SIZE, GRID_SIZE)
+    for i in range(6):
+        env.add_snake(Snake(20 + i * 5, 20, Genome(), i))
+    env.spawn_food(100)
+    env.update_grid()
+    
+    # Пакетні виходи збігаються з поодиноким обчисленням для кожної змійки
+    batched = env.decide_outputs(list(range(len(env.snakes))))
+    for snake, outputs in zip(env.snakes, batched):
+        single = snake.genome.policy.forward(snake.genome.weights, snake.get_vision(env))
+        assert np.allclose(single, outputs)
+    print("✓ Пакетні виходи лінійної політики збігаються з поодинокими")
+    
+    mlp = Genome(policy='mlp')
+    assert mlp.weights.shape == get_policy('mlp').weights_shape()
+    assert Genome.from_flat(mlp.to_flat(), 'mlp').policy_name == 'mlp'
+    print(f"✓ MLP геном: {mlp.weights.size} ваг")
+    
+    ga = GeneticAlgorithm(population_size=16)
+    ga.population = [Genome(policy='mlp') for _ in range(16)]
+    ga.evolve()
+    assert all(g.policy_name == 'mlp' for g in ga.population)
+    print(f"✓ Еволюція MLP: max fitness {ga.stats_history[-1]['max_fitness']:.0f}")
+    print()
+
+
+def test_snapshot():
+    """Тест знімків та розгалуження середовища"""
+    print("=" * 50)
+    print("ТЕСТ ЗНІМКІВ СЕРЕДОВИЩА")
+    print("=" * 50)
+    
+    import pickle
+    from scenarios import generate_scenario
+    
+    genomes = [Genome() for _ in range(8)]
+    env = generate_scenario(len(genomes), food_count=200, seed=5).build_environment(genomes)
+    for _ in range(10):
+        env.step()
+    
+    snapshot = env.snapshot(include_rng=True)
+    assert len(snapshot) == len(genomes)
+    assert not snapshot.bodies.flags.writeable
+    
+    def play(environment, steps=40):
+        for _ in range(steps):
+            environment.step()
+        return [s.get_fitness() for s in environment.snakes], [list(s.body) for s in environment.snakes]
+    
+    first = play(env)
+    env.restore(snapshot)
+    assert play(env) == first
+    print("✓ Відновлення зі знімка відтворює продовження")
+    
+    # Розгалуження не змінює оригінал
+    env.restore(snapshot)
+    branch = env.fork()
+    play(branch, 20)
+    assert [list(s.body) for s in env.snakes] == [list(s.body) for s in Environment.from_snapshot(snapshot).snakes]
+    print("✓ Розгалуження незалежне від оригіналу")
+    
+    restored = Environment.from_snapshot(pickle.loads(pickle.dumps(snapshot)))
+    assert play(restored) == first
+    print(f"✓ Знімок серіалізується: {len(pickle.dumps(snapshot))} байт")
+    print()
+
+
+def test_population_archive():
+    """Тест архіву популяцій"""
+    print("=" * 50)
+    print("ТЕСТ АРХІВУ ПОПУЛЯЦІЙ")
+    print("=" * 50)
+    
+    import tempfile
+    from archive import PopulationArchive
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        ga = GeneticAlgorithm(population_size=16)
+        ga.archive = PopulationArchive(tmp, ga.population[0].weights.size, 16)
+        
+        populations = []
+        for _ in range(3):
+            populations.append([g.weights.copy() for g in ga.population])
+            ga.evolve()
+        ga.archive.close()
+        
+        archive = PopulationArchive(tmp)
+        assert len(archive) == 3
+        assert archive.records.shape == (3, 16)
+        for gen in range(3):
+            genomes = archive.genomes(gen)
+            assert all(np.array_equal(g.weights, w) for g, w in zip(genomes, populations[gen]))
+            assert np.isclose(archive.fitness()[gen].max(), ga.stats_history[gen]['max_fitness'])
+        print(f"✓ Записано {len(archive)} поколінь по {archive.dtype.itemsize} байт на особину")
+        
+        # Перше покоління без батьків, далі - індекси в попередньому
+        assert (archive.generation(0)['parents'] == -1).all()
+        assert (archive.generation(2)['parents'] >= 0).all()
+        chain = archive.lineage(2, 5)
+        assert [gen for gen, _ in chain] == [2, 1, 0]
+        print(f"✓ Родовід: {chain}")
+        del archive
+    print()
+
+
+def test_background_writer():
+    """Тест фонового запису статистики та популяцій"""
+    print("=" * 50)
+    print("ТЕСТ ФОНОВОГО ЗАПИСУ")
+    print("=" * 50)
+    
+    import csv
+    import os
+    import tempfile
+    import time
+    from writer import BackgroundWriter
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        stats_filename = os.path.join(tmp, "stats", "training.csv")
+        population_filename = os.path.join(tmp, "populations", "checkpoint.csv")
+        writer = BackgroundWriter(stats_filename, ['Generation', 'Max_Fitness'], flush_interval=2)
+        
+        population = [Genome() for _ in range(4)]
+        for gen in range(5):
+            writer.write_stats([gen, gen * 10])
+            population[0].weights[0, 0, 0] = gen
+            writer.save_population(population, population_filename)
+        writer.close()
+        
+        with open(stats_filename) as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == ['Generation', 'Max_Fitness'] and len(rows) == 6
+        assert [int(row[0]) for row in rows[1:]] == list(range(5))
+        print(f"✓ Статистика: {len(rows) - 1} рядків")
+        
+        # Після створення файлу нові рядки дописуються, а не переписують файл
+        appended_filename = os.path.join(tmp, "stats", "appended.csv")
+        writer = BackgroundWriter(appended_filename, ['Generation'], flush_interval=1)
+        writer.write_stats([0])
+        for _ in range(200):
+            if os.path.exists(appended_filename):
+                break
+            time.sleep(0.01)
+        inode = os.stat(appended_filename).st_ino
+        for gen in range(1, 4):
+            writer.write_stats([gen])
+        writer.close()
+        with open(appended_filename) as f:
+            assert [row[0] for row in csv.reader(f)] == ['Generation', '0', '1', '2', '3']
+        assert os.stat(appended_filename).st_ino == inode
+        print("✓ Нові рядки статистики дописуються в кінець файлу")
+        
+        saved = np.loadtxt(population_filename, delimiter=',')
+        assert saved.shape == (4, population[0].weights.size)
+        assert saved[0, 0] == 4  # Найновіша версія популяції
+        assert not any(name.endswith('.tmp') for _, _, files in os.walk(tmp) for name in files)
+        print("✓ Контрольна точка записана атомарно (остання версія)")
+    print()
+
+
+def test_monitor():
+    """Тест HTTP монітора тренування"""
+    print("=" * 50)
+    print("ТЕСТ МОНІТОРА ТРЕНУВАННЯ")
+    print("=" * 50)
+    
+    import json
+    import os
+    import tempfile
+    import urllib.request
+    from monitor import TrainingMonitor
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        monitor = TrainingMonitor(port=0, history=2, snapshot_dir=tmp)
+        url = monitor.start()
+        try:
+            ga = GeneticAlgorithm(population_size=16)
+            for _ in range(3):
+                ga.evolve()
+                monitor.publish(ga)
+            
+            with urllib.request.urlopen(f"{url}/status") as response:
+                status = json.load(response)
+            assert status['generation'] == 3
+            assert status['steps_per_second'] > 0
+            assert set(status['timings']) >= {'evaluate', 'selection', 'generation'}
+            print(f"✓ /status: {status['steps_per_second']:.0f} кроків/с")
+            
+            with urllib.request.urlopen(f"{url}/stats") as response:
+                assert len(json.load(response)['stats']) == 2
+            
+            request = urllib.request.Request(f"{url}/snapshot", method='POST')
+            with urllib.request.urlopen(request) as response:
+                filename = json.load(response)['filename']
+            assert os.path.exists(filename)
+            print(f"✓ Знімок найкращого генома: {os.path.basename(filename)}")
+        finally:
+            monitor.stop()
+    print()
+
+
+def test_obstacles():
+    """Тест статичного шару перешкод"""
+    print("=" * 50)
+    print("ТЕСТ КАРТ ПЕРЕШКОД")
+    print("=" * 50)
+    
+    import os
+    import tempfile
+    from obstacles import obstacle_layer, load_obstacle_map
+    from scenarios import generate_scenario
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "map.txt")
+        with open(filename, 'w') as f:
+            f.write("\n" * 10 + " " * 10 + "#" * 20 + "\n")
+        layer = load_obstacle_map(filename, 40, 40)
+        assert layer[10, 10:30].all() and layer.sum() == 20
+        print("✓ Карта з файлу завантажена")
+    
+    layer = obstacle_layer(60, 60, density=0.05, seed=1)
+    assert layer[0].all() and layer[:, -1].all()
+    assert layer[1:-1, 1:-1].sum() >= 0.05 * 60 * 60
+    assert obstacle_layer(60, 60, density=0.05, seed=1) is layer  # Шар кешується
+    print(f"✓ Процедурні стіни: {layer[1:-1, 1:-1].sum()} клітинок")
+    
+    # Змійка, що врізається у внутрішню стіну, гине
+    env = Environment(60, 60, static_obstacles=layer)
+    wall_y, wall_x = np.argwhere(layer[2:-2, 2:-2])[0] + 2
+    snake = Snake(wall_x, wall_y, Genome(), 1)
+    env.add_snake(snake)
+    snake.check_collision(env)
+    assert not snake.alive
+    
+    env.update_grid()
+    assert (env.grid[layer] == 2).all()
+    print("✓ Зіткнення та сітка використовують статичний шар")
+    
+    import config
+    config.OBSTACLE_DENSITY = 0.05
+    try:
+        scenario = generate_scenario(16, food_count=300, grid_size=60)
+    finally:
+        config.OBSTACLE_DENSITY = 0.0
+    layer = obstacle_layer(60, 60, density=0.05)
+    assert not layer[scenario.food_positions[:, 1], scenario.food_positions[:, 0]].any()
+    assert not any(layer[y, x] for x, y in scenario.spawn_positions)
+    print("✓ Їжа та змійки з'являються поза перешкодами")
+    print()
+
+
+def test_memory_profiler():
+    """Тест профілювання пам'яті"""
+    print("=" * 50)
+    print("ТЕСТ ПРОФІЛЮВАННЯ ПАМ'ЯТІ")
+    print("=" * 50)
+    
+    import json
+    import os
+    import tempfile
+    from profiling import MemoryProfiler
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        profiler = MemoryProfiler(os.path.join(tmp, "memory.jsonl"), top=5)
+        ga = GeneticAlgorithm(population_size=16)
+        ga.profiler = profiler
+        for _ in range(2):
+            ga.evolve()
+            profiler.record(ga)
+        profiler.close()
+        
+        with open(profiler.filename) as f:
+            profiles = [json.loads(line) for line in f]
+    
+    assert len(profiles) == 2
+    last = profiles[-1]
+    assert last['environment']['snake_bodies'] > 0 and last['environment']['grid'] > 0
+    assert last['algorithm']['population'] > 0
+    assert 0 < len(last['top_allocations']) <= 5 and last['top_growth']
+    print(f"✓ Профіль: RSS {last['memory']['rss_mb']:.0f} MB, "
+          f"популяція {last['algorithm']['population']} байт, "
+          f"тіла змійок {last['environment']['snake_bodies']} байт")
+    print()
+
+
+def test_convergence():
+    """Тест виявлення плато та ранньої зупинки"""
+    print("=" * 50)
+    print("ТЕСТ ЗБІЖНОСТІ")
+    print("=" * 50)
+    
+    from convergence import ConvergenceMonitor
+    
+    class FakeGA:
+        def __init__(self):
+            self.stats_history = []
+            self.mutation_rate = 0.05
+            self.mutation_sigma = 10
+    
+    ticks = iter(range(10 ** 6))
+    monitor = ConvergenceMonitor(patience=3, min_improvement=0.01, bump_factor=2,
+                                 max_bumps=2, min_gain_per_cpu_minute=100, window=5,
+                                 clock=lambda: next(ticks) * 6.0)  # 0.1 CPU-хв на покоління
+    ga = FakeGA()
+    
+    # Швидке зростання, потім плато
+    curve = [100, 200, 300, 400, 500, 600] + [600] * 20
+    stopped_at = None
+    for gen, best in enumerate(curve):
+        ga.stats_history.append({'generation': gen, 'best_overall_fitness': best})
+        if not monitor.update(ga):
+            stopped_at = gen
+            break
+        if gen == 8:
+            assert ga.mutation_sigma == 20 and ga.mutation_rate == 0.1
+    
+    assert stopped_at is not None and stopped_at < len(curve) - 1
+    print(f"✓ Зупинка на поколінні {stopped_at}: {monitor.stop_reason}")
+    
+    # Покращення повертає початкову мутацію
+    monitor = ConvergenceMonitor(patience=2, bump_factor=2, max_bumps=3, min_gain_per_cpu_minute=0)
+    ga = FakeGA()
+    for gen, best in enumerate([10, 10, 10, 10, 50]):
+        ga.stats_history.append({'generation': gen, 'best_overall_fitness': best})
+        assert monitor.update(ga)
+        if gen == 3:
+            assert ga.mutation_sigma == 20
+    assert ga.mutation_sigma == 10 and ga.mutation_rate == 0.05
+    print(f"✓ Події: {monitor.events}")
+    
+    # evolve() мутує нащадків поточними атрибутами, які змінює монітор
+    real = GeneticAlgorithm(population_size=16)
+    real.mutation_rate = 0.2
+    real.mutation_sigma = 30
+    calls = []
+    original_mutate = Genome.mutate
+    Genome.mutate = lambda genome, rate, sigma: calls.append((rate, sigma))
+    try:
+        real.evolve()
+    finally:
+        Genome.mutate = original_mutate
+    assert calls and set(calls) == {(0.2, 30)}
+    print(f"✓ Мутація генетичного алгоритму налаштовується через атрибути ({len(calls)} нащадків)")
+    print()
+
+
+def test_sparse_evaluation():
+    """Тест розрідженого обчислення рішень"""
+    print("=" * 50)
+    print("ТЕСТ РОЗРІДЖЕНОГО ОБЧИСЛЕННЯ")
+    print("=" * 50)
+    
+    import config
+    from policy import get_policy, sparse_row_sum, use_sparse
+    
+    weights = np.random.randint(-10, 11, size=(6, 30, 4)).astype(float)
+    features = np.random.random((6, 30)) < 0.1
+    features[2] = False  # Змійка, що нічого не бачить
+    assert np.allclose(sparse_row_sum(weights, features),
+                       np.einsum('ni,nio->no', features.astype(float), weights))
+    print("✓ Сума рядків збігається з повним множенням")
+    
+    for policy_name in ('linear', 'mlp'):
+        policy = get_policy(policy_name)
+        n = 8
+        stack = np.array([Genome(policy=policy_name).to_flat() for _ in range(n)], dtype=float)
+        inputs = np.zeros((n, ((config.VISION_RADIUS * 2 + 1) ** 2 - 1) * 2), dtype=bool)
+        inputs[np.arange(n), np.random.randint(0, inputs.shape[1], size=n)] = True  # Одна клітинка на змійку
+        
+        dense = policy.forward_batch(stack, inputs.astype(float)).copy()
+        assert use_sparse(inputs)
+        assert np.allclose(policy.forward_batch(stack, inputs), dense)
+        print(f"✓ {policy_name}: розріджений шлях збігається з повним")
+    
+    assert not use_sparse(np.ones((4, 10), dtype=bool))
+    print()
+
+
 def run_all_tests():
     """Запустити всі тести"""
     print("\n" + "=" * 50)
@@ -90,6 +618,20 @@ def run_all_tests():
     test_genome()
     test_vision()
     test_genetic_algorithm()
+    test_common_random_numbers()
+    test_hall_of_fame()
+    test_novelty()
+    test_evolution_strategy()
+    test_sweep()
+    test_policy()
+    test_snapshot()
+    test_population_archive()
+    test_background_writer()
+    test_monitor()
+    test_obstacles()
+    test_memory_profiler()
+    test_convergence()
+    test_sparse_evaluation()
     
     print("=" * 50)
     print("ВСІ ТЕСТИ ПРОЙДЕНО!")
@@ -1,27 +1,69 @@
 # visualizer.py - Візуалізація гри
 
+import math
+
+import numpy as np
 import pygame
 from config import (
-    GRID_SIZE, CELL_SIZE, FPS,
+    GRID_SIZE, CELL_SIZE, FPS, VIEWPORT_SIZE,
     COLOR_BACKGROUND, COLOR_GRID, COLOR_SNAKE, COLOR_FOOD, COLOR_OBSTACLE
 )
 
 
+# Коди клітинок для відображення (більший код - вищий пріоритет при зменшенні)
+EMPTY, FOOD, OBSTACLE, BARRIER, BODY, HEAD = range(6)
+
+# Колір для кожного коду
+PALETTE = np.array([
+    COLOR_BACKGROUND,
+    COLOR_FOOD,
+    COLOR_OBSTACLE,
+    (80, 80, 80),   # Бар'єр на краях - темніший колір
+    COLOR_SNAKE,
+    (0, 255, 100),  # Голова - яскравіший зелений
+], dtype=np.uint8)
+
+# Значення сітки середовища (0 = пусто, 1 = їжа, 2 = перешкода, 3 = тіло) -> код
+GRID_CODES = np.array([EMPTY, FOOD, OBSTACLE, BODY])
+
+MAX_ZOOM = 40           # Максимум пікселів на клітинку
+GRID_LINE_MIN_ZOOM = 4  # Лінії сітки лише якщо клітинка не менша за 4 пікселі
+
+
 class Visualizer:
-    """Клас для відображення гри через pygame"""
+    """
+    Клас для відображення гри через pygame
+    
+    Поле показується через вікно перегляду (viewport) з масштабом і
+    зсувом камери. Малюється лише видима частина сітки: вона одним
+    масивом перетворюється на кольори та масштабується на екран, тому
+    вартість кадру залежить від розміру вікна, а не від розміру арени.
+    При масштабі менше 1 пікселя на клітинку поле зменшується блоками
+    (режим огляду).
+    
+    Керування: стрілки / WASD - зсув, +/- або колесо миші - масштаб,
+    F - слідкувати за найкращою змійкою, O - показати все поле, ESC - вихід.
+    """
     
     def __init__(self):
         """Ініціалізація pygame та вікна"""
         pygame.init()
         
-        # Розміри вікна
-        self.grid_width = GRID_SIZE * CELL_SIZE
-        self.grid_height = GRID_SIZE * CELL_SIZE
+        # Розміри вікна (область поля не більша за VIEWPORT_SIZE)
+        self.grid_width = min(GRID_SIZE * CELL_SIZE, VIEWPORT_SIZE)
+        self.grid_height = min(GRID_SIZE * CELL_SIZE, VIEWPORT_SIZE)
         self.info_height = 100
         
         self.width = self.grid_width
         self.height = self.grid_height + self.info_height
         
+        # Камера: центр у клітинках та масштаб у пікселях на клітинку
+        self.arena_size = (GRID_SIZE, GRID_SIZE)
+        self.center = [GRID_SIZE / 2, GRID_SIZE / 2]
+        self.zoom = CELL_SIZE
+        self.follow = False
+        self._view = None  # (x0, y0, x1, y1, зсув_x, зсув_y) з останнього кадру
+        
         # Створити вікно
         self.screen = pygame.display.set_mode((self.width, self.height))
         pygame.display.set_caption("Генетичний алгоритм для змійки")
@@ -33,22 +75,156 @@ class Visualizer:
         # Годинник для FPS
         self.clock = pygame.time.Clock()
     
+    def min_zoom(self):
+        """Масштаб, при якому все поле вміщується у вікно"""
+        width, height = self.arena_size
+        return min(self.grid_width / width, self.grid_height / height)
+    
+    def set_zoom(self, zoom):
+        """
+        Встановити масштаб (обмежується від огляду всього поля до MAX_ZOOM)
+        
+        Args:
+            zoom: пікселів на клітинку
+        """
+        self.zoom = min(max(zoom, self.min_zoom()), MAX_ZOOM)
+    
+    def pan(self, dx, dy):
+        """
+        Зсунути камеру (вимикає слідкування)
+        
+        Args:
+            dx, dy: зсув у частках розміру вікна
+        """
+        self.follow = False
+        self.center[0] += dx * self.grid_width / self.zoom
+        self.center[1] += dy * self.grid_height / self.zoom
+    
+    def show_all(self):
+        """Режим огляду: все поле у вікні"""
+        self.follow = False
+        self.zoom = self.min_zoom()
+        self.center = [self.arena_size[0] / 2, self.arena_size[1] / 2]
+    
+    def _update_camera(self, environment):
+        """Слідкування за найкращою змійкою та обмеження камери межами поля"""
+        self.arena_size = (environment.width, environment.height)
+        self.zoom = min(max(self.zoom, self.min_zoom()), MAX_ZOOM)
+        
+        if self.follow:
+            alive = [s for s in environment.snakes if s.alive]
+            if alive:
+                best_snake = max(alive, key=lambda s: s.get_fitness())
+                head_x, head_y = best_snake.body[0]
+                self.center = [head_x + 0.5, head_y + 0.5]
+        
+        # Не виходити за межі поля, якщо воно більше за вікно
+        for axis, (size, pixels) in enumerate(((environment.width, self.grid_width),
+                                               (environment.height, self.grid_height))):
+            half = pixels / self.zoom / 2
+            if half * 2 >= size:
+                self.center[axis] = size / 2
+            else:
+                self.center[axis] = min(max(self.center[axis], half), size - half)
+    
+    def _visible_region(self, environment):
+        """
+        Видимі клітинки та екранна позиція лівого верхнього кута
+        
+        Returns:
+            tuple: (x0, y0, x1, y1, зсув_x, зсув_y)
+        """
+        left = self.center[0] - self.grid_width / self.zoom / 2
+        top = self.center[1] - self.grid_height / self.zoom / 2
+        
+        x0 = max(int(math.floor(left)), 0)
+        y0 = max(int(math.floor(top)), 0)
+        x1 = min(int(math.ceil(left + self.grid_width / self.zoom)), environment.width)
+        y1 = min(int(math.ceil(top + self.grid_height / self.zoom)), environment.height)
+        
+        return x0, y0, x1, y1, (x0 - left) * self.zoom, (y0 - top) * self.zoom
+    
+    def to_screen(self, x, y):
+        """
+        Екранні координати клітинки (за останнім кадром)
+        
+        Returns:
+            tuple або None, якщо клітинка поза вікном
+        """
+        x0, y0, x1, y1, offset_x, offset_y = self._view
+        if not (x0 <= x < x1 and y0 <= y < y1):
+            return None
+        return offset_x + (x - x0) * self.zoom, offset_y + (y - y0) * self.zoom
+    
+    def _cell_codes(self, environment, x0, y0, x1, y1):
+        """
+        Коди відображення для видимої частини сітки
+        
+        Returns:
+            numpy array (y1 - y0, x1 - x0)
+        """
+        codes = GRID_CODES[environment.grid[y0:y1, x0:x1]]
+        
+        # Бар'єр по краях поля
+        rows = np.arange(y0, y1)[:, None]
+        cols = np.arange(x0, x1)[None, :]
+        edge = (rows == 0) | (rows == environment.height - 1) | (cols == 0) | (cols == environment.width - 1)
+        codes[edge & (codes == OBSTACLE)] = BARRIER
+        
+        # Голови живих змійок
+        for snake in environment.snakes:
+            if snake.alive:
+                head_x, head_y = snake.body[0]
+                if x0 <= head_x < x1 and y0 <= head_y < y1:
+                    codes[head_y - y0, head_x - x0] = HEAD
+        
+        return codes
+    
+    def draw_cells(self, environment):
+        """Намалювати видиму частину поля одним зображенням"""
+        x0, y0, x1, y1, offset_x, offset_y = self._view
+        if x1 <= x0 or y1 <= y0:
+            return
+        
+        codes = self._cell_codes(environment, x0, y0, x1, y1)
+        cell_pixels = self.zoom
+        
+        # Режим огляду: блок factor×factor клітинок -> один піксель (найважливіший код)
+        factor = max(int(math.ceil(1 / self.zoom)), 1)
+        if factor > 1:
+            height, width = codes.shape
+            pad_y, pad_x = -height % factor, -width % factor
+            codes = np.pad(codes, ((0, pad_y), (0, pad_x)))
+            codes = codes.reshape(codes.shape[0] // factor, factor,
+                                  codes.shape[1] // factor, factor).max(axis=(1, 3))
+            cell_pixels = self.zoom * factor
+        
+        image = pygame.surfarray.make_surface(PALETTE[codes].transpose(1, 0, 2))
+        size = (round(codes.shape[1] * cell_pixels), round(codes.shape[0] * cell_pixels))
+        self.screen.blit(pygame.transform.scale(image, size), (round(offset_x), round(offset_y)))
+    
     def draw_grid(self):
-        """Намалювати сітку"""
-        for x in range(0, self.grid_width, CELL_SIZE):
+        """Намалювати сітку (лише лінії видимих клітинок)"""
+        x0, y0, x1, y1, offset_x, offset_y = self._view
+        bottom = min(offset_y + (y1 - y0) * self.zoom, self.grid_height)
+        right = min(offset_x + (x1 - x0) * self.zoom, self.grid_width)
+        
+        for i in range(x1 - x0 + 1):
+            x = round(offset_x + i * self.zoom)
             pygame.draw.line(
-                self.screen, 
-                COLOR_GRID, 
-                (x, 0), 
-                (x, self.grid_height)
+                self.screen,
+                COLOR_GRID,
+                (x, max(offset_y, 0)),
+                (x, bottom)
             )
         
-        for y in range(0, self.grid_height, CELL_SIZE):
+        for i in range(y1 - y0 + 1):
+            y = round(offset_y + i * self.zoom)
             pygame.draw.line(
-                self.screen, 
-                COLOR_GRID, 
-                (0, y), 
-                (self.grid_width, y)
+                self.screen,
+                COLOR_GRID,
+                (max(offset_x, 0), y),
+                (right, y)
             )
     
     def draw_environment(self, environment, generation=0, best_fitness=0, title = ""):
@@ -63,70 +239,36 @@ class Visualizer:
         # Очистити екран
         self.screen.fill(COLOR_BACKGROUND)
         
-        # Намалювати сітку
-        self.draw_grid()
-
+        # Камера та видима область
+        self._update_camera(environment)
+        self._view = self._visible_region(environment)
         
-        # Намалювати перешкоди (включаючи бар'єр)
-        for obs_x, obs_y in environment.obstacles:
-            if 0 <= obs_x < GRID_SIZE and 0 <= obs_y < GRID_SIZE:
-                rect = pygame.Rect(
-                    obs_x * CELL_SIZE,
-                    obs_y * CELL_SIZE,
-                    CELL_SIZE,
-                    CELL_SIZE
-                )
-                # Бар'єр на краях - темніший колір
-                if obs_x == 0 or obs_x == GRID_SIZE - 1 or obs_y == 0 or obs_y == GRID_SIZE - 1:
-                    color = (80, 80, 80)  # Темніший для бар'єру
-                else:
-                    color = COLOR_OBSTACLE
-                pygame.draw.rect(self.screen, color, rect)
-        
-        # Намалювати їжу
-        for food in environment.foods:
-            rect = pygame.Rect(
-                food.x * CELL_SIZE,
-                food.y * CELL_SIZE,
-                CELL_SIZE,
-                CELL_SIZE
-            )
-            pygame.draw.rect(self.screen, COLOR_FOOD, rect)
+        # Намалювати перешкоди, їжу та змійок
+        self.draw_cells(environment)
         
-        # Намалювати змійок
-        for snake in environment.snakes:
-            if not snake.alive:
-                continue
-            
-            # Намалювати тіло (використовуємо поточну довжину body, а не self.length)
-            for i, (seg_x, seg_y) in enumerate(snake.body):
-                rect = pygame.Rect(
-                    seg_x * CELL_SIZE,
-                    seg_y * CELL_SIZE,
-                    CELL_SIZE,
-                    CELL_SIZE
-                )
+        # Намалювати сітку
+        if self.zoom >= GRID_LINE_MIN_ZOOM:
+            self.draw_grid()
+        
+        # Намалювати ID змійок біля голів (лише коли клітинки достатньо великі)
+        if self.zoom >= CELL_SIZE:
+            for snake in environment.snakes:
+                if not snake.alive:
+                    continue
                 
-                if i == 0:
-                    # Голова - яскравіший зелений
-                    color = (0, 255, 100)
-                else:
-                    # Тіло - звичайний зелений
-                    color = COLOR_SNAKE
+                position = self.to_screen(*snake.body[0])
+                if position is None:
+                    continue
                 
-                pygame.draw.rect(self.screen, color, rect)
-            
-            # Намалювати ID змійки біля голови
-            head_x, head_y = snake.body[0]
-            id_text = self.small_font.render(
-                str(snake.id), 
-                True, 
-                (255, 255, 255)
-            )
-            self.screen.blit(
-                id_text,
-                (head_x * CELL_SIZE + 2, head_y * CELL_SIZE + 2)
-            )
+                id_text = self.small_font.render(
+                    str(snake.id),
+                    True,
+                    (255, 255, 255)
+                )
+                self.screen.blit(
+                    id_text,
+                    (position[0] + 2, position[1] + 2)
+                )
         
         # Намалювати інформаційну панель внизу
         info_y = self.grid_height
@@ -138,9 +280,10 @@ class Visualizer:
         # Текст з інформацією
         alive_count = environment.get_alive_count()
         
-        # Рядок 1: Покоління та найкращий fitness
+        # Рядок 1: Покоління, найкращий fitness та камера
+        camera = f"Zoom: {self.zoom:.1f}px" + ("  [follow]" if self.follow else "")
         gen_text = self.font.render(
-            f"Generation: {generation}  |  Best Fitness: {best_fitness:.0f}",
+            f"Generation: {generation}  |  Best Fitness: {best_fitness:.0f}  |  {camera}",
             True,
             (255, 255, 255)
         )
@@ -189,11 +332,33 @@ class Visualizer:
             if event.type == pygame.QUIT:
                 return False
             
+            # Колесо миші - масштаб
+            if event.type == pygame.MOUSEWHEEL:
+                self.set_zoom(self.zoom * 1.25 ** event.y)
+            
             # Додаткові клавіші для контролю
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     return False
                 
+                # Камера
+                if event.key in (pygame.K_LEFT, pygame.K_a):
+                    self.pan(-0.2, 0)
+                elif event.key in (pygame.K_RIGHT, pygame.K_d):
+                    self.pan(0.2, 0)
+                elif event.key in (pygame.K_UP, pygame.K_w):
+                    self.pan(0, -0.2)
+                elif event.key in (pygame.K_DOWN, pygame.K_s):
+                    self.pan(0, 0.2)
+                elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                    self.set_zoom(self.zoom * 1.25)
+                elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                    self.set_zoom(self.zoom / 1.25)
+                elif event.key == pygame.K_f:
+                    self.follow = not self.follow
+                elif event.key == pygame.K_o:
+                    self.show_all()
+                
                 # Пробіл для паузи (можна додати в майбутньому)
                 # if event.key == pygame.K_SPACE:
                 #     pass
@@ -202,4 +367,4 @@ class Visualizer:
     
     def close(self):
         """Закрити pygame"""
-        pygame.quit()
\ No newline at end of file
+        pygame.quit()
@@ -0,0 +1,150 @@
+# writer.py - Фоновий запис статистики та контрольних точок
+
+import csv
+import os
+import queue
+import threading
+
+import numpy as np
+
+
+def atomic_write(filename, write):
+    """
+    Записати файл атомарно: спочатку тимчасовий файл, потім заміна
+
+    Після збою на диску лишається або стара, або нова повна версія файлу.
+
+    Args:
+        filename: шлях до файлу
+        write: функція write(f), що записує вміст у відкритий текстовий файл
+    """
+    directory = os.path.dirname(filename)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    tmp_filename = f"{filename}.tmp"
+    with open(tmp_filename, 'w', newline='') as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_filename, filename)
+
+
+class BackgroundWriter:
+    """
+    Фоновий потік для запису статистики та популяцій
+
+    Потік тренування лише кладе рядки статистики та копії ваг у чергу,
+    а запис на диск відбувається в окремому потоці, тому швидкість
+    тренування не залежить від затримок диска. Файли популяцій пишуться
+    атомарно; якщо в черзі накопичилось кілька версій одного файлу
+    популяції, записується лише найновіша. CSV статистики створюється
+    атомарно при першому скиданні, а далі до нього лише дописуються нові
+    рядки (flush + fsync), тому обсяг запису не росте з кожним поколінням.
+    """
+
+    def __init__(self, stats_filename=None, header=None, flush_interval=1):
+        """
+        Ініціалізація та запуск потоку
+
+        Args:
+            stats_filename: CSV для статистики (None - без статистики)
+            header: заголовок CSV статистики
+            flush_interval: дописувати CSV статистики кожні N рядків
+        """
+        self.stats_filename = stats_filename
+        self.header = header
+        self.flush_interval = max(flush_interval, 1)
+        self.error = None
+
+        self._queue = queue.Queue()
+        self._unflushed = []  # Рядки статистики, ще не записані на диск
+        self._stats_created = False
+        self._thread = threading.Thread(target=self._run, name="background-writer", daemon=True)
+        self._thread.start()
+
+    def write_stats(self, row):
+        """
+        Додати рядок статистики
+
+        Args:
+            row: список значень (в порядку заголовка)
+        """
+        self._check_error()
+        self._queue.put(('stats', list(row)))
+
+    def save_population(self, population, filename):
+        """
+        Зберегти популяцію у фоні (ваги копіюються одразу)
+
+        Args:
+            population: список об'єктів Genome
+            filename: шлях до CSV файлу
+        """
+        self._check_error()
+        flat_genomes = np.array([genome.to_flat() for genome in population])
+        self._queue.put(('population', (filename, flat_genomes)))
+
+    def close(self):
+        """Дописати все з черги та зупинити потік"""
+        self._queue.put(('stop', None))
+        self._thread.join()
+        self._check_error()
+
+    def _check_error(self):
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise RuntimeError("Помилка фонового запису") from error
+
+    def _run(self):
+        """Цикл потоку: обробляє чергу пакетами"""
+        running = True
+        while running:
+            items = [self._queue.get()]
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            populations = {}
+            for kind, payload in items:
+                if kind == 'stats':
+                    self._unflushed.append(payload)
+                elif kind == 'population':
+                    filename, flat_genomes = payload
+                    populations[filename] = flat_genomes  # Лише найновіша версія
+                else:
+                    running = False
+
+            try:
+                for filename, flat_genomes in populations.items():
+                    atomic_write(filename, lambda f: np.savetxt(f, flat_genomes, delimiter=',', fmt='%d'))
+
+                if self._unflushed and (len(self._unflushed) >= self.flush_interval or not running):
+                    self._flush_stats()
+            except Exception as error:
+                self.error = error
+
+    def _flush_stats(self):
+        """Записати нові рядки статистики (перше скидання створює файл атомарно)"""
+        rows = self._unflushed
+        if self.stats_filename is None:
+            self._unflushed = []
+            return
+
+        if not self._stats_created:
+            def write(f):
+                writer = csv.writer(f)
+                if self.header is not None:
+                    writer.writerow(self.header)
+                writer.writerows(rows)
+
+            atomic_write(self.stats_filename, write)
+            self._stats_created = True
+        else:
+            with open(self.stats_filename, 'a', newline='') as f:
+                csv.writer(f).writerows(rows)
+                f.flush()
+                os.fsync(f.fileno())
+        self._unflushed = []